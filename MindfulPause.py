@@ -1,25 +1,52 @@
 # MindfulPause.py
 
+import time
+_STARTED_AT = time.perf_counter()
+
 import sys
+
+if __name__ == '__main__':
+    # Повторный запуск передает команду работающему экземпляру и сразу завершается, не загружая Qt
+    from utils.control_channel import forward_from_cli
+    forward_from_cli(sys.argv[1:])
+
 import os
 import ctypes
+import logging
 from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QStyle
-from PySide6.QtGui import QIcon, QAction
+from PySide6.QtGui import QIcon, QAction, QCursor
 from PySide6.QtCore import QTimer
 
-# Импортируем все необходимые модули
+# Импортируем только то, что нужно до появления иконки в трее.
+# Окна настроек и пауз, а также звук (QtMultimedia) загружаются при первом использовании.
 from utils.xml_manager import XMLManager
-from utils.sound_manager import SoundManager
+from utils.i18n import tr, install as install_ui_texts
 from utils.activity_tracker import ActivityTracker
 from utils.system_utils import create_startup_shortcut, remove_startup_shortcut
 from utils.timer_manager import TimerManager
-from gui.settings_window import SettingsWindow
-from gui.pause_window import PauseWindow, BreakWarningWindow
+from utils.break_core import BreakCore
+from utils.state_journal import StateJournal
+from utils.break_history import BreakHistory
+from utils.startup_report import StartupReport
+from utils.metrics import metrics
+from utils.asset_catalog import AssetCatalog
+from utils.control_server import ControlServer
+from gui.image_pyramid import image_pyramid
 
 class MindfulPauseApp(QApplication):
+    PREPARE_DELAY_MS = 5000  # Окна пауз готовятся не сразу, чтобы не замедлять запуск
+
     def __init__(self, sys_argv):
+        self.startup_report = StartupReport(_STARTED_AT)
+        self.startup_report.mark("импорт модулей")
         super().__init__(sys_argv)
         self.setQuitOnLastWindowClosed(False)
+        self.startup_report.mark("QApplication")
+
+        # Единственный экземпляр: следующие запуски присылают команды через локальный сокет
+        self.control_server = ControlServer(self.on_control_command, parent=self)
+        self.is_primary_instance = self.control_server.listen()
+        if not self.is_primary_instance: return
 
         # Универсальный способ определения базовой директории
         if getattr(sys, 'frozen', False):
@@ -27,44 +54,84 @@ class MindfulPauseApp(QApplication):
         else:
             self.BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-        myappid = 'mycompany.myproduct.subproduct.version'
-        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+        if sys.platform == 'win32':
+            myappid = 'mycompany.myproduct.subproduct.version'
+            ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+
+        # Замеры горячих путей включаются переменной окружения MINDFULPAUSE_METRICS
+        metrics.configure_from_env(self.BASE_DIR)
+        self.aboutToQuit.connect(metrics.flush)
 
         # --- Инициализация менеджеров ---
         self.xml_manager = XMLManager(data_dir=os.path.join(self.BASE_DIR, 'data'))
-        self.settings = self.xml_manager.load_settings()
-        
-        self.sound_manager = SoundManager(base_dir=self.BASE_DIR)
-        self.timer_manager = TimerManager()
+        self.aboutToQuit.connect(self.xml_manager.flush)  # Запись идет в фоне: при выходе дописываем все
+        install_ui_texts(self.xml_manager.get_ui_texts())  # Строки интерфейса на языке из настроек
+        # Картинки и файлы практик сканируются один раз, дальше изменения приходят уведомлениями
+        self.asset_catalog = AssetCatalog(os.path.join(self.BASE_DIR, 'data', 'pict'),
+                                          [self.xml_manager.practice_store, self.xml_manager.micropractice_store], parent=self)
+        # Уменьшенные копии картинок строятся один раз в фоне, пока приложение ждет первой паузы
+        image_pyramid.configure(os.path.join(self.BASE_DIR, 'data', 'pict_cache'))
+        build_pyramid = lambda: image_pyramid.build_async(self.asset_catalog.images())
+        QTimer.singleShot(self.PREPARE_DELAY_MS, build_pyramid)
+        self.asset_catalog.images_changed.connect(build_pyramid)
+        # История перерывов со сводками по дням и неделям для статистики
+        self.break_history = BreakHistory(os.path.join(self.BASE_DIR, 'data', 'history.sqlite3'))
+        self.aboutToQuit.connect(self.break_history.close)
+        # Вся логика перерывов — в BreakCore, приложение лишь исполняет его намерения
+        self.core = BreakCore(self.xml_manager.load_settings())
+        self.startup_report.mark("настройки")
+
+        self._sound_manager = None  # Создается при первом звуке, см. sound_manager
+        self.timer_manager = TimerManager(self.core)
         
         self.activity_tracker = ActivityTracker(
             timeout_minutes=30,
             is_enabled=self.settings.get('track_activity', True)
         )
+        self.startup_report.mark("менеджеры")
 
         # --- Инициализация GUI ---
         self.warning_window = None
         self.active_pause_window = None
         self.settings_window = None
-
-        # --- Состояние приложения ---
-        self.is_paused_by_user = False
-        self.is_temporarily_disabled = False
-        self.disable_timer = QTimer(self)
-        self.disable_timer.setSingleShot(True)
-        self.disable_timer.timeout.connect(self.enable_app)
+        self.prepared_windows = {}  # is_big_break -> окно паузы, построенное заранее вне экрана
 
         # Создаем иконку трея здесь, чтобы она была частью основного класса
         self.create_tray_icon()
         self.tray_icon.show()
+        self.startup_report.mark("иконка в трее")
+        self.startup_report.print_report()
 
         # --- Подключение сигналов к слотам ---
         self.connect_signals()
 
         # --- Первоначальная настройка и запуск ---
-        self.apply_settings()
+        # Расписание продолжается с того места, где приложение остановилось (сбой, выход из системы, обновление)
+        self.state_journal = StateJournal(os.path.join(self.BASE_DIR, 'data', 'state.journal'))
+        saved = self.state_journal.load()
+        self.core.journal = self.state_journal
+        if saved is not None: self.core.restore(*saved)
+        else: self.core.apply_settings()
+        self.journal_timer = QTimer(self)
+        self.journal_timer.timeout.connect(self.state_journal.touch)
+        self.journal_timer.start(StateJournal.HEARTBEAT_SEC * 1000)
+        self.aboutToQuit.connect(self.state_journal.close)
         self.check_autostart()
 
+    @property
+    def settings(self): return self.core.settings
+
+    @property
+    def sound_manager(self):
+        """SoundManager (и QtMultimedia) загружается только когда впервые нужен звук."""
+        if self._sound_manager is None:
+            from utils.sound_manager import SoundManager
+            self._sound_manager = SoundManager(base_dir=self.BASE_DIR, custom_files=self.custom_sound_files())
+        return self._sound_manager
+
+    def custom_sound_files(self):
+        return {'start': self.settings.get('sound_start_file'), 'end': self.settings.get('sound_end_file')}
+
     def create_tray_icon(self):
         """Создает иконку и меню в системном трее."""
         self.tray_icon = QSystemTrayIcon(self)
@@ -86,20 +153,20 @@ class MindfulPauseApp(QApplication):
         menu = QMenu()
         
         # Действие "Начать большой перерыв сейчас"
-        break_now_action = QAction("Сделать большой перерыв сейчас", self)
+        break_now_action = QAction(tr("Сделать большой перерыв сейчас"), self)
         break_now_action.triggered.connect(self.test_big_break)
         menu.addAction(break_now_action)
 
         # Действие "Приостановить/Возобновить"
-        self.pause_action = QAction("Приостановить таймеры", self)
+        self.pause_action = QAction(tr("Приостановить таймеры"), self)
         self.pause_action.triggered.connect(self.toggle_pause)
         menu.addAction(self.pause_action)
 
         # Меню "Отключить на время"
-        disable_menu = QMenu("Отключить на время", menu)
+        disable_menu = QMenu(tr("Отключить на время"), menu)
         for hours in [1, 2, 3, 8]:
             # Используем lambda с параметром, чтобы передать значение
-            action = QAction(f"На {hours} час(а)", disable_menu)
+            action = QAction(tr("На {hours} час(а)", hours=hours), disable_menu)
             action.triggered.connect(lambda checked, h=hours: self.disable_temporarily(h))
             disable_menu.addAction(action)
         menu.addMenu(disable_menu)
@@ -107,14 +174,14 @@ class MindfulPauseApp(QApplication):
         menu.addSeparator()
 
         # Действие "Настройки"
-        settings_action = QAction("Настройки", self)
+        settings_action = QAction(tr("Настройки"), self)
         settings_action.triggered.connect(self.show_settings)
         menu.addAction(settings_action)
         
         menu.addSeparator()
         
         # Действие "Выход"
-        exit_action = QAction("Выход", self)
+        exit_action = QAction(tr("Выход"), self)
         exit_action.triggered.connect(self.quit)
         menu.addAction(exit_action)
         
@@ -123,29 +190,66 @@ class MindfulPauseApp(QApplication):
 
     def connect_signals(self):
         """Централизованное подключение всех сигналов к слотам."""
-        self.timer_manager.big_break_signal.connect(self.show_warning_or_break)
-        self.timer_manager.short_pause_signal.connect(self.show_short_pause)
-        self.timer_manager.warning_signal.connect(self.show_warning_window)
-        
-        self.activity_tracker.user_inactive.connect(self.on_user_inactive)
-        self.activity_tracker.user_active.connect(self.on_user_active)
+        self._intent_handlers = {
+            BreakCore.SHOW_WARNING: self.show_warning_window,
+            BreakCore.CLOSE_WARNING: self.close_warning_window,
+            BreakCore.START_SHORT_PAUSE: lambda **pause: self.show_pause_window(is_big_break=False),
+            BreakCore.START_BIG_BREAK: lambda **pause: self.show_pause_window(is_big_break=True),
+            BreakCore.FINISH_PAUSE: self.close_pause_window,
+            BreakCore.PLAY_SOUND: self.play_sound,
+            BreakCore.SCHEDULE_APPLIED: self.on_schedule_applied,
+            BreakCore.STATE_CHANGED: self.update_tray_state,
+            BreakCore.BREAK_EVENT: self.break_history.record,
+        }
+        self.core.subscribe(self.on_core_intent)
+        self.timer_manager.resumed_from_sleep.connect(self.core.resumed_from_sleep)
+        self.activity_tracker.user_inactive.connect(self.core.user_inactive)
+        self.activity_tracker.user_active.connect(self.core.user_active)
+
+    def on_core_intent(self, intent, **payload):
+        """Исполняет намерения BreakCore: окна, звуки и состояние трея."""
+        self._intent_handlers[intent](**payload)
+
+    def on_schedule_applied(self):
+        self.activity_tracker.set_enabled(self.settings.get('track_activity', True))
+        QTimer.singleShot(self.PREPARE_DELAY_MS, self.prepare_upcoming_windows)
+        print("Таймеры и настройки обновлены.")
+
+    def prepare_upcoming_windows(self):
+        """Заранее строит окна ближайших пауз, чтобы в момент перерыва их оставалось только показать."""
+        if self.settings.get('short_pause_enabled', True): self.prepare_pause_window(is_big_break=False)
+        # При включенном предупреждении большой перерыв готовится во время обратного отсчета
+        if self.settings.get('big_break_enabled', True) and not self.settings.get('warning_enabled', True):
+            self.prepare_pause_window(is_big_break=True)
+        # Звуки декодируются в PCM заранее, только если они вообще включены
+        cues = [cue for cue, key in (('start', 'sound_start_enabled'), ('end', 'sound_enabled')) if self.settings.get(key, True)]
+        if not cues: return
+        try: self.sound_manager.preload(cues)
+        except Exception: logging.exception("Не удалось подготовить звуки")
+
+    def _build_pause_window(self, is_big_break):
+        from gui.pause_window import PauseWindow
+        if is_big_break:
+            text = self.xml_manager.get_random_practice()
+            duration = self.settings.get('big_break_duration', 5) * 60
+            strict = self.settings.get('strict_mode', False)
+            return PauseWindow(self, text, duration, is_big_break=True, strict_mode=strict)
+        text = self.xml_manager.get_random_micropractice()
+        duration = self.settings.get('short_pause_duration', 20)
+        darken = self.settings.get('darken_short_pause', False)
+        return PauseWindow(self, text, duration, is_big_break=False, darken_screen=darken)
 
-    def apply_settings(self):
-        """Применяет загруженные настройки ко всем компонентам приложения."""
-        if self.is_temporarily_disabled or self.is_paused_by_user:
-            return
+    def prepare_pause_window(self, is_big_break):
+        if is_big_break not in self.prepared_windows:
+            self.prepared_windows[is_big_break] = self._build_pause_window(is_big_break)
 
-        self.timer_manager.stop_all_timers()
-        
-        if self.settings.get('big_break_enabled', True):
-            self.timer_manager.set_warning_time(self.settings.get('warning_time', 30))
-            self.timer_manager.start_big_break_timer(self.settings.get('big_break_interval', 60))
-        
-        if self.settings.get('short_pause_enabled', True):
-            self.timer_manager.start_short_pause_timer(self.settings.get('short_pause_interval', 20))
+    def take_pause_window(self, is_big_break):
+        window = self.prepared_windows.pop(is_big_break, None)
+        return window if window is not None else self._build_pause_window(is_big_break)
 
-        self.activity_tracker.set_enabled(self.settings.get('track_activity', True))
-        print("Таймеры и настройки обновлены.")
+    def discard_prepared_windows(self):
+        for window in self.prepared_windows.values(): window.deleteLater()
+        self.prepared_windows.clear()
 
     def check_autostart(self):
         """Проверяет и устанавливает/удаляет ярлык автозапуска."""
@@ -157,8 +261,11 @@ class MindfulPauseApp(QApplication):
     def show_settings(self):
         """Показывает окно настроек."""
         if self.settings_window is None or not self.settings_window.isVisible():
+            from gui.settings_window import SettingsWindow
             self.settings_window = SettingsWindow(self, self.xml_manager)
             self.settings_window.settings_saved.connect(self.on_settings_saved)
+            # Правки файлов практик извне сразу видны в открытом окне
+            self.asset_catalog.practices_changed.connect(self.settings_window.update_practices_list)
             self.settings_window.show()
             self.settings_window.activateWindow()
             self.settings_window.raise_()
@@ -168,127 +275,134 @@ class MindfulPauseApp(QApplication):
 
     def on_settings_saved(self):
         """Вызывается при сохранении настроек."""
-        self.settings = self.xml_manager.load_settings()
+        self.discard_prepared_windows()
+        self.core.update_settings(self.xml_manager.load_settings())
+        if self._sound_manager is not None: self._sound_manager.set_custom_files(self.custom_sound_files())
         self.check_autostart()
-        if not self.is_paused_by_user and not self.is_temporarily_disabled:
-            self.apply_settings()
         print("Настройки сохранены и применены.")
 
     def toggle_pause(self):
         """Переключает состояние паузы, инициированное пользователем."""
-        self.is_paused_by_user = not self.is_paused_by_user
-        
-        if self.is_paused_by_user:
-            self.timer_manager.stop_all_timers()
-            self.activity_tracker.stop()
-            self.pause_action.setText("Возобновить таймеры")
-            self.tray_icon.setIcon(self.paused_icon)
-            self.tray_icon.setToolTip("MindfulPause (на паузе)")
-            print("Таймеры приостановлены пользователем.")
+        self.core.toggle_pause()
+
+    def update_tray_state(self):
+        """Иконка, подсказка и пункт меню трея по состоянию ядра."""
+        suspended = self.core.is_suspended()
+        self.pause_action.setText(tr("Возобновить таймеры") if self.core.is_paused_by_user else tr("Приостановить таймеры"))
+        self.tray_icon.setIcon(self.paused_icon if suspended else self.active_icon)
+        if self.core.is_temporarily_disabled:
+            self.tray_icon.setToolTip(tr("MindfulPause - Отключено на {hours} час(а)", hours=self.core.disabled_hours))
+        elif self.core.is_paused_by_user:
+            self.tray_icon.setToolTip(tr("MindfulPause (на паузе)"))
         else:
-            self.pause_action.setText("Приостановить таймеры")
-            self.tray_icon.setIcon(self.active_icon)
             self.tray_icon.setToolTip("MindfulPause")
-            if not self.is_temporarily_disabled:
-                self.apply_settings()
-                print("Таймеры возобновлены пользователем.")
+        if suspended: self.activity_tracker.stop()
 
     def on_tray_icon_activated(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
             self.show_settings()
 
-    def show_short_pause(self):
-        if self.active_pause_window: return
-        self.timer_manager.pause_all_timers()
-        text = self.xml_manager.get_random_micropractice()
-        duration = self.settings.get('short_pause_duration', 20)
-        darken = self.settings.get('darken_short_pause', False)
-        self.active_pause_window = PauseWindow(self, text, duration, is_big_break=False, darken_screen=darken)
-        self.active_pause_window.pause_finished.connect(self.on_pause_finished)
-        if self.settings.get('sound_start_enabled', True):
-            self.sound_manager.play_start_sound()
-        self.active_pause_window.show()
-
-    def show_warning_or_break(self):
-        if self.warning_window or self.active_pause_window: return
-        if self.settings.get('warning_enabled', True):
-            self.show_warning_window()
-        else:
-            self.start_big_break()
-
-    def show_warning_window(self):
-        if self.warning_window or self.active_pause_window: return
-        self.warning_window = BreakWarningWindow(self.settings.get('warning_time', 30))
-        self.warning_window.start_now_clicked.connect(self.start_big_break)
-        self.warning_window.postpone_clicked.connect(self.on_warning_postponed)
+    def show_warning_window(self, seconds):
+        if self.warning_window: return
+        from gui.pause_window import BreakWarningWindow
+        self.warning_window = BreakWarningWindow(seconds)
+        self.warning_window.start_now_clicked.connect(self.core.start_big_break)
+        self.warning_window.postpone_clicked.connect(self.core.postpone_big_break)
         self.warning_window.show()
-
-    def on_warning_postponed(self):
-        if self.warning_window:
-            self.warning_window.close()
-            self.warning_window = None
-        self.timer_manager.postpone_big_break(5)
-
-    def start_big_break(self):
+        # Пока идет обратный отсчет, готовим окно перерыва
+        QTimer.singleShot(0, lambda: self.prepare_pause_window(is_big_break=True))
+
+    def close_warning_window(self):
+        window, self.warning_window = self.warning_window, None
+        if window: window.close()
+
+    def pause_screen(self):
+        """Экран для содержимого перерыва по настройке pause_screen: primary, cursor или имя экрана."""
+        choice = self.settings.get('pause_screen', 'primary') or 'primary'
+        if choice == 'cursor': return self.screenAt(QCursor.pos()) or self.primaryScreen()
+        if choice != 'primary':
+            for screen in self.screens():
+                if screen.name() == choice: return screen
+        return self.primaryScreen()
+
+    def show_pause_window(self, is_big_break):
         if self.active_pause_window: return
-        if self.warning_window:
-            self.warning_window.close()
-            self.warning_window = None
-        self.timer_manager.stop_all_timers()
-        text = self.xml_manager.get_random_practice()
-        duration = self.settings.get('big_break_duration', 5) * 60
-        strict = self.settings.get('strict_mode', False)
-        self.active_pause_window = PauseWindow(self, text, duration, is_big_break=True, strict_mode=strict)
+        triggered_at = time.perf_counter()
+        self.active_pause_window = self.take_pause_window(is_big_break)
+        self.active_pause_window.move_to_screen(self.pause_screen())
         self.active_pause_window.pause_finished.connect(self.on_pause_finished)
-        self.active_pause_window.show()
+        self.active_pause_window.present(triggered_at)
+
+    def close_pause_window(self):
+        window, self.active_pause_window = self.active_pause_window, None
+        if window: window.finish_pause(manually_interrupted=False)
 
     def on_pause_finished(self, manually_interrupted):
         if not self.active_pause_window: return
-        was_big_break = self.active_pause_window.is_big_break
-        was_strict = self.active_pause_window.strict_mode
         self.active_pause_window = None
-        if was_big_break and was_strict and manually_interrupted:
-            self.start_big_break()
-            return
-        if was_big_break and not manually_interrupted and self.settings.get('sound_enabled', True):
-            self.sound_manager.play_end_sound()
-        self.apply_settings()
-
-    def on_user_inactive(self):
-        if self.is_paused_by_user or self.is_temporarily_disabled: return
-        print("Пользователь неактивен, таймеры на паузе.")
-        self.timer_manager.pause_all_timers()
-
-    def on_user_active(self):
-        if self.is_paused_by_user or self.is_temporarily_disabled: return
-        print("Пользователь снова активен, перезапускаем таймеры.")
-        self.timer_manager.resume_all_timers()
-
-    def test_big_break(self):
-        if self.active_pause_window: self.active_pause_window.close()
-        self.start_big_break()
-
-    def test_short_pause(self):
-        if self.active_pause_window: self.active_pause_window.close()
-        self.show_short_pause()
-
-    def disable_temporarily(self, hours):
-        self.is_temporarily_disabled = True
-        self.timer_manager.stop_all_timers()
-        self.activity_tracker.stop()
-        self.tray_icon.setIcon(self.paused_icon)
-        self.tray_icon.setToolTip(f"MindfulPause - Отключено на {hours} час(а)")
-        self.disable_timer.start(hours * 3600 * 1000)
-        print(f"Приложение отключено на {hours} час(а).")
-
-    def enable_app(self):
-        self.is_temporarily_disabled = False
-        self.tray_icon.setIcon(self.active_icon)
-        self.tray_icon.setToolTip("MindfulPause")
-        if not self.is_paused_by_user:
-            self.apply_settings()
-        print("Приложение снова активно.")
+        self.core.pause_finished(manually_interrupted)
+        QTimer.singleShot(self.PREPARE_DELAY_MS, self.prepare_upcoming_windows)
+
+    def play_sound(self, cue):
+        """Звук не обязателен: его сбой (например, QtMultimedia без звуковой подсистемы) только пишется в лог."""
+        try:
+            if cue == 'start': self.sound_manager.play_start_sound()
+            else: self.sound_manager.play_end_sound()
+        except Exception:
+            logging.exception(f"Не удалось проиграть звук {cue}")
+
+    def test_big_break(self): self.core.break_now()
+    def test_short_pause(self): self.core.start_short_pause()
+
+    def disable_temporarily(self, hours): self.core.disable(hours)
+    def enable_app(self): self.core.enable()
+
+    # --- Канал управления: python MindfulPause.py <команда> ---
+    def on_control_command(self, command, args):
+        if command == 'break-now':
+            self.test_big_break(); return tr("Большой перерыв начат.")
+        if command == 'pause':
+            self.core.set_paused(True); return tr("Таймеры приостановлены.")
+        if command == 'resume':
+            if self.core.is_temporarily_disabled: self.enable_app()
+            self.core.set_paused(False); return tr("Таймеры возобновлены.")
+        if command == 'disable':
+            try: hours = float(args[0])
+            except (IndexError, ValueError): raise ValueError(tr("укажите число часов: disable <часы>"))
+            if not 0 < hours <= 24 * 7: raise ValueError(tr("число часов должно быть от 0 до 168"))
+            self.disable_temporarily(int(hours) if hours.is_integer() else hours)
+            return tr("Отключено на {hours} час(а).", hours=self.core.disabled_hours)
+        if command == 'enable':
+            self.enable_app(); return tr("Приложение снова активно.")
+        if command == 'status': return self.status_text()
+        if command == 'reload':
+            self.xml_manager.reload_practices(); self.asset_catalog.sync(); self.on_settings_saved()
+            return tr("Настройки и практики перечитаны.")
+        if command == 'settings':
+            self.show_settings(); return ''
+        raise ValueError(tr("неизвестная команда {command}", command=command))
+
+    def status_text(self):
+        core = self.core
+        def left(name):
+            seconds = core.remaining(name)
+            return None if seconds is None else f"{int(seconds // 60)}:{int(seconds % 60):02d}"
+        if core.is_temporarily_disabled: state = tr("отключено на {hours} час(а), осталось {left}", hours=core.disabled_hours, left=left(core.DISABLE))
+        elif core.is_paused_by_user: state = tr("на паузе")
+        else: state = {core.MODE_BIG_BREAK: tr("большой перерыв"), core.MODE_SHORT_PAUSE: tr("короткая пауза"),
+                       core.MODE_WARNING: tr("предупреждение о перерыве")}.get(core.mode, tr("работа"))
+        parts = [tr("Состояние: {state}", state=state)]
+        for name, title in ((core.BIG_BREAK, tr("до большого перерыва {left}")), (core.SHORT_PAUSE, tr("до короткой паузы {left}"))):
+            if left(name) is not None: parts.append(title.format(left=left(name)))
+        today = self.break_history.today()
+        parts.append(tr("сегодня больших перерывов {completed} из {total}", completed=today['completed'], total=today['completed'] + today['skipped']))
+        if core.last_big_break_at: parts.append(tr("последний большой перерыв в {time}", time=time.strftime('%H:%M', time.localtime(core.last_big_break_at))))
+        return '; '.join(parts)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=os.environ.get('MINDFULPAUSE_LOG_LEVEL', 'WARNING').upper(),
+                        format='%(asctime)s %(levelname)s %(message)s')
     app = MindfulPauseApp(sys.argv)
+    if not app.is_primary_instance:
+        print("MindfulPause уже запущен."); sys.exit(0)
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,56 @@
+# benchmarks/bench_font_fit.py
+#
+# Микробенчмарк подбора шрифта для длинных русских практик.
+# Запуск: QT_QPA_PLATFORM=offscreen python benchmarks/bench_font_fit.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QFont, QTextDocument
+from gui.font_fitter import FontFitter
+
+FAMILY, MIN_SIZE, MAX_SIZE = "Arial", 12, 32
+PARAGRAPH = ("Сядьте удобно, закройте глаза и мысленно пройдитесь по всему телу от кончиков пальцев ног "
+             "до макушки, замечая все ощущения: тепло, прохладу, напряжение, покалывание. ")
+TEXTS = [PARAGRAPH * n for n in (1, 4, 12, 30)]
+AREAS = [(1620, 520), (500, 135), (3540, 1100)]
+
+def linear_fit(text, width, height):
+    """Прежний алгоритм: линейный перебор от MAX_SIZE вниз с шагом 1."""
+    doc = QTextDocument(); doc.setPlainText(text)
+    size = MAX_SIZE
+    while size >= MIN_SIZE:
+        doc.setDefaultFont(QFont(FAMILY, size)); doc.setTextWidth(width)
+        if doc.size().height() <= height: return size
+        size -= 1
+    return MIN_SIZE
+
+def measure(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in TEXTS:
+            for width, height in AREAS: func(text, width, height)
+        best = min(best, time.perf_counter() - start)
+    return best / (len(TEXTS) * len(AREAS)) * 1000
+
+def main():
+    print(f"linear (шаг 1)      : {measure(linear_fit):8.3f} мс/вызов")
+    cold = lambda text, w, h: FontFitter(FAMILY, MIN_SIZE, MAX_SIZE).fit(text, w, h)
+    print(f"binary (шаг 0.5)    : {measure(cold):8.3f} мс/вызов")
+    warm = FontFitter(FAMILY, MIN_SIZE, MAX_SIZE)
+    print(f"binary + memo       : {measure(warm.fit):8.3f} мс/вызов")
+    for text in TEXTS:
+        fitter = FontFitter(FAMILY, MIN_SIZE, MAX_SIZE)
+        width, height = AREAS[0]
+        size = fitter.fit(text, width, height)
+        print(f"  {len(text):5d} симв.: linear {linear_fit(text, width, height):4.1f} pt, binary {size:4.1f} pt за {fitter.layout_passes} раскладок")
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    main()
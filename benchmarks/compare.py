@@ -0,0 +1,45 @@
+# benchmarks/compare.py
+#
+# Сравнение двух файлов результатов набора бенчмарков.
+# Запуск: python benchmarks/compare.py baseline.json current.json [--threshold 0.2]
+# Код возврата 1, если хотя бы один замер замедлился больше порога.
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import load_results
+
+NOISE_FLOOR_MS = 0.05  # разница меньше этого не считается регрессией, как бы ни изменилось отношение
+
+def compare(baseline, current, threshold=0.2):
+    """Возвращает (строки отчета, список регрессий) по медианам общих замеров."""
+    old, new = baseline['results'], current['results']
+    lines, regressions = [], []
+    for name in sorted(set(old) | set(new)):
+        if name not in new: lines.append(f"  {name:<60} {'удален':>32}"); continue
+        if name not in old: lines.append(f"  {name:<60} {'новый':>21} {new[name]['median']:10.3f}"); continue
+        before, after = old[name]['median'], new[name]['median']
+        ratio = after / before if before > 0 else float('inf')
+        mark = ''
+        if ratio > 1 + threshold and after - before > NOISE_FLOOR_MS: mark = '  РЕГРЕССИЯ'; regressions.append(name)
+        elif ratio < 1 / (1 + threshold) and before - after > NOISE_FLOOR_MS: mark = '  ускорение'
+        lines.append(f"  {name:<60} {before:10.3f} -> {after:10.3f} мс  x{ratio:5.2f}{mark}")
+    return lines, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сравнение результатов бенчмарков")
+    parser.add_argument('baseline'); parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.2, help='допустимое замедление (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    print(f"{baseline['environment'].get('git_revision')} -> {current['environment'].get('git_revision')}")
+    lines, regressions = compare(baseline, current, args.threshold)
+    print('\n'.join(lines))
+    if regressions: print(f"\nЗамедлились больше чем на {args.threshold:.0%}: {', '.join(regressions)}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# benchmarks/harness.py
+#
+# Общая часть набора бенчмарков: регистрация групп, замер и сохранение результатов в JSON.
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+SCHEMA_VERSION = 1
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Suite:
+    """Набор бенчмарков: группы регистрируются декоратором group, результаты копятся в results.
+
+    Функция группы получает Suite и вызывает measure() для каждого замера; вся подготовка
+    (файлы, окна) делается в ней же и в замер не попадает.
+    """
+    def __init__(self, repeat=7, name_filter=None):
+        self.repeat = repeat
+        self.name_filter = name_filter
+        self.groups = []
+        self.results = {}
+
+    def group(self, name):
+        def register(func): self.groups.append((name, func)); return func
+        return register
+
+    def wanted(self, name): return not self.name_filter or self.name_filter in name
+
+    def measure(self, name, func, setup=None, number=1, **params):
+        """Время одного вызова func в мс: лучшее, медиана и т.д. по repeat повторам из number вызовов.
+
+        setup() выполняется перед каждым повтором вне замера.
+        """
+        if params: name += '[' + ','.join(f"{key}={value}" for key, value in params.items()) + ']'
+        if not self.wanted(name): return None
+        samples = []
+        gc_was_enabled = gc.isenabled()
+        for _ in range(self.repeat):
+            if setup is not None: setup()
+            gc.collect(); gc.disable()
+            try:
+                start = time.perf_counter()
+                for _ in range(number): func()
+                samples.append((time.perf_counter() - start) * 1000 / number)
+            finally:
+                if gc_was_enabled: gc.enable()
+        result = {'unit': 'ms', 'min': min(samples), 'median': statistics.median(samples),
+                  'mean': statistics.fmean(samples), 'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                  'repeat': self.repeat, 'number': number, 'params': params}
+        self.results[name] = result
+        print(f"  {name:<60} {result['median']:10.3f} мс  (мин {result['min']:.3f}, ±{result['stdev']:.3f})")
+        return result
+
+    def run(self):
+        for name, func in self.groups:
+            print(f"{name}:")
+            func(self)
+        return self.results
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def environment():
+    try:
+        import PySide6
+        qt_version = PySide6.__version__
+    except ImportError:
+        qt_version = None
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'machine': platform.machine(),
+            'cpu_count': os.cpu_count(), 'pyside6': qt_version, 'qt_qpa_platform': os.environ.get('QT_QPA_PLATFORM'),
+            'git_revision': git_revision(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'argv': sys.argv[1:]}
+
+def save_results(path, results):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'schema': SCHEMA_VERSION, 'environment': environment(), 'results': results},
+                  f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
+    if data.get('schema') != SCHEMA_VERSION:
+        raise ValueError(f"{path}: неизвестная версия формата результатов {data.get('schema')}")
+    return data
@@ -0,0 +1,240 @@
+# benchmarks/run_suite.py
+#
+# Набор бенчмарков горячих путей: настройки, практики, окно паузы, отрисовка, список практик.
+# Запуск: QT_QPA_PLATFORM=offscreen python benchmarks/run_suite.py [--output results.json]
+#         [--filter paint] [--quick] [--compare baseline.json]
+# Результаты пишутся в JSON (по умолчанию benchmarks/results/<ревизия>.json) для compare.py.
+
+import os
+import sys
+import shutil
+import argparse
+import itertools
+import time
+import tempfile
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication, QWidget
+from PySide6.QtGui import QImage, QRegion
+from PySide6.QtCore import QPoint
+
+from benchmarks.harness import ROOT_DIR, Suite, git_revision, save_results, load_results
+from benchmarks import compare
+from utils.xml_manager import XMLManager, canonical_xml
+from utils.asset_catalog import AssetCatalog
+
+PRACTICE_COUNTS = (10_000, 50_000)
+BLOAT_LINES = 15_000  # примерно столько пустых строк с отступом было в раздутом settings_ru.xml
+SCREENS = {'1080p': (1920, 1080), '4K': (3840, 2160)}
+PHOTO_SIZE = (4000, 3000)
+HISTORY_YEARS = 3
+PARAGRAPH = ("Сядьте удобно, закройте глаза и мысленно пройдитесь по всему телу от кончиков пальцев ног "
+             "до макушки, замечая все ощущения: тепло, прохладу, напряжение, покалывание. ")
+
+class AppStub:
+    """Окнам паузы от приложения нужны только BASE_DIR и каталог картинок."""
+    def __init__(self, base_dir):
+        self.BASE_DIR = base_dir
+        self.asset_catalog = AssetCatalog(os.path.join(base_dir, 'data', 'pict'))
+
+def make_workspace():
+    """Копия data/ во временном каталоге, чтобы бенчмарки не трогали файлы репозитория."""
+    base_dir = tempfile.mkdtemp(prefix='mindfulpause-bench-')
+    shutil.copytree(os.path.join(ROOT_DIR, 'data'), os.path.join(base_dir, 'data'),
+                    ignore=shutil.ignore_patterns('sampler_state.json', '*.cache.wav'))
+    return base_dir
+
+def practice_texts(count):
+    return [f"Практика {i}. " + PARAGRAPH * (1 + i % 3) for i in range(count)]
+
+def write_practices(path, count, root_tag='practices'):
+    root = ET.Element(root_tag)
+    for text in practice_texts(count): ET.SubElement(root, 'practice').text = text
+    with open(path, 'w', encoding='utf-8') as f: f.write(canonical_xml(root))
+
+def bloat(xml_text, lines=BLOAT_LINES):
+    """Раздувает XML так же, как его раздувала прежняя запись через toprettyxml: пустыми строками с отступом."""
+    per_tag = max(1, lines // max(1, xml_text.count('>\n')))
+    return xml_text.replace('>\n', '>\n' + '  \n' * per_tag)
+
+def build_suite(suite, base_dir, qt_app):
+    data_dir = os.path.join(base_dir, 'data')
+    app_stub = AppStub(base_dir)
+
+    @suite.group('Настройки (XMLManager)')
+    def settings(suite):
+        manager = XMLManager(data_dir=data_dir)
+        values = manager.load_settings()
+        settings_path = manager.settings_path
+        with open(settings_path, 'r', encoding='utf-8') as f: canonical = f.read()
+        bloated = bloat(canonical)
+        def write_bloated():
+            with open(settings_path, 'w', encoding='utf-8') as f: f.write(bloated)
+        suite.measure('xml.load_settings', manager.load_settings, size='realistic', number=20)
+        suite.measure('xml.load_settings', manager.load_settings, setup=write_bloated, size='bloated')
+        save = lambda: (manager.save_settings(values), manager.flush())
+        suite.measure('xml.save_settings', save, size='realistic', number=5)
+        suite.measure('xml.save_settings', save, setup=write_bloated, size='bloated')
+        # Сколько ждет GUI-поток: сама запись уходит в FileWriter
+        suite.measure('xml.save_settings', lambda: manager.save_settings(values), size='realistic', number=5, thread='gui')
+        manager.flush()
+
+    @suite.group('Практики (PracticeStore)')
+    def practices(suite):
+        for count in PRACTICE_COUNTS:
+            manager = XMLManager(data_dir=data_dir)
+            write_practices(manager.practice_store.file_path, count)
+            store = manager.practice_store
+            suite.measure('practices.load', store.invalidate, count=count)
+            suite.measure('practices.random_draw', manager.get_random_practice, number=200, count=count)
+            store.search('прогрев')  # индекс строится при первом поиске
+            suite.measure('practices.search', lambda: store.search('макушки, замечая'), count=count)
+            suite.measure('practices.search', lambda: store.search('Практика 4999.'), query='rare', count=count)
+
+    @suite.group('Журнал состояния (StateJournal)')
+    def journal(suite):
+        from utils.break_core import BreakCore
+        from utils.state_journal import StateJournal
+        ticks = itertools.count(0, 1.0)  # каждый вызов на секунду позже: снимки различаются, и каждая строка пишется
+        core = BreakCore({}, clock=lambda: next(ticks))
+        core.journal = StateJournal(os.path.join(data_dir, 'state.journal'))
+        core.apply_settings()
+        # Каждый переход ядра (пауза, простой, перерыв) — снимок состояния и одна дописанная строка
+        suite.measure('journal.record', core._changed, number=200)
+        suite.measure('journal.load', core.journal.load, number=20)
+
+    @suite.group('История перерывов (BreakHistory)')
+    def history(suite):
+        from utils.break_history import BreakHistory
+        store = BreakHistory(os.path.join(data_dir, 'history.sqlite3'))
+        now = time.time()
+        with store.db:  # три года по шесть перерывов в день
+            for index in range(HISTORY_YEARS * 365 * 6):
+                ts = now - index * 4 * 3600
+                store.record('big', 'started', 300, ts=ts); store.record('big', 'completed' if index % 4 else 'skipped', 300, ts=ts)
+        suite.measure('history.record', lambda: store.record('big', 'postponed', 300), number=50)
+        suite.measure('history.daily', lambda: store.daily(14), number=20, years=HISTORY_YEARS)
+        suite.measure('history.weekly', lambda: store.weekly(8), number=20, years=HISTORY_YEARS)
+        store.close()
+
+    @suite.group('Локализация (MessageCatalog)')
+    def i18n(suite):
+        from utils.i18n import MessageCatalog, read_pack
+        cache_dir = os.path.join(data_dir, 'lang_cache')
+        new_catalog = lambda: MessageCatalog('de', data_dir, cache_dir)
+        remove_cache = lambda: os.path.exists(new_catalog().cache_path) and os.remove(new_catalog().cache_path)
+        # Первый запуск компилирует пакет, следующие читают готовый каталог одним чтением
+        suite.measure('i18n.load', lambda: new_catalog().load(), setup=remove_cache, cache='cold')
+        suite.measure('i18n.load', lambda: new_catalog().load(), number=20, cache='warm')
+        catalog = new_catalog()
+        sources = list(read_pack(catalog.pack_path))
+        def lookup_all():
+            catalog._memo.clear()  # поиск по самому каталогу, а не по запомненным строкам
+            for text in sources: catalog.lookup(text)
+        suite.measure('i18n.lookup', lookup_all, number=20, strings=len(sources))
+
+    @suite.group('Окно паузы (PauseWindow)')
+    def pause_window(suite):
+        from gui.pause_window import PauseWindow
+        text = PARAGRAPH * 4
+        suite.measure('pause_window.construct', lambda: PauseWindow(app_stub, text, 300, is_big_break=True), kind='big_break')
+        suite.measure('pause_window.construct', lambda: PauseWindow(app_stub, text, 20, is_big_break=False, darken_screen=False),
+                      kind='short_pause')
+        window = PauseWindow(app_stub, text, 300, is_big_break=True)
+        size = window.text_area.size()
+        fit = lambda: window._get_optimal_font_size_for_widget(text, size)
+        suite.measure('pause_window.font_fit', fit, setup=PauseWindow.font_fitter.clear, cache='cold')
+        suite.measure('pause_window.font_fit', fit, number=100, cache='warm')
+
+    @suite.group('Изображения (ImagePyramid)')
+    def images(suite):
+        from PySide6.QtCore import QSize
+        from PySide6.QtGui import QColor, QLinearGradient, QPainter
+        from gui.image_pyramid import ImagePyramid
+        # Фотография с камеры: исходники в data/pict маленькие, и копий для них почти нет
+        photo = QImage(PHOTO_SIZE[0], PHOTO_SIZE[1], QImage.Format_RGB32)
+        painter = QPainter(photo)
+        gradient = QLinearGradient(0, 0, PHOTO_SIZE[0], PHOTO_SIZE[1])
+        gradient.setColorAt(0, QColor('#204060')); gradient.setColorAt(1, QColor('#e0c080'))
+        painter.fillRect(photo.rect(), gradient); painter.end()
+        target = QSize(1100, 600)  # область картинки большого перерыва на экране 1080p: исходник намного больше
+        pyramid = ImagePyramid(os.path.join(data_dir, 'pict_cache'))
+        for fmt in ('jpg', 'png'):
+            path = os.path.join(data_dir, f'photo.{fmt}'); photo.save(path, fmt.upper(), 90)
+            suite.measure('image.load', lambda: ImagePyramid().load_image(path, target), variant='source', format=fmt)
+            # Копии строятся вне замеров: иначе при --filter image.load их бы не было и оба замера читали исходник
+            pyramid.build([path])
+            if pyramid.variant_path(path, target) == path: raise RuntimeError(f"ImagePyramid не выбрал уменьшенную копию для {path}")
+            suite.measure('image.load', lambda: pyramid.load_image(path, target), variant='pyramid', format=fmt)
+        path = os.path.join(data_dir, 'photo.jpg')
+        suite.measure('image.pyramid_build', lambda: pyramid.build([path]),
+                      setup=lambda: shutil.rmtree(pyramid.cache_dir, ignore_errors=True) or pyramid.configure(pyramid.cache_dir))
+
+    @suite.group('Отрисовка (paintEvent)')
+    def paint(suite):
+        from gui.pause_window import PauseWindow
+        def measure_frame(window, region=QRegion(), **params):
+            image = QImage(window.size(), QImage.Format_ARGB32_Premultiplied)
+            # Только собственный paintEvent окна, без дочернего QTextEdit
+            frame = lambda: window.render(image, QPoint(), region, QWidget.DrawWindowBackground)
+            frame()  # первый кадр прогревает кэш изображений
+            suite.measure('paint.pause_window', frame, number=5, **params)
+        for screen, (width, height) in SCREENS.items():
+            window = PauseWindow(app_stub, PARAGRAPH * 4, 300, is_big_break=True)
+            window.resize(width, height)
+            measure_frame(window, screen=screen, kind='big_break')
+            # Ежесекундный кадр отсчета: перерисовывается только прямоугольник с текстом времени
+            measure_frame(window, region=QRegion(window.countdown_rect), screen=screen, kind='countdown_tick')
+        # Окно короткой паузы без затемнения фиксированного размера и от экрана не зависит
+        measure_frame(PauseWindow(app_stub, PARAGRAPH, 20, is_big_break=False, darken_screen=False), kind='short_pause')
+
+    @suite.group('Список практик (SettingsWindow)')
+    def practices_list(suite):
+        from gui.settings_window import SettingsWindow
+        for count in PRACTICE_COUNTS:
+            manager = XMLManager(data_dir=data_dir)
+            path = manager.practice_store.file_path
+            write_practices(path, count)
+            window = SettingsWindow(None, manager)
+            def touch():
+                stat = os.stat(path); os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            suite.measure('settings.update_practices_list', window.update_practices_list, setup=touch, count=count, file='changed')
+            suite.measure('settings.update_practices_list', window.update_practices_list, number=20, count=count, file='unchanged')
+            window.filter_practices('прогрев')  # индекс строится при первом поиске
+            suite.measure('settings.filter', lambda: window.filter_practices('замечая все'), setup=lambda: window.filter_practices(''),
+                          count=count)
+            window.filter_practices('')
+            window.deleteLater(); qt_app.processEvents()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Набор бенчмарков MindfulPause")
+    parser.add_argument('--output', help='файл результатов (по умолчанию benchmarks/results/<ревизия>.json)')
+    parser.add_argument('--filter', help='запускать только замеры, в имени которых есть эта подстрока')
+    parser.add_argument('--quick', action='store_true', help='меньше повторов, для быстрой проверки')
+    parser.add_argument('--compare', metavar='BASELINE', help='сравнить с прежними результатами')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    qt_app = QApplication.instance() or QApplication(sys.argv[:1])
+    base_dir = make_workspace()
+    suite = Suite(repeat=3 if args.quick else 7, name_filter=args.filter)
+    try:
+        build_suite(suite, base_dir, qt_app)
+        results = suite.run()
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(ROOT_DIR, 'benchmarks', 'results', f"{git_revision() or 'local'}.json")
+    save_results(output, results)
+    print(f"\nРезультаты: {output}")
+    if args.compare:
+        lines, regressions = compare.compare(load_results(args.compare), load_results(output), args.threshold)
+        print('\n'.join(lines))
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
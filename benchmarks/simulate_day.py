@@ -0,0 +1,65 @@
+# benchmarks/simulate_day.py
+#
+# Прогон рабочего дня через BreakCore на поддельных часах, без Qt и без ожидания.
+# Запуск: python benchmarks/simulate_day.py [--hours 8] [--idle 150:45,300:60]
+# --idle — периоды простоя "начало_мин:длительность_мин" от начала дня.
+
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.break_core import BreakCore
+
+class FakeClock:
+    """Часы, которые идут только когда их просят: sleep мгновенно сдвигает время."""
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+    def sleep(self, seconds): self.now += seconds
+
+def parse_idle(spec):
+    periods = []
+    for part in filter(None, spec.split(',')):
+        start, length = part.split(':')
+        periods.append((float(start) * 60, float(length) * 60))
+    return sorted(periods)
+
+def simulate(hours, idle_periods, settings=None):
+    clock = FakeClock()
+    core = BreakCore(settings or {}, clock=clock, finish_pauses=True, wall_clock=clock)
+    log = []
+    core.subscribe(lambda intent, **payload: log.append((clock(), intent, payload)))
+    core.apply_settings()
+    for start, length in idle_periods:
+        core.run_until(start, clock.sleep); core.user_inactive()
+        core.run_until(start + length, clock.sleep); core.user_active()
+    core.run_until(hours * 3600, clock.sleep)
+    return log
+
+def format_time(seconds): h, rest = divmod(int(seconds), 3600); return f"{h:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hours', type=float, default=8)
+    parser.add_argument('--idle', default='150:45,300:60', help='периоды простоя, минуты: начало:длительность,...')
+    parser.add_argument('--quiet', action='store_true', help='не печатать журнал намерений')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    log = simulate(args.hours, parse_idle(args.idle))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if not args.quiet:
+        for at, intent, payload in log:
+            details = ', '.join(f"{key}={value}" for key, value in payload.items())
+            print(f"{format_time(at)}  {intent}" + (f" ({details})" if details else ''))
+    counts = Counter(intent for _, intent, _ in log)
+    print(f"\n{args.hours:g} ч: больших перерывов {counts[BreakCore.START_BIG_BREAK]}, "
+          f"коротких пауз {counts[BreakCore.START_SHORT_PAUSE]}, предупреждений {counts[BreakCore.SHOW_WARNING]}; "
+          f"симуляция заняла {elapsed:.1f} мс")
+
+if __name__ == '__main__':
+    main()
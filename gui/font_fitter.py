@@ -0,0 +1,52 @@
+# gui/font_fitter.py
+
+from collections import OrderedDict
+from PySide6.QtGui import QFont, QTextDocument
+
+class FontFitter:
+    """Подбирает наибольший кегль, при котором текст помещается в заданную область.
+
+    Вместо линейного перебора от максимального размера к минимальному выполняется
+    двоичный поиск по сетке размеров с шагом step (кегль может быть дробным),
+    а найденные значения запоминаются по ключу (текст, ширина, высота, шрифт).
+    """
+    def __init__(self, family, min_size, max_size, step=0.5, cache_size=256):
+        self.family, self.min_size, self.max_size, self.step = family, min_size, max_size, step
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.layout_passes = 0
+
+    def _font(self, size):
+        font = QFont(self.family); font.setPointSizeF(size)
+        return font
+
+    def _fits(self, doc, size, width, height):
+        self.layout_passes += 1
+        doc.setDefaultFont(self._font(size)); doc.setTextWidth(width)
+        return doc.size().height() <= height
+
+    def fit(self, text, width, height, document=None):
+        """Возвращает кегль для text в области width x height.
+
+        document — необязательный образец (например, документ QTextEdit), с которого
+        снимается копия, чтобы учесть его поля и форматирование.
+        """
+        key = (text, width, height, self.family)
+        size = self._cache.get(key)
+        if size is not None:
+            self._cache.move_to_end(key)
+            return size
+        if document is not None: doc = document.clone()
+        else: doc = QTextDocument(); doc.setPlainText(text)
+        steps = int(round((self.max_size - self.min_size) / self.step))
+        lo, hi, best = 0, steps, 0
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if self._fits(doc, self.min_size + mid * self.step, width, height): best, lo = mid, mid + 1
+            else: hi = mid - 1
+        size = self.min_size + best * self.step
+        self._cache[key] = size
+        if len(self._cache) > self.cache_size: self._cache.popitem(last=False)
+        return size
+
+    def clear(self): self._cache.clear()
@@ -0,0 +1,48 @@
+# gui/history_chart.py
+
+import time
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QRectF
+from PySide6.QtGui import QPainter, QColor
+from utils.i18n import tr
+
+class ComplianceChart(QWidget):
+    """Столбцы по дням: доведенные до конца большие перерывы и пропущенные поверх них.
+
+    Данные — готовые дневные сводки BreakHistory.daily(), виджет ничего не считает сам.
+    """
+    COMPLETED_COLOR = QColor('#9C27B0')
+    SKIPPED_COLOR = QColor('#E1BEE7')
+    AXIS_COLOR = QColor('#757575')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.days = []
+        self.weekdays = (tr('Пн'), tr('Вт'), tr('Ср'), tr('Чт'), tr('Пт'), tr('Сб'), tr('Вс'))
+        self.setMinimumHeight(140)
+
+    def set_days(self, days):
+        self.days = list(days)
+        self.setToolTip('\n'.join(tr("{day}: {completed} из {total}", day=day, completed=c['completed'], total=c['completed'] + c['skipped'])
+                                  for day, c in self.days if c['completed'] + c['skipped']))
+        self.update()
+
+    def paintEvent(self, event):
+        if not self.days: return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        label_height = self.fontMetrics().height() + 4
+        area = QRectF(self.rect()).adjusted(4, 4, -4, -label_height)
+        peak = max(max(c['completed'] + c['skipped'] for _, c in self.days), 1)
+        slot = area.width() / len(self.days)
+        painter.setPen(self.AXIS_COLOR)
+        for index, (day, counts) in enumerate(self.days):
+            x = area.left() + index * slot + slot * 0.15
+            width = slot * 0.7
+            done_height = area.height() * counts['completed'] / peak
+            skipped_height = area.height() * counts['skipped'] / peak
+            painter.fillRect(QRectF(x, area.bottom() - done_height, width, done_height), self.COMPLETED_COLOR)
+            painter.fillRect(QRectF(x, area.bottom() - done_height - skipped_height, width, skipped_height), self.SKIPPED_COLOR)
+            weekday = self.weekdays[time.strptime(day, '%Y-%m-%d').tm_wday]
+            painter.drawText(QRectF(area.left() + index * slot, area.bottom() + 2, slot, label_height), Qt.AlignCenter, weekday)
+        painter.drawLine(area.bottomLeft(), area.bottomRight())
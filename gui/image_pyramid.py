@@ -0,0 +1,144 @@
+# gui/image_pyramid.py
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import threading
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QImage, QImageReader
+from utils.asset_catalog import list_images
+
+class ImagePyramid:
+    """Уменьшенные копии картинок (512, 1024, 2048 px по длинной стороне) в кэш-каталоге.
+
+    Копии строятся один раз (при первом запуске в фоне или по требованию:
+    python -m gui.image_pyramid) и называются по хэшу содержимого исходника, так что
+    переименование файла не требует пересборки, а измененный файл получает новые копии.
+    Непрозрачные картинки хранятся в JPEG (декодируется быстрее PNG), с альфа-каналом — в PNG.
+    load_image берет наименьшую копию, покрывающую целевую область, и декодирует ее
+    сразу в нужном размере через QImageReader.setScaledSize. Пока каталог не задан
+    или копий нет, читается исходник — тоже сразу в целевом размере.
+    """
+    SIZES = (512, 1024, 2048)
+    INDEX_NAME = 'index.json'
+    JPEG_QUALITY = 92
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = None
+        self._index = {}  # абсолютный путь исходника -> {'mtime_ns', 'size', 'hash', 'width', 'height', 'format', 'variants'}
+        self._lock = threading.Lock()
+        self._building = False
+        self._pending_paths = None  # запрос, пришедший во время сборки: выполняется сразу после нее
+        if cache_dir: self.configure(cache_dir)
+
+    def configure(self, cache_dir):
+        self.cache_dir = cache_dir
+        try:
+            with open(os.path.join(cache_dir, self.INDEX_NAME), 'r', encoding='utf-8') as f: self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+    # --- Выбор и загрузка ---
+    def _fresh_entry(self, path):
+        entry = self._index.get(os.path.abspath(path))
+        if entry is None: return None
+        try: stat = os.stat(path)
+        except OSError: return None
+        return entry if (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size) else None
+
+    def variant_path(self, path, target):
+        """Наименьшая готовая копия, не требующая увеличения при вписывании в target, иначе исходник."""
+        entry = self._fresh_entry(path) if self.cache_dir else None
+        if entry is not None:
+            fitted = QSize(entry['width'], entry['height']).scaled(target, Qt.KeepAspectRatio)
+            longest_side = max(fitted.width(), fitted.height())
+            for size in entry['variants']:
+                if size >= longest_side:
+                    variant = os.path.join(self.cache_dir, f"{entry['hash']}_{size}.{entry['format']}")
+                    if os.path.exists(variant): return variant
+        return path
+
+    def load_image(self, path, target):
+        """QImage, вписанный в target (физические пиксели) с сохранением пропорций; пустой, если файла нет."""
+        reader = QImageReader(self.variant_path(path, target))
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid(): reader.setScaledSize(size.scaled(target, Qt.KeepAspectRatio))
+        image = reader.read()
+        return image if not image.isNull() else QImage()
+
+    # --- Построение копий ---
+    def build(self, paths):
+        """Строит недостающие копии для paths; возвращает число созданных файлов."""
+        if not self.cache_dir: return 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        created, changed = 0, False
+        for path in paths:
+            if self._fresh_entry(path) is not None: continue
+            try:
+                stat = os.stat(path)
+                with open(path, 'rb') as f: digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+            except OSError:
+                continue
+            source_size = QImageReader(path).size()
+            if not source_size.isValid(): continue
+            variants = [size for size in self.SIZES if size < max(source_size.width(), source_size.height())]
+            image_format = 'jpg'
+            for size in variants:
+                reader = QImageReader(path); reader.setAutoTransform(True)
+                reader.setScaledSize(source_size.scaled(QSize(size, size), Qt.KeepAspectRatio))
+                image = reader.read()
+                if image.isNull(): continue
+                # JPEG декодируется в разы быстрее PNG и умеет уменьшать при декодировании; PNG — только ради прозрачности
+                if image.hasAlphaChannel(): image_format = 'png'
+                variant = os.path.join(self.cache_dir, f"{digest}_{size}.{image_format}")
+                if os.path.exists(variant): continue
+                tmp_path = variant + '.tmp'
+                if not image.save(tmp_path, image_format.upper(), self.JPEG_QUALITY if image_format == 'jpg' else -1): continue
+                os.replace(tmp_path, variant); created += 1
+            with self._lock:
+                self._index[os.path.abspath(path)] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest,
+                                                      'width': source_size.width(), 'height': source_size.height(),
+                                                      'format': image_format, 'variants': variants}
+            changed = True
+        if changed: self._save_index()
+        return created
+
+    def _save_index(self):
+        from utils.file_writer import atomic_write
+        with self._lock: data = json.dumps(self._index, ensure_ascii=False, indent=1, sort_keys=True)
+        try: atomic_write(os.path.join(self.cache_dir, self.INDEX_NAME), data)
+        except OSError as e: logging.warning(f"Не удалось сохранить индекс копий изображений: {e}")
+
+    def build_async(self, paths):
+        """Строит копии в фоновом потоке (QImage и QImageReader можно использовать вне GUI-потока).
+
+        Если сборка уже идет, paths запоминаются (последний запрос заменяет предыдущие)
+        и собираются тем же потоком, когда текущая сборка закончится.
+        """
+        if not self.cache_dir: return
+        with self._lock:
+            if self._building:
+                self._pending_paths = list(paths); return
+            self._building = True
+        threading.Thread(target=self._build_loop, args=(list(paths),), name='image-pyramid', daemon=True).start()
+
+    def _build_loop(self, paths):
+        while paths is not None:
+            try: self.build(paths)
+            except Exception: logging.exception("Ошибка при построении копий изображений")
+            with self._lock:
+                paths, self._pending_paths = self._pending_paths, None
+                if paths is None: self._building = False
+
+# Общий экземпляр: настраивается приложением, используется кэшем изображений
+image_pyramid = ImagePyramid()
+
+if __name__ == '__main__':
+    # Сборка копий по требованию: python -m gui.image_pyramid [каталог data]
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+    pyramid = ImagePyramid(os.path.join(data_dir, 'pict_cache'))
+    images = list_images(os.path.join(data_dir, 'pict'))
+    print(f"Создано копий: {pyramid.build(images)} для {len(images)} изображений.")
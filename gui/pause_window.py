@@ -1,32 +1,67 @@
 # gui/pause_window.py
 
-import os
-import random
+import time
+import logging
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QDialog, QDialogButtonBox, QApplication,
                              QTextEdit, QFrame)
-from PySide6.QtCore import Qt, QTimer, Signal, QRect
-from PySide6.QtGui import QPainter, QColor, QPixmap, QFont, QPainterPath
+from PySide6.QtCore import Qt, QTimer, Signal, QRect, QRectF, QPoint, QMargins
+from PySide6.QtGui import QPainter, QColor, QFont, QFontMetrics, QPainterPath, QGuiApplication, QPixmap
 from utils.system_utils import block_input, unblock_input
+from gui.pixmap_cache import pixmap_cache
+from gui.font_fitter import FontFitter
+from utils.metrics import metrics
+from utils.i18n import tr
+
+DIM_COLOR = QColor(0, 0, 0, 230)
+
+class ScreenOverlay(QWidget):
+    """Затемнение одного из остальных экранов на время перерыва, без содержимого.
+
+    Фон берется из pixmap_cache.background: экраны одного размера и DPI рисуют один QPixmap.
+    Клавиши передаются окну перерыва, чтобы Esc работал, на каком бы экране ни был фокус.
+    """
+    def __init__(self, screen, owner):
+        super().__init__()
+        self.owner = owner
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setScreen(screen); self.setGeometry(screen.geometry())
+        screen.geometryChanged.connect(self.setGeometry)
+
+    def paintEvent(self, event):
+        QPainter(self).drawPixmap(0, 0, pixmap_cache.background(self.size(), self.devicePixelRatioF(), DIM_COLOR))
+
+    def keyPressEvent(self, event): self.owner.keyPressEvent(event)
 
 class PauseWindow(QWidget):
     pause_finished = Signal(bool)
     FONT_FAMILY = "Arial"; MIN_FONT_SIZE = 12; MAX_FONT_SIZE = 32; TIMER_FONT_SIZE = 24
     FS_V_PADDING = 80; FS_H_PADDING = 150; WIN_PADDING = 50
     IMAGE_V_RATIO = 0.45; TEXT_TOP_MARGIN = 20; TEXT_BOTTOM_MARGIN = 20; TIMER_AREA_HEIGHT = 60
+    COUNTDOWN_MARGINS = QMargins(12, 4, 12, 4)
+    # Общий для всех окон пауз: результаты подбора шрифта переживают пересоздание окна
+    font_fitter = FontFitter(FONT_FAMILY, MIN_FONT_SIZE, MAX_FONT_SIZE, step=0.5)
 
-    def __init__(self, app, practice_text, duration, is_big_break=False, strict_mode=False, darken_screen=True):
+    def __init__(self, app, practice_text, duration, is_big_break=False, strict_mode=False, darken_screen=True, screen=None):
         super().__init__()
+        self.content_screen = screen or QGuiApplication.primaryScreen()
+        self.overlays = {}  # QScreen -> ScreenOverlay остальных экранов, пока окно показано
+        self._watched_screen = None
         self.app, self.practice_text, self.duration, self.is_big_break, self.strict_mode, self.darken_screen = \
             app, practice_text, duration, is_big_break, strict_mode, darken_screen
+        self.is_fullscreen_mode = is_big_break or darken_screen
         self.remaining_time = duration
+        self.trigger_time = None
         self.image_path = self.get_random_image()
-        self.image_area, self.text_area, self.timer_area = QRect(), QRect(), QRect()
+        self.image_area, self.text_area, self.timer_area, self.countdown_rect = QRect(), QRect(), QRect(), QRect()
+        self.timer_font = QFont(self.FONT_FAMILY, self.TIMER_FONT_SIZE, QFont.Bold)
+        self._layer, self._layer_key = None, None
         self.init_ui()
-        self.start_timer()
-        if self.strict_mode and self.is_big_break: block_input()
-            
+
     def init_ui(self):
+        # Окно полностью готовится заранее, без показа: геометрия, шрифт и изображение,
+        # чтобы present() оставалось только вывести его на экран.
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.text_widget = QTextEdit(self)
@@ -34,14 +69,87 @@ class PauseWindow(QWidget):
         self.text_widget.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff); self.text_widget.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.text_widget.setStyleSheet("QTextEdit { background: transparent; color: #FFFDE7; border: none; }")
         self.text_widget.setText(self.practice_text)
-        if self.is_big_break or (not self.is_big_break and self.darken_screen): self.showFullScreen()
-        else: self.setFixedSize(600, 400); self.center_on_screen()
+        if not self.is_fullscreen_mode: self.setFixedSize(600, 400)
+        self.place_on_screen()
         self.recalculate_geometry(); self.apply_geometry_and_font()
+        self._background_layer()
+
+    def place_on_screen(self):
+        self.setScreen(self.content_screen)
+        if self.is_fullscreen_mode: self.setGeometry(self.content_screen.geometry())
+        else: self.center_on_screen()
+
+    def move_to_screen(self, screen):
+        """Переносит содержимое перерыва на другой экран (до или во время показа)."""
+        if screen is None or screen is self.content_screen: return
+        overlay = self.overlays.pop(screen, None)
+        if overlay is not None: overlay.close(); overlay.deleteLater()
+        previous, self.content_screen = self.content_screen, screen
+        self.place_on_screen()
+        if self.isVisible() and self.is_fullscreen_mode:
+            self.showFullScreen()
+            self._add_overlay(previous); self._watch_content_screen(screen)
+
+    def present(self, trigger_time=None):
+        """Показывает подготовленное окно и запускает отсчет. trigger_time — perf_counter() момента срабатывания таймера."""
+        self.trigger_time = trigger_time
+        if self.content_screen not in QGuiApplication.screens(): self.move_to_screen(QGuiApplication.primaryScreen())
+        if self.is_fullscreen_mode:
+            self.showFullScreen()
+            self.show_overlays()
+        else: self.show()
+        self.start_timer()
+        if self.strict_mode and self.is_big_break: block_input()
+
+    # --- Затемнение остальных экранов ---
+    def show_overlays(self):
+        for screen in QGuiApplication.screens(): self._add_overlay(screen)
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self._add_overlay); app.screenRemoved.connect(self._on_screen_removed)
+        self._watch_content_screen(self.content_screen)
+
+    def _watch_content_screen(self, screen):
+        if self._watched_screen is not None:
+            try: self._watched_screen.geometryChanged.disconnect(self._on_content_geometry_changed)
+            except (RuntimeError, TypeError): pass
+        self._watched_screen = screen
+        if screen is not None: screen.geometryChanged.connect(self._on_content_geometry_changed)
+
+    def _add_overlay(self, screen):
+        if screen is None or screen in self.overlays or screen is self.content_screen: return
+        overlay = self.overlays[screen] = ScreenOverlay(screen, self)
+        overlay.showFullScreen()
+
+    def _on_screen_removed(self, screen):
+        overlay = self.overlays.pop(screen, None)
+        if overlay is not None: overlay.close(); overlay.deleteLater()
+        if screen is self.content_screen:
+            remaining = [s for s in QGuiApplication.screens() if s is not screen]
+            if not remaining: return
+            # Отключенный экран не затемняем: move_to_screen не должен создавать для него оверлей
+            self._watched_screen = self.content_screen = None
+            primary = QGuiApplication.primaryScreen()
+            self.move_to_screen(primary if primary in remaining else remaining[0])
+
+    def _on_content_geometry_changed(self, geometry):
+        if self.is_fullscreen_mode: self.setGeometry(geometry)
+
+    def close_overlays(self):
+        if self._watched_screen is None and not self.overlays: return
+        app = QGuiApplication.instance()
+        for signal, slot in ((app.screenAdded, self._add_overlay), (app.screenRemoved, self._on_screen_removed)):
+            try: signal.disconnect(slot)
+            except (RuntimeError, TypeError): pass
+        self._watch_content_screen(None)
+        for overlay in self.overlays.values(): overlay.close(); overlay.deleteLater()
+        self.overlays.clear()
+
+    def closeEvent(self, event): self.close_overlays(); super().closeEvent(event)
 
     def resizeEvent(self, event): super().resizeEvent(event); self.recalculate_geometry(); self.apply_geometry_and_font()
 
     def recalculate_geometry(self):
-        is_fullscreen = self.isFullScreen()
+        is_fullscreen = self.is_fullscreen_mode
         v_pad = self.FS_V_PADDING if is_fullscreen else self.WIN_PADDING
         h_pad = self.FS_H_PADDING if is_fullscreen else self.WIN_PADDING
         content_rect = self.rect().adjusted(h_pad, v_pad, -h_pad, -v_pad)
@@ -52,56 +160,78 @@ class PauseWindow(QWidget):
         text_y_start = self.image_area.bottom() + self.TEXT_TOP_MARGIN
         text_y_end = self.timer_area.top() - (self.TEXT_BOTTOM_MARGIN if self.is_big_break else 0)
         self.text_area = QRect(content_rect.x(), text_y_start, content_rect.width(), text_y_end - text_y_start)
+        # Отсчет перерисовывается только в прямоугольнике самого текста: цифры в шрифте одной ширины
+        font_metrics = QFontMetrics(self.timer_font)
+        text_size = font_metrics.size(0, self.format_time(self.duration).translate(str.maketrans('123456789', '000000000')))
+        self.countdown_rect = QRect(QPoint(0, 0), text_size.grownBy(self.COUNTDOWN_MARGINS))
+        self.countdown_rect.moveCenter(self.timer_area.center())
+        self.countdown_rect &= self.timer_area
 
     def apply_geometry_and_font(self):
         self.text_widget.setGeometry(self.text_area)
         is_scrollable = self.text_widget.verticalScrollBar().maximum() > 0
         font_size = self.MIN_FONT_SIZE if is_scrollable else self._get_optimal_font_size_for_widget(self.practice_text, self.text_area.size())
-        font = QFont(self.FONT_FAMILY, font_size)
+        font = QFont(self.FONT_FAMILY); font.setPointSizeF(font_size)
         self.text_widget.setFont(font)
         self.text_widget.setAlignment(Qt.AlignCenter if not is_scrollable else Qt.AlignTop | Qt.AlignHCenter)
 
     def _get_optimal_font_size_for_widget(self, text, size):
-        temp_doc = self.text_widget.document().clone()
-        font_size = self.MAX_FONT_SIZE
-        while font_size >= self.MIN_FONT_SIZE:
-            font = QFont(self.FONT_FAMILY, font_size); temp_doc.setDefaultFont(font); temp_doc.setTextWidth(size.width())
-            if temp_doc.size().height() <= size.height(): return font_size
-            font_size -= 1
-        return self.MIN_FONT_SIZE
+        return self.font_fitter.fit(text, size.width(), size.height(), self.text_widget.document())
+
+    def _background_layer(self):
+        """Статичный слой: фон и изображение, собираются один раз на геометрию окна."""
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), round(dpr, 2), self.image_path)
+        if key == self._layer_key: return self._layer
+        layer = QPixmap(round(self.width() * dpr), round(self.height() * dpr)); layer.setDevicePixelRatio(dpr)
+        if self.is_fullscreen_mode: layer.fill(DIM_COLOR)
+        else: layer.fill(Qt.transparent)
+        painter = QPainter(layer); painter.setRenderHint(QPainter.Antialiasing)
+        if not self.is_fullscreen_mode: path = QPainterPath(); path.addRoundedRect(self.rect(), 15, 15); painter.fillPath(path, QColor(16, 16, 32, 242))
+        pixmap = pixmap_cache.get(self.image_path, self.image_area.size(), dpr)
+        if pixmap is not None:
+            img_draw_rect = QRect(QPoint(0, 0), pixmap.deviceIndependentSize().toSize()); img_draw_rect.moveCenter(self.image_area.center())
+            painter.drawPixmap(img_draw_rect, pixmap)
+        painter.end()
+        self._layer, self._layer_key = layer, key
+        return layer
 
+    @metrics.timed('pause_window_paint')
     def paintEvent(self, event):
-        painter = QPainter(self); painter.setRenderHint(QPainter.Antialiasing)
-        if self.isFullScreen(): painter.fillRect(self.rect(), QColor(0, 0, 0, 230))
-        else: path = QPainterPath(); path.addRoundedRect(self.rect(), 15, 15); painter.fillPath(path, QColor(16, 16, 32, 242))
-        if self.image_path and os.path.exists(self.image_path):
-            pixmap = QPixmap(self.image_path)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(self.image_area.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                img_draw_rect = QRect(0, 0, scaled_pixmap.width(), scaled_pixmap.height()); img_draw_rect.moveCenter(self.image_area.center())
-                painter.drawPixmap(img_draw_rect, scaled_pixmap)
-        if self.is_big_break:
-            painter.setPen(QColor("#FFFDE7")); painter.setFont(QFont(self.FONT_FAMILY, self.TIMER_FONT_SIZE, QFont.Bold))
-            painter.drawText(self.timer_area, Qt.AlignCenter, self.format_time(self.remaining_time))
-            
+        # Слой фона копируется только в перерисовываемую область; каждую секунду это лишь countdown_rect
+        rect, dpr = event.rect(), self.devicePixelRatioF()
+        painter = QPainter(self)
+        # Фон прозрачного окна перед отрисовкой очищен, поэтому слой можно копировать без смешивания
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawPixmap(QRectF(rect), self._background_layer(), QRectF(rect.x() * dpr, rect.y() * dpr, rect.width() * dpr, rect.height() * dpr))
+        if self.is_big_break and rect.intersects(self.countdown_rect):
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver); painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QColor("#FFFDE7")); painter.setFont(self.timer_font)
+            painter.drawText(self.countdown_rect, Qt.AlignCenter, self.format_time(self.remaining_time))
+        if self.trigger_time is not None:
+            elapsed = time.perf_counter() - self.trigger_time
+            metrics.observe('pause_window_shown', elapsed, kind='big_break' if self.is_big_break else 'short_pause')
+            self.trigger_time = None
+
     def get_random_image(self):
-        images_dir = os.path.join(self.app.BASE_DIR, 'data', 'pict')
-        if not os.path.exists(images_dir): return None
-        formats = ('.png', '.jpg', '.jpeg', '.bmp'); images = [f for f in os.listdir(images_dir) if f.lower().endswith(formats) and 'app.ico' not in f.lower()]
-        if images: return os.path.join(images_dir, random.choice(images))
-        return None
+        return self.app.asset_catalog.random_image()
         
     def format_time(self, seconds): m, s = divmod(seconds, 60); return f"{int(m):02d}:{int(s):02d}"
-    def center_on_screen(self): screen = QApplication.primaryScreen().geometry(); self.move((screen.width() - self.width()) // 2, (screen.height() - self.height()) // 2)
+    def center_on_screen(self): screen = self.content_screen.geometry(); self.move(screen.x() + (screen.width() - self.width()) // 2, screen.y() + (screen.height() - self.height()) // 2)
     def start_timer(self): self.timer = QTimer(self); self.timer.timeout.connect(self.update_timer); self.timer.start(1000)
-    def update_timer(self): self.remaining_time -= 1; self.update(); self.check_finish()
+    def update_timer(self):
+        self.remaining_time -= 1
+        if self.is_big_break: self.update(self.countdown_rect)  # у короткой паузы отсчет не отображается
+        self.check_finish()
     def check_finish(self):
         if self.remaining_time < 0: self.finish_pause(manually_interrupted=False)
 
     def finish_pause(self, manually_interrupted):
         self.timer.stop()
         if self.strict_mode and self.is_big_break: unblock_input()
+        self.close_overlays()
         self.pause_finished.emit(manually_interrupted); self.close()
+        logging.debug(f"Кэш изображений: {pixmap_cache.stats()}")
         
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
@@ -111,11 +241,11 @@ class PauseWindow(QWidget):
                 
     def show_exit_dialog(self):
         self.timer.stop()
-        dialog = QDialog(self); dialog.setWindowTitle("Подтверждение"); dialog.setWindowFlags(dialog.windowFlags() | Qt.WindowStaysOnTopHint)
+        dialog = QDialog(self); dialog.setWindowTitle(tr("Подтверждение")); dialog.setWindowFlags(dialog.windowFlags() | Qt.WindowStaysOnTopHint)
         dialog.setStyleSheet("background-color: #F3E5F5; color: black; font-size: 14px;")
-        layout = QVBoxLayout(dialog); layout.addWidget(QLabel("Вы уверены, что хотите прервать перерыв?"))
+        layout = QVBoxLayout(dialog); layout.addWidget(QLabel(tr("Вы уверены, что хотите прервать перерыв?")))
         buttons = QDialogButtonBox(QDialogButtonBox.Yes | QDialogButtonBox.No)
-        buttons.button(QDialogButtonBox.Yes).setText("Да"); buttons.button(QDialogButtonBox.No).setText("Нет")
+        buttons.button(QDialogButtonBox.Yes).setText(tr("Да")); buttons.button(QDialogButtonBox.No).setText(tr("Нет"))
         buttons.accepted.connect(dialog.accept); buttons.rejected.connect(dialog.reject)
         layout.addWidget(buttons)
         if dialog.exec() == QDialog.Accepted: self.finish_pause(manually_interrupted=True)
@@ -127,10 +257,10 @@ class BreakWarningWindow(QWidget):
         super().__init__(); self.remaining_time = duration; self.drag_position = None; self.init_ui(); self.start_countdown()
     def init_ui(self):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool); self.setAttribute(Qt.WA_TranslucentBackground); self.setFixedSize(320, 150)
-        self.main_label = QLabel("Большой перерыв"); self.main_label.setAlignment(Qt.AlignCenter); self.main_label.setStyleSheet("color: white; font-size: 16px; font-weight: bold;")
+        self.main_label = QLabel(tr("Большой перерыв")); self.main_label.setAlignment(Qt.AlignCenter); self.main_label.setStyleSheet("color: white; font-size: 16px; font-weight: bold;")
         self.timer_label = QLabel(); self.timer_label.setAlignment(Qt.AlignCenter); self.timer_label.setStyleSheet("color: white; font-size: 14px;")
-        postpone_btn = QPushButton("Отложить"); postpone_btn.clicked.connect(self.on_postpone)
-        start_btn = QPushButton("Начать сейчас"); start_btn.clicked.connect(self.on_start_now)
+        postpone_btn = QPushButton(tr("Отложить")); postpone_btn.clicked.connect(self.on_postpone)
+        start_btn = QPushButton(tr("Начать сейчас")); start_btn.clicked.connect(self.on_start_now)
         style = "QPushButton { background-color: white; color: #9C27B0; border: none; padding: 6px 12px; border-radius: 4px; font-weight: bold; } QPushButton:hover { background-color: #F3E5F5; }"
         postpone_btn.setStyleSheet(style); start_btn.setStyleSheet(style)
         layout = QVBoxLayout(); layout.addWidget(self.main_label); layout.addWidget(self.timer_label)
@@ -142,12 +272,12 @@ class BreakWarningWindow(QWidget):
     def mouseMoveEvent(self, event):
         if event.buttons() == Qt.LeftButton and self.drag_position: self.move(event.globalPosition().toPoint() - self.drag_position); event.accept()
     def mouseReleaseEvent(self, event): self.drag_position = None; event.accept()
-    def move_to_corner(self): screen = QApplication.primaryScreen().geometry(); self.move(screen.width()-self.width()-20, screen.height()-self.height()-60)
+    def move_to_corner(self): screen = QApplication.primaryScreen().geometry(); self.move(screen.x()+screen.width()-self.width()-20, screen.y()+screen.height()-self.height()-60)
     def start_countdown(self): self.timer = QTimer(self); self.timer.timeout.connect(self.countdown_tick); self.timer.start(1000)
     def countdown_tick(self):
         self.remaining_time -= 1; self.update_countdown_label()
         if self.remaining_time <= 0: self.on_start_now()
-    def update_countdown_label(self): self.timer_label.setText(f"Пауза через: {self.remaining_time} сек")
+    def update_countdown_label(self): self.timer_label.setText(tr("Пауза через: {seconds} сек", seconds=self.remaining_time))
     def on_postpone(self): self.timer.stop(); self.postpone_clicked.emit(); self.close()
     def on_start_now(self): self.timer.stop(); self.start_now_clicked.emit(); self.close()
     def closeEvent(self, event): self.timer.stop(); super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,74 @@
+# gui/pixmap_cache.py
+
+from collections import OrderedDict
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QPixmap
+from gui.image_pyramid import image_pyramid
+
+class PixmapCache:
+    """LRU-кэш готовых к отрисовке изображений.
+
+    Ключ — (путь, целевой размер, device pixel ratio), поэтому каждое изображение
+    декодируется и сглаженно масштабируется один раз на геометрию окна, а не при
+    каждой перерисовке. Суммарный объем ограничен max_bytes. Декодируется не исходник
+    целиком, а наименьшая подходящая копия из image_pyramid сразу в целевом размере.
+    Затемненный фон окон перерыва кэшируется так же: экраны одного размера и DPI
+    рисуют один и тот же QPixmap.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _cost(pixmap): return pixmap.width() * pixmap.height() * max(pixmap.depth(), 32) // 8
+
+    def get(self, path, size, dpr=1.0):
+        """Возвращает изображение, вписанное в size (в логических пикселях), или None."""
+        if not path or size.isEmpty(): return None
+        key = (path, size.width(), size.height(), round(dpr, 2))
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key); self.hits += 1
+        else:
+            self.misses += 1
+            pixmap = self._load(path, size, dpr)
+            self._insert(key, pixmap)
+        return None if pixmap.isNull() else pixmap
+
+    def background(self, size, dpr, color):
+        """Залитый полупрозрачным цветом фон размера size (логические пиксели)."""
+        key = ('background', size.width(), size.height(), round(dpr, 2), color.rgba())
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key); self.hits += 1
+            return pixmap
+        self.misses += 1
+        pixmap = QPixmap(QSize(round(size.width() * dpr), round(size.height() * dpr)))
+        pixmap.fill(color); pixmap.setDevicePixelRatio(dpr)
+        self._insert(key, pixmap)
+        return pixmap
+
+    def _load(self, path, size, dpr):
+        image = image_pyramid.load_image(path, QSize(round(size.width() * dpr), round(size.height() * dpr)))
+        if image.isNull(): return QPixmap()  # Кэшируем и отсутствие файла, чтобы не проверять его при каждой отрисовке
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+    def _insert(self, key, pixmap):
+        cost = self._cost(pixmap)
+        if cost > self.max_bytes: return
+        self._items[key] = pixmap; self._bytes += cost
+        while self._bytes > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self._bytes -= self._cost(evicted)
+
+    def clear(self): self._items.clear(); self._bytes = 0
+
+    def stats(self):
+        return f"попаданий {self.hits}, промахов {self.misses}, элементов {len(self._items)}, {self._bytes // 1024} КБ"
+
+# Общий кэш: окна пауз создаются заново на каждый перерыв, а изображения переиспользуются
+pixmap_cache = PixmapCache()
@@ -0,0 +1,99 @@
+# gui/practice_list_model.py
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class PracticeListModel(QAbstractListModel):
+    """Модель списка практик одного PracticeStore для QListView.
+
+    Строки — id практик, тексты берутся из хранилища по запросу представления,
+    поэтому виджеты создаются только для видимых строк. Отметки «выбрано» живут
+    в модели (набор id), а добавление и удаление применяются как точечные
+    вставки и удаления строк, без перестройки всего списка. Фильтр по подстроке
+    берет готовый список id из поискового индекса хранилища.
+    """
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._ids = []
+        self._checked = set()
+        self._generation = None
+        self._query = ''
+        self.sync()
+
+    # --- Интерфейс QAbstractListModel ---
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self._ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        pid = self._ids[index.row()]
+        if role == Qt.DisplayRole: return (self.store.text(pid) or '').replace('\n', ' ')
+        if role == Qt.ToolTipRole: return self.store.text(pid)
+        if role == Qt.CheckStateRole: return Qt.Checked if pid in self._checked else Qt.Unchecked
+        if role == Qt.UserRole: return pid
+        return None
+
+    def flags(self, index):
+        if not index.isValid(): return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole: return False
+        pid = self._ids[index.row()]
+        if Qt.CheckState(value) == Qt.Checked: self._checked.add(pid)
+        else: self._checked.discard(pid)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    # --- Синхронизация с хранилищем ---
+    def sync(self):
+        """Полностью перечитывает хранилище, только если файл был перезагружен с диска."""
+        self.store.refresh()
+        if self.store.generation == self._generation: return
+        self._generation = self.store.generation
+        self._checked &= set(self.store.ids())
+        self._apply_filter()
+
+    def set_filter_text(self, query):
+        if query == self._query: return
+        self._query = query
+        self._apply_filter()
+
+    def _apply_filter(self):
+        found = self.store.search(self._query)
+        self.beginResetModel()
+        self._ids = self.store.ids() if found is None else found
+        self.endResetModel()
+
+    def insert_ids(self, pids):
+        if self._query.strip(): self._apply_filter(); return
+        existing = set(self._ids)
+        pids = [pid for pid in pids if self.store.text(pid) is not None and pid not in existing]
+        if not pids: return
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(pids) - 1)
+        self._ids.extend(pids)
+        self.endInsertRows()
+
+    def remove_ids(self, pids):
+        pids = set(pids)
+        rows = [row for row, pid in enumerate(self._ids) if pid in pids]
+        if not rows: return
+        # Удаляем непрерывными диапазонами с конца, чтобы номера строк не сдвигались
+        ranges, start, prev = [], rows[0], rows[0]
+        for row in rows[1:]:
+            if row != prev + 1: ranges.append((start, prev)); start = row
+            prev = row
+        ranges.append((start, prev))
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._ids[first:last + 1]
+            self.endRemoveRows()
+        self._checked -= pids
+
+    # --- Выбор ---
+    def checked_ids(self): return [pid for pid in self._checked if self.store.text(pid) is not None]
+    def checked_texts(self): return [self.store.text(pid) for pid in self.checked_ids()]
+    def clear_checked(self):
+        if not self._checked: return
+        self._checked.clear()
+        if self._ids: self.dataChanged.emit(self.index(0), self.index(len(self._ids) - 1), [Qt.CheckStateRole])
@@ -4,9 +4,14 @@ import os
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTabWidget, QPushButton, QCheckBox, QSpinBox,
                              QLabel, QTextEdit, QGroupBox, QGridLayout,
-                             QTextBrowser, QScrollArea)
+                             QTextBrowser, QListView, QFileDialog, QProgressDialog,
+                             QMessageBox, QApplication, QLineEdit, QComboBox)
 from PySide6.QtCore import Signal, Qt, QTimer
 from PySide6.QtGui import QIcon
+from gui.practice_list_model import PracticeListModel
+from gui.history_chart import ComplianceChart
+from utils.xml_manager import practice_id
+from utils.i18n import tr, LANGUAGES, SOURCE_LANGUAGE, resolve_language
 
 class SettingsWindow(QMainWindow):
     settings_saved = Signal()
@@ -19,14 +24,14 @@ class SettingsWindow(QMainWindow):
         self.settings = xml_manager.load_settings()
         self.ui_texts = xml_manager.get_ui_texts()
         self.base_dir = getattr(app, 'BASE_DIR', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.practice_checkboxes = []
-        self.micropractice_checkboxes = []
+        self.practice_model = PracticeListModel(xml_manager.practice_store, self)
+        self.micropractice_model = PracticeListModel(xml_manager.micropractice_store, self)
         self.init_ui()
         self.load_settings()
         
     def init_ui(self):
-        self.setWindowTitle('Настройки MindfulPause')
-        self.setFixedSize(600, 580)
+        self.setWindowTitle(tr('Настройки MindfulPause'))
+        self.setFixedSize(600, 610)
         icon_path = os.path.join(self.base_dir, 'data', 'pict', 'app.ico')
         if os.path.exists(icon_path): self.setWindowIcon(QIcon(icon_path))
         central_widget = QWidget()
@@ -37,7 +42,7 @@ class SettingsWindow(QMainWindow):
         self.create_settings_tab()
         self.create_practices_tab()
         self.create_info_tab()
-        save_button = QPushButton('Сохранить и выйти')
+        save_button = QPushButton(tr('Сохранить и выйти'))
         save_button.clicked.connect(self.save_and_close)
         save_button.setStyleSheet("QPushButton { background-color: #9C27B0; color: white; padding: 8px; border-radius: 4px; font-weight: bold; } QPushButton:hover { background-color: #7B1FA2; }")
         main_layout.addWidget(save_button)
@@ -48,91 +53,139 @@ class SettingsWindow(QMainWindow):
         """Этот метод вызывается каждый раз, когда окно становится видимым."""
         super().showEvent(event)
         self.update_practices_list() # Обновляем список практик при каждом открытии окна
+        self.update_history()
         
     def create_settings_tab(self):
         settings_widget = QWidget()
         layout = QVBoxLayout(settings_widget)
-        big_break_group = QGroupBox('Большой перерыв')
+        big_break_group = QGroupBox(tr('Большой перерыв'))
         big_break_layout = QGridLayout(big_break_group)
-        self.big_break_checkbox = QCheckBox('Делать большой перерыв')
-        self.big_break_interval = QSpinBox(); self.big_break_interval.setRange(1, 480); self.big_break_interval.setSuffix(' мин')
-        self.big_break_duration = QSpinBox(); self.big_break_duration.setRange(1, 20); self.big_break_duration.setSuffix(' мин')
+        self.big_break_checkbox = QCheckBox(tr('Делать большой перерыв'))
+        self.big_break_interval = QSpinBox(); self.big_break_interval.setRange(1, 480); self.big_break_interval.setSuffix(tr(' мин'))
+        self.big_break_duration = QSpinBox(); self.big_break_duration.setRange(1, 20); self.big_break_duration.setSuffix(tr(' мин'))
         big_break_layout.addWidget(self.big_break_checkbox, 0, 0, 1, 3)
-        big_break_layout.addWidget(QLabel('Каждые:'), 1, 0); big_break_layout.addWidget(self.big_break_interval, 1, 1)
-        big_break_layout.addWidget(QLabel('Длительность:'), 2, 0); big_break_layout.addWidget(self.big_break_duration, 2, 1)
-        short_pause_group = QGroupBox('Короткая пауза')
+        big_break_layout.addWidget(QLabel(tr('Каждые:')), 1, 0); big_break_layout.addWidget(self.big_break_interval, 1, 1)
+        big_break_layout.addWidget(QLabel(tr('Длительность:')), 2, 0); big_break_layout.addWidget(self.big_break_duration, 2, 1)
+        short_pause_group = QGroupBox(tr('Короткая пауза'))
         short_pause_layout = QGridLayout(short_pause_group)
-        self.short_pause_checkbox = QCheckBox('Делать короткую паузу')
-        self.short_pause_interval = QSpinBox(); self.short_pause_interval.setRange(5, 60); self.short_pause_interval.setSuffix(' мин')
-        self.short_pause_duration = QSpinBox(); self.short_pause_duration.setRange(5, 60); self.short_pause_duration.setSuffix(' сек')
+        self.short_pause_checkbox = QCheckBox(tr('Делать короткую паузу'))
+        self.short_pause_interval = QSpinBox(); self.short_pause_interval.setRange(5, 60); self.short_pause_interval.setSuffix(tr(' мин'))
+        self.short_pause_duration = QSpinBox(); self.short_pause_duration.setRange(5, 60); self.short_pause_duration.setSuffix(tr(' сек'))
         short_pause_layout.addWidget(self.short_pause_checkbox, 0, 0, 1, 3)
-        short_pause_layout.addWidget(QLabel('Каждые:'), 1, 0); short_pause_layout.addWidget(self.short_pause_interval, 1, 1)
-        short_pause_layout.addWidget(QLabel('Длительность:'), 2, 0); short_pause_layout.addWidget(self.short_pause_duration, 2, 1)
-        self.warning_checkbox = QCheckBox('Предупреждать о большом перерыве')
-        self.warning_time = QSpinBox(); self.warning_time.setRange(15, 90); self.warning_time.setSuffix(' сек')
+        short_pause_layout.addWidget(QLabel(tr('Каждые:')), 1, 0); short_pause_layout.addWidget(self.short_pause_interval, 1, 1)
+        short_pause_layout.addWidget(QLabel(tr('Длительность:')), 2, 0); short_pause_layout.addWidget(self.short_pause_duration, 2, 1)
+        self.warning_checkbox = QCheckBox(tr('Предупреждать о большом перерыве'))
+        self.warning_time = QSpinBox(); self.warning_time.setRange(15, 90); self.warning_time.setSuffix(tr(' сек'))
         warning_layout = QHBoxLayout(); warning_layout.addWidget(self.warning_checkbox); warning_layout.addWidget(self.warning_time); warning_layout.addStretch()
-        self.strict_mode_checkbox = QCheckBox('Строгий режим')
-        self.sound_checkbox = QCheckBox('Звук окончания большого перерыва')
-        self.start_sound_checkbox = QCheckBox('Звук начала короткой паузы')
-        self.darken_checkbox = QCheckBox('Полноэкранный режим короткой паузы')
-        self.autostart_checkbox = QCheckBox('Автозапуск')
-        self.tracking_checkbox = QCheckBox('Отслеживать активность')
+        self.strict_mode_checkbox = QCheckBox(tr('Строгий режим'))
+        self.sound_checkbox = QCheckBox(tr('Звук окончания большого перерыва'))
+        self.start_sound_checkbox = QCheckBox(tr('Звук начала короткой паузы'))
+        self.darken_checkbox = QCheckBox(tr('Полноэкранный режим короткой паузы'))
+        self.autostart_checkbox = QCheckBox(tr('Автозапуск'))
+        self.tracking_checkbox = QCheckBox(tr('Отслеживать активность'))
+        self.screen_combo = QComboBox()
+        self.screen_combo.addItem(tr('Основной'), 'primary'); self.screen_combo.addItem(tr('Тот, где курсор'), 'cursor')
+        for screen in QApplication.screens(): self.screen_combo.addItem(f"{screen.name()} ({screen.size().width()}x{screen.size().height()})", screen.name())
+        screen_layout = QHBoxLayout(); screen_layout.addWidget(QLabel(tr('Экран для перерыва:'))); screen_layout.addWidget(self.screen_combo); screen_layout.addStretch()
+        self.language_combo = QComboBox()
+        self.language_combo.addItem(tr('Как в системе'), 'auto')
+        for code, name in LANGUAGES.items(): self.language_combo.addItem(name, code)
+        self.language_hint = QLabel(tr('Вступит в силу после перезапуска')); self.language_hint.setStyleSheet("color: #757575;"); self.language_hint.hide()
+        self.language_combo.currentIndexChanged.connect(self.update_language_hint)
+        language_layout = QHBoxLayout(); language_layout.addWidget(QLabel(tr('Язык:'))); language_layout.addWidget(self.language_combo)
+        language_layout.addWidget(self.language_hint); language_layout.addStretch()
         self.set_tooltips()
         test_layout = QHBoxLayout()
-        test_big_button = QPushButton('Попробовать большой перерыв'); test_short_button = QPushButton('Попробовать короткую паузу')
+        test_big_button = QPushButton(tr('Попробовать большой перерыв')); test_short_button = QPushButton(tr('Попробовать короткую паузу'))
         test_big_button.clicked.connect(self.test_big_break); test_short_button.clicked.connect(self.test_short_pause)
         test_layout.addWidget(test_big_button); test_layout.addWidget(test_short_button)
         layout.addWidget(big_break_group); layout.addWidget(short_pause_group); layout.addLayout(warning_layout)
         layout.addWidget(self.strict_mode_checkbox); layout.addWidget(self.sound_checkbox); layout.addWidget(self.start_sound_checkbox)
         layout.addWidget(self.darken_checkbox); layout.addWidget(self.autostart_checkbox); layout.addWidget(self.tracking_checkbox)
+        layout.addLayout(screen_layout); layout.addLayout(language_layout)
         layout.addLayout(test_layout); layout.addStretch()
-        self.tab_widget.addTab(settings_widget, 'Настройки')
+        self.tab_widget.addTab(settings_widget, tr('Настройки'))
         
     def create_practices_tab(self):
         practices_widget = QWidget()
         layout = QVBoxLayout(practices_widget)
-        add_group = QGroupBox("Новая практика")
+        add_group = QGroupBox(tr("Новая практика"))
         add_layout = QVBoxLayout(add_group)
-        self.practice_text = QTextEdit(); self.practice_text.setPlaceholderText('Введите текст новой практики здесь...'); self.practice_text.setMaximumHeight(80)
-        self.add_micropractice_checkbox = QCheckBox('Микропрактика (для коротких пауз)')
-        add_button = QPushButton('Добавить'); add_button.setStyleSheet("background-color: #4CAF50; color: white; padding: 6px; border-radius: 4px;"); add_button.clicked.connect(self.add_practice)
+        self.practice_text = QTextEdit(); self.practice_text.setPlaceholderText(tr('Введите текст новой практики здесь...')); self.practice_text.setMaximumHeight(80)
+        self.add_micropractice_checkbox = QCheckBox(tr('Микропрактика (для коротких пауз)'))
+        add_button = QPushButton(tr('Добавить')); add_button.setStyleSheet("background-color: #4CAF50; color: white; padding: 6px; border-radius: 4px;"); add_button.clicked.connect(self.add_practice)
         add_layout.addWidget(self.practice_text); add_layout.addWidget(self.add_micropractice_checkbox); add_layout.addWidget(add_button)
-        list_group = QGroupBox("Существующие практики")
+        list_group = QGroupBox(tr("Существующие практики"))
         list_layout = QVBoxLayout(list_group)
-        scroll_area = QScrollArea(); scroll_area.setWidgetResizable(True)
-        self.scroll_content = QWidget()
-        self.practices_layout = QVBoxLayout(self.scroll_content); self.practices_layout.setSpacing(5); self.practices_layout.setAlignment(Qt.AlignTop)
-        scroll_area.setWidget(self.scroll_content)
-        delete_button = QPushButton("Удалить выбранные"); delete_button.setStyleSheet("background-color: #f44336; color: white; padding: 6px; border-radius: 4px;"); delete_button.clicked.connect(self.delete_selected_practices)
-        list_layout.addWidget(scroll_area); list_layout.addWidget(delete_button)
+        self.filter_edit = QLineEdit(); self.filter_edit.setPlaceholderText(tr('Поиск по практикам...')); self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.filter_practices)
+        list_layout.addWidget(self.filter_edit)
+        self.practices_view = self._create_practice_view(self.practice_model)
+        self.micropractices_view = self._create_practice_view(self.micropractice_model)
+        delete_button = QPushButton(tr("Удалить выбранные")); delete_button.setStyleSheet("background-color: #f44336; color: white; padding: 6px; border-radius: 4px;"); delete_button.clicked.connect(self.delete_selected_practices)
+        list_layout.addWidget(QLabel(tr("<b>Практики для больших перерывов:</b>"))); list_layout.addWidget(self.practices_view)
+        list_layout.addWidget(QLabel(tr("<b>Микропрактики для коротких пауз:</b>"))); list_layout.addWidget(self.micropractices_view)
+        import_button = QPushButton(tr("Импорт...")); import_button.clicked.connect(self.import_practices)
+        export_button = QPushButton(tr("Экспорт...")); export_button.clicked.connect(self.export_practices)
+        import_button.setToolTip(tr('Загрузить практики из файла .txt, .csv, .json или .xml.\nЕсли отмечено «Микропрактика», файл попадет в микропрактики.'))
+        export_button.setToolTip(tr('Сохранить практики в файл .txt, .csv, .json или .xml.\nЕсли отмечено «Микропрактика», сохраняются микропрактики.'))
+        buttons_layout = QHBoxLayout(); buttons_layout.addWidget(delete_button); buttons_layout.addWidget(import_button); buttons_layout.addWidget(export_button)
+        list_layout.addLayout(buttons_layout)
         layout.addWidget(add_group); layout.addWidget(list_group)
-        # self.update_practices_list() # <-- Удаляем вызов отсюда, он теперь в showEvent
-        self.tab_widget.addTab(practices_widget, 'Практики')
+        self.tab_widget.addTab(practices_widget, tr('Практики'))
+
+    def _create_practice_view(self, model):
+        # Строки одинаковой высоты: представление создает только видимые и не измеряет каждую
+        view = QListView(); view.setModel(model)
+        view.setUniformItemSizes(True); view.setTextElideMode(Qt.ElideRight); view.setWordWrap(False)
+        view.setSelectionMode(QListView.NoSelection)
+        return view
 
     def create_info_tab(self):
         info_widget = QWidget()
         layout = QVBoxLayout(info_widget)
         info_text = QTextBrowser(); info_text.setReadOnly(True); info_text.setOpenExternalLinks(True)
-        info_text.setHtml("""
-            <h1>MindfulPause</h1><p><b>Версия:</b> 1.1</p>
-            <p>Приложение для регулярных перерывов и практик осознанности.<br>
-            Делайте перерывы, снижайте стресс, повышайте концентрацию!</p><br>
-            <p><b>Сайт проекта:</b> <a href="https://www.danzasemantica.ru/MindfulPause/">Danzasemantica.ru</a></p>
-            <p><b>Обратная связь (Telegram):</b> <a href="https://t.me/danzasemantica/1077">Обсуждение проекта</a></p>
-            <p><b>Поддержать проект:</b></p>
-            <ul><li>Для РФ: <a href="https://pay.cloudtips.ru/p/012f0b15">CloudTips</a></li><li>Для остального мира: <a href="https://t.me/danzasemantica/570">Telegram</a></li></ul>
+        info_text.setHtml(f"""
+            <h1>MindfulPause</h1><p><b>{tr('Версия:')}</b> 1.1</p>
+            <p>{tr('Приложение для регулярных перерывов и практик осознанности.')}<br>
+            {tr('Делайте перерывы, снижайте стресс, повышайте концентрацию!')}</p><br>
+            <p><b>{tr('Сайт проекта:')}</b> <a href="https://www.danzasemantica.ru/MindfulPause/">Danzasemantica.ru</a></p>
+            <p><b>{tr('Обратная связь (Telegram):')}</b> <a href="https://t.me/danzasemantica/1077">{tr('Обсуждение проекта')}</a></p>
+            <p><b>{tr('Поддержать проект:')}</b></p>
+            <ul><li>{tr('Для РФ:')} <a href="https://pay.cloudtips.ru/p/012f0b15">CloudTips</a></li><li>{tr('Для остального мира:')} <a href="https://t.me/danzasemantica/570">Telegram</a></li></ul>
         """)
         layout.addWidget(info_text)
-        self.tab_widget.addTab(info_widget, 'Информация')
+        self.history = getattr(self.app, 'break_history', None)
+        if self.history is not None:
+            stats_group = QGroupBox(tr('Большие перерывы за две недели'))
+            stats_layout = QVBoxLayout(stats_group)
+            self.history_summary = QLabel(); self.history_summary.setWordWrap(True)
+            self.history_chart = ComplianceChart()
+            stats_layout.addWidget(self.history_summary); stats_layout.addWidget(self.history_chart)
+            layout.addWidget(stats_group)
+        self.tab_widget.addTab(info_widget, tr('Информация'))
+
+    def update_history(self):
+        """График и сводка по готовым дневным и недельным итогам истории перерывов."""
+        if self.history is None: return
+        today, week = self.history.today(), self.history.weekly(1)[0][1]
+        share = self.history.compliance(week)
+        self.history_summary.setText(
+            tr("Сегодня: {completed} из {total}.", completed=today['completed'], total=today['completed'] + today['skipped']) + ' ' +
+            tr("За неделю: доведено до конца {share}, отложено {postponed} раз, отдых {minutes:.0f} мин.",
+               share='—' if share is None else f'{share:.0%}', postponed=week['postponed'], minutes=week['rest_seconds'] / 60))
+        self.history_chart.set_days(self.history.daily(14))
         
     def set_tooltips(self):
-        self.strict_mode_checkbox.setToolTip('В строгом режиме большой перерыв нельзя прервать или свернуть.\nВ обычном режиме его можно завершить: сначала кликните по окну, затем нажмите Esc.')
-        self.warning_checkbox.setToolTip('Показывает небольшое окно с обратным отсчетом\nза указанное время до начала большого перерыва.')
-        self.sound_checkbox.setToolTip('Проигрывает звуковой сигнал по завершении большого перерыва.')
-        self.start_sound_checkbox.setToolTip('Проигрывает звуковой сигнал в момент начала короткой паузы.')
-        self.darken_checkbox.setToolTip('Короткая пауза будет отображаться на весь экран с темным фоном.\nЕсли опция выключена, пауза появится в небольшом окне по центру экрана.')
-        self.autostart_checkbox.setToolTip('Приложение будет автоматически запускаться вместе с Windows.')
-        self.tracking_checkbox.setToolTip('Приостанавливает таймер большого перерыва, если вы не пользуетесь компьютером,\nи возобновляет его, когда вы возвращаетесь.')
+        self.strict_mode_checkbox.setToolTip(tr('В строгом режиме большой перерыв нельзя прервать или свернуть.\nВ обычном режиме его можно завершить: сначала кликните по окну, затем нажмите Esc.'))
+        self.warning_checkbox.setToolTip(tr('Показывает небольшое окно с обратным отсчетом\nза указанное время до начала большого перерыва.'))
+        self.sound_checkbox.setToolTip(tr('Проигрывает звуковой сигнал по завершении большого перерыва.'))
+        self.start_sound_checkbox.setToolTip(tr('Проигрывает звуковой сигнал в момент начала короткой паузы.'))
+        self.darken_checkbox.setToolTip(tr('Короткая пауза будет отображаться на весь экран с темным фоном.\nЕсли опция выключена, пауза появится в небольшом окне по центру экрана.'))
+        self.autostart_checkbox.setToolTip(tr('Приложение будет автоматически запускаться вместе с Windows.'))
+        self.screen_combo.setToolTip(tr('На этом экране показывается практика, остальные экраны затемняются.'))
+        self.language_combo.setToolTip(tr('Язык окон и меню, а также файлов практик (practice_<язык>.xml).\nЕсли файла на этом языке нет, используются английские или русские практики.'))
+        self.tracking_checkbox.setToolTip(tr('Приостанавливает таймер большого перерыва, если вы не пользуетесь компьютером,\nи возобновляет его, когда вы возвращаетесь.'))
         
     def load_settings(self):
         self.big_break_checkbox.setChecked(self.settings.get('big_break_enabled', True))
@@ -149,6 +202,10 @@ class SettingsWindow(QMainWindow):
         self.darken_checkbox.setChecked(self.settings.get('darken_short_pause', False))
         self.autostart_checkbox.setChecked(self.settings.get('autostart', False))
         self.tracking_checkbox.setChecked(self.settings.get('track_activity', True))
+        pause_screen = self.settings.get('pause_screen', 'primary') or 'primary'
+        if self.screen_combo.findData(pause_screen) < 0: self.screen_combo.addItem(tr("{screen} (не подключен)", screen=pause_screen), pause_screen)
+        self.screen_combo.setCurrentIndex(self.screen_combo.findData(pause_screen))
+        self.language_combo.setCurrentIndex(max(0, self.language_combo.findData(self.settings.get('language', SOURCE_LANGUAGE))))
         
     def apply_ui_to_settings(self):
         self.settings['big_break_enabled'] = self.big_break_checkbox.isChecked(); self.settings['big_break_interval'] = self.big_break_interval.value()
@@ -158,6 +215,11 @@ class SettingsWindow(QMainWindow):
         self.settings['strict_mode'] = self.strict_mode_checkbox.isChecked(); self.settings['sound_enabled'] = self.sound_checkbox.isChecked()
         self.settings['sound_start_enabled'] = self.start_sound_checkbox.isChecked(); self.settings['darken_short_pause'] = self.darken_checkbox.isChecked()
         self.settings['autostart'] = self.autostart_checkbox.isChecked(); self.settings['track_activity'] = self.tracking_checkbox.isChecked()
+        self.settings['pause_screen'] = self.screen_combo.currentData(); self.settings['language'] = self.language_combo.currentData()
+
+    def update_language_hint(self):
+        # Язык выбирается при запуске: подсказка видна, только если выбор его изменит
+        self.language_hint.setVisible(resolve_language(self.language_combo.currentData()) != self.xml_manager.language)
         
     def save_settings(self): self.apply_ui_to_settings(); self.xml_manager.save_settings(self.settings)
     def save_and_close(self): self.save_settings(); self.settings_saved.emit(); self.close()
@@ -165,45 +227,56 @@ class SettingsWindow(QMainWindow):
     def add_practice(self):
         text = self.practice_text.toPlainText().strip()
         if text:
-            if self.add_micropractice_checkbox.isChecked(): self.xml_manager.add_micropractice(text)
-            else: self.xml_manager.add_practice(text)
-            self.practice_text.clear(); self.update_practices_list()
+            if self.add_micropractice_checkbox.isChecked():
+                if self.xml_manager.add_micropractice(text): self.micropractice_model.insert_ids([practice_id(text)])
+            else:
+                if self.xml_manager.add_practice(text): self.practice_model.insert_ids([practice_id(text)])
+            self.practice_text.clear()
             
     def update_practices_list(self):
-        # Очищаем старый список виджетов
-        for i in reversed(range(self.practices_layout.count())): 
-            widget = self.practices_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
+        # Модели перечитываются целиком, только если файлы изменились на диске
+        self.practice_model.sync(); self.micropractice_model.sync()
 
-        self.practice_checkboxes.clear(); self.micropractice_checkboxes.clear()
-        
-        self.practices_layout.addWidget(QLabel("<b>Практики для больших перерывов:</b>"))
-        practices = self.xml_manager.get_all_practices()
-        if practices:
-            for p_text in practices: 
-                cb = QCheckBox(p_text)
-                self.practice_checkboxes.append(cb)
-                self.practices_layout.addWidget(cb)
-        else: 
-            self.practices_layout.addWidget(QLabel("<i>(пусто)</i>"))
-            
-        self.practices_layout.addWidget(QLabel("<br><b>Микропрактики для коротких пауз:</b>"))
-        micropractices = self.xml_manager.get_all_micropractices()
-        if micropractices:
-            for p_text in micropractices: 
-                cb = QCheckBox(p_text)
-                self.micropractice_checkboxes.append(cb)
-                self.practices_layout.addWidget(cb)
-        else: 
-            self.practices_layout.addWidget(QLabel("<i>(пусто)</i>"))
+    def filter_practices(self, query):
+        self.practice_model.set_filter_text(query); self.micropractice_model.set_filter_text(query)
 
     def delete_selected_practices(self):
-        p_del = [cb.text() for cb in self.practice_checkboxes if cb.isChecked()]
-        m_del = [cb.text() for cb in self.micropractice_checkboxes if cb.isChecked()]
-        if p_del: self.xml_manager.delete_practices(p_del)
-        if m_del: self.xml_manager.delete_micropractices(m_del)
-        self.update_practices_list()
+        for model, micro in ((self.practice_model, False), (self.micropractice_model, True)):
+            # id берутся до удаления: после него хранилище их уже не знает и checked_ids() пуст
+            ids = model.checked_ids()
+            if ids: self.xml_manager.delete_practices_by_ids(ids, micro); model.remove_ids(ids)
+
+    def practice_file_filter(self): return tr("Практики ({patterns})", patterns="*.txt *.csv *.json *.xml")
+
+    def import_practices(self):
+        path, _ = QFileDialog.getOpenFileName(self, tr("Импорт практик"), "", self.practice_file_filter())
+        if not path: return
+        micro = self.add_micropractice_checkbox.isChecked()
+        progress_dialog = QProgressDialog(tr("Импорт практик..."), tr("Остановить"), 0, 100, self)
+        progress_dialog.setWindowModality(Qt.WindowModal); progress_dialog.setMinimumDuration(300)
+        def on_progress(done, total):
+            progress_dialog.setMaximum(total); progress_dialog.setValue(done)
+            QApplication.processEvents()
+            return not progress_dialog.wasCanceled()
+        try:
+            added, skipped, cancelled = self.xml_manager.import_practices(path, micro, on_progress)
+        except (OSError, ValueError, SyntaxError) as e:  # SyntaxError — ошибки разбора XML
+            QMessageBox.warning(self, tr("Импорт практик"), tr("Не удалось прочитать файл:\n{error}", error=e)); return
+        finally:
+            progress_dialog.close()
+        (self.micropractice_model if micro else self.practice_model).insert_ids(added)
+        summary = tr("Добавлено: {added}. Пропущено повторов: {skipped}.", added=len(added), skipped=skipped)
+        if cancelled: summary += ' ' + tr("Импорт остановлен, не обработано: {count}.", count=cancelled)
+        QMessageBox.information(self, tr("Импорт практик"), summary)
+
+    def export_practices(self):
+        path, _ = QFileDialog.getSaveFileName(self, tr("Экспорт практик"), "practices.txt", self.practice_file_filter())
+        if not path: return
+        try:
+            count = self.xml_manager.export_practices(path, self.add_micropractice_checkbox.isChecked())
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, tr("Экспорт практик"), tr("Не удалось сохранить файл:\n{error}", error=e)); return
+        QMessageBox.information(self, tr("Экспорт практик"), tr("Сохранено практик: {count}.", count=count))
 
     def run_test(self, test_function):
         if self.app and hasattr(self.app, test_function.__name__):
@@ -7,6 +7,7 @@ import os
 from PySide6.QtWidgets import QMenu, QSystemTrayIcon, QStyle # <--- ИСПРАВЛЕНИЕ: Добавлен импорт QStyle
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtCore import QObject
+from utils.i18n import tr
 
 class TrayManager(QObject):
     """Менеджер системного трея"""
@@ -40,29 +41,29 @@ class TrayManager(QObject):
         """Создание контекстного меню"""
         self.menu = QMenu()
         
-        settings_action = QAction("Открыть настройки", self.menu)
+        settings_action = QAction(tr("Открыть настройки"), self.menu)
         settings_action.triggered.connect(self.app.show_settings)
         self.menu.addAction(settings_action)
         
-        disable_menu = QMenu("Отключить на время", self.menu)
-        disable_1h = QAction("На 1 час", disable_menu)
+        disable_menu = QMenu(tr("Отключить на время"), self.menu)
+        disable_1h = QAction(tr("На 1 час"), disable_menu)
         disable_1h.triggered.connect(lambda: self.app.disable_temporarily(1))
         disable_menu.addAction(disable_1h)
-        disable_2h = QAction("На 2 часа", disable_menu)
+        disable_2h = QAction(tr("На 2 часа"), disable_menu)
         disable_2h.triggered.connect(lambda: self.app.disable_temporarily(2))
         disable_menu.addAction(disable_2h)
-        disable_3h = QAction("На 3 часа", disable_menu)
+        disable_3h = QAction(tr("На 3 часа"), disable_menu)
         disable_3h.triggered.connect(lambda: self.app.disable_temporarily(3))
         disable_menu.addAction(disable_3h)
         self.menu.addMenu(disable_menu)
         
-        break_now_action = QAction("Сделать большой перерыв сейчас", self.menu)
+        break_now_action = QAction(tr("Сделать большой перерыв сейчас"), self.menu)
         break_now_action.triggered.connect(self.app.start_big_break)
         self.menu.addAction(break_now_action)
         
         self.menu.addSeparator()
         
-        quit_action = QAction("Выход", self.menu)
+        quit_action = QAction(tr("Выход"), self.menu)
         quit_action.triggered.connect(self.app.quit_app)
         self.menu.addAction(quit_action)
         
@@ -81,7 +82,7 @@ class TrayManager(QObject):
         self.tray_icon.hide()
         
     def update_status_disabled(self, hours):
-        self.tray_icon.setToolTip(f"MindfulPause - Отключено на {hours} час(а)")
+        self.tray_icon.setToolTip(tr("MindfulPause - Отключено на {hours} час(а)", hours=hours))
         
     def update_status_enabled(self):
         self.tray_icon.setToolTip("MindfulPause")
\ No newline at end of file
@@ -0,0 +1,51 @@
+# tests/test_activity_tracker.py
+
+from PySide6.QtCore import QCoreApplication
+from utils.activity_tracker import ActivityTracker
+from utils.idle_sources import FakeIdleSource
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+def make_tracker(source, timeout_minutes=1):
+    tracker = ActivityTracker(timeout_minutes, idle_source=source)
+    events = []
+    tracker.user_inactive.connect(lambda: events.append('inactive'))
+    tracker.user_active.connect(lambda: events.append('active'))
+    return tracker, events
+
+def test_polling_reports_inactivity_and_return():
+    source = FakeIdleSource([10, 70, 5])
+    tracker, events = make_tracker(source)
+    tracker.check_activity()
+    assert events == []
+    # Раньше чем через 50 с простоя пользователь неактивным стать не может
+    assert tracker.check_timer.interval() == 51000
+    tracker.check_activity()
+    assert events == ['inactive'] and tracker.check_timer.interval() == ActivityTracker.RETURN_POLL_MS
+    tracker.check_activity()
+    assert events == ['inactive', 'active'] and source.polls == 3
+    tracker.stop()
+
+def test_poll_interval_is_clamped():
+    tracker, _ = make_tracker(FakeIdleSource([0]), timeout_minutes=60)
+    assert tracker.next_poll_interval_ms(0) == ActivityTracker.MAX_POLL_MS
+    assert tracker.next_poll_interval_ms(3600) == ActivityTracker.MIN_POLL_MS
+
+def test_events_replace_polling_while_active():
+    source = FakeIdleSource(supports_events=True)
+    tracker, events = make_tracker(source)
+    tracker.start()
+    tracker.check_activity()
+    assert not tracker.check_timer.isActive()
+    source.emit_idle(120)
+    assert events == ['inactive'] and not tracker.check_timer.isActive()
+    source.emit_active()
+    assert events == ['inactive', 'active'] and not tracker.check_timer.isActive()
+    tracker.stop()
+
+def test_disabled_tracker_does_not_poll():
+    source = FakeIdleSource([120])
+    tracker, events = make_tracker(source)
+    tracker.set_enabled(False)
+    tracker.check_activity()
+    assert events == [] and source.polls == 0
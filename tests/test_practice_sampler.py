@@ -0,0 +1,75 @@
+# tests/test_practice_sampler.py
+
+import random
+from utils.practice_sampler import PracticeSampler
+
+def draw_round(sampler):
+    """Все выдачи до конца текущего круга (круг закончился, когда сменился seed)."""
+    seed, drawn = sampler.bag.seed, []
+    while True:
+        pid = sampler.draw()
+        if sampler.bag.seed != seed: return drawn, pid
+        drawn.append(pid)
+
+def test_every_id_once_per_round():
+    ids = list(range(100))
+    sampler = PracticeSampler(ids, rng=random.Random(1))
+    first = [sampler.draw() for _ in ids]
+    assert sorted(first) == ids
+    for _ in range(5):
+        drawn = [sampler.draw() for _ in ids]
+        assert sorted(drawn) == ids
+
+def test_new_round_does_not_start_with_last():
+    for seed in range(200):
+        sampler = PracticeSampler([1, 2, 3], rng=random.Random(seed))
+        previous = None
+        for _ in range(20):
+            drawn = [sampler.draw() for _ in range(3)]
+            assert drawn[0] != previous
+            previous = drawn[-1]
+
+def test_restore_with_library_changes_keeps_round():
+    for seed in range(50):
+        rng = random.Random(seed)
+        ids = list(range(40))
+        before = PracticeSampler(ids, rng=random.Random(seed))
+        drawn = [before.draw() for _ in range(rng.randrange(1, 39))]
+        state = before.state()
+
+        removed = set(rng.sample(ids, 8))
+        added = list(range(1000, 1010))
+        current = [pid for pid in ids if pid not in removed] + added
+        after = PracticeSampler(current, rng=random.Random(seed + 1))
+        after.restore(state)
+        assert after.bag.last == (drawn[-1] if drawn[-1] not in removed else None)
+
+        rest, next_round_first = draw_round(after)
+        assert len(rest) == len(set(rest))
+        assert not set(rest) & (set(drawn) | removed)
+        # Все старые практики, не выданные до сохранения и не удаленные, приходят в этом же круге
+        assert set(ids) - set(drawn) - removed <= set(rest)
+        assert set(rest) <= set(current)
+        if rest: assert next_round_first != rest[-1]
+
+        # Следующий круг — снова каждая практика ровно по разу
+        next_round = [next_round_first] + [after.draw() for _ in range(len(current) - 1)]
+        assert sorted(next_round) == sorted(current)
+
+def test_add_and_remove_during_round():
+    for seed in range(50):
+        rng = random.Random(seed)
+        sampler = PracticeSampler(range(30), rng=random.Random(seed))
+        drawn = [sampler.draw() for _ in range(rng.randrange(1, 29))]
+        removed = set(rng.sample(range(30), 5))
+        for pid in removed: sampler.remove(pid)
+        for pid in range(100, 105): sampler.add(pid)
+        rest, _ = draw_round(sampler)
+        assert len(rest) == len(set(rest)) and not set(rest) & (set(drawn) | removed)
+        assert set(range(30)) - set(drawn) - removed <= set(rest)
+
+def test_restore_ignores_old_state_format():
+    sampler = PracticeSampler([1, 2, 3], rng=random.Random(0))
+    seed = sampler.bag.seed
+    sampler.restore({'queue': [3, 2], 'last': 1})
+    assert sampler.bag.seed == seed and sampler.bag.cursor == -1
@@ -1,33 +1,73 @@
 # utils/activity_tracker.py
 
 from PySide6.QtCore import QObject, QTimer, Signal
-from utils.system_utils import get_idle_time_windows
+from utils.idle_sources import create_idle_source
+from utils.metrics import metrics
 
 class ActivityTracker(QObject):
+    """Следит за простоем пользователя через подключаемый IdleSource.
+
+    Опрос адаптивный: пока до таймаута далеко, следующая проверка назначается
+    ровно на момент, когда простой мог бы его достичь; пока пользователь отсутствует,
+    возвращение проверяется часто. Если источник умеет присылать события,
+    трекер подписывается на них и в активном состоянии не опрашивает вовсе.
+    """
     user_inactive = Signal(); user_active = Signal()
+    MIN_POLL_MS = 1000; RETURN_POLL_MS = 2000; MAX_POLL_MS = 5 * 60 * 1000
 
-    def __init__(self, timeout_minutes=30, is_enabled=True):
+    def __init__(self, timeout_minutes=30, is_enabled=True, idle_source=None):
         super().__init__()
         self.timeout_seconds = timeout_minutes * 60
         self.is_enabled = is_enabled
         self.is_inactive_state = False
+        self.idle_source = idle_source or create_idle_source()
+        self.use_events = self.idle_source.supports_events
         self.check_timer = QTimer(self)
+        self.check_timer.setSingleShot(True)
         self.check_timer.timeout.connect(self.check_activity)
+        if self.use_events:
+            self.idle_source.idle_started.connect(self.check_activity)
+            self.idle_source.activity_resumed.connect(self.on_activity_resumed)
 
     def check_activity(self):
         if not self.is_enabled: return
-        idle_time = get_idle_time_windows()
+        with metrics.timer('idle_poll', source=type(self.idle_source).__name__):
+            idle_time = self.idle_source.idle_seconds()
         if idle_time > self.timeout_seconds:
             if not self.is_inactive_state: self.is_inactive_state = True; self.user_inactive.emit()
         else:
             if self.is_inactive_state: self.is_inactive_state = False; self.user_active.emit()
+        self.schedule_next_check(idle_time)
+
+    def next_poll_interval_ms(self, idle_time):
+        """Интервал до следующей проверки или None, если ждать нужно только события."""
+        if self.is_inactive_state: return None if self.use_events else self.RETURN_POLL_MS
+        if self.use_events and idle_time <= 0: return None
+        # Раньше, чем через (таймаут - простой), пользователь неактивным стать не может
+        remaining_ms = (self.timeout_seconds - idle_time) * 1000 + self.MIN_POLL_MS
+        return int(min(max(remaining_ms, self.MIN_POLL_MS), self.MAX_POLL_MS))
+
+    def schedule_next_check(self, idle_time):
+        interval = self.next_poll_interval_ms(idle_time)
+        if interval is None: self.check_timer.stop()
+        else: self.check_timer.start(interval)
+
+    def on_activity_resumed(self):
+        if not self.is_enabled: return
+        self.check_timer.stop()
+        if self.is_inactive_state: self.is_inactive_state = False; self.user_active.emit()
 
     def start(self):
         if not self.is_enabled: return
-        self.is_inactive_state = False; self.check_timer.start(5000)
+        self.is_inactive_state = False
+        if self.use_events: self.idle_source.start_events()
+        self.check_timer.start(self.MIN_POLL_MS)
+
+    def stop(self):
+        self.check_timer.stop()
+        if self.use_events: self.idle_source.stop_events()
 
-    def stop(self): self.check_timer.stop()
     def set_enabled(self, enabled):
         self.is_enabled = enabled
         if not enabled: self.stop()
-        else: self.start()
\ No newline at end of file
+        else: self.start()
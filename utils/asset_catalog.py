@@ -0,0 +1,89 @@
+# utils/asset_catalog.py
+
+import os
+import random
+import logging
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+def list_images(images_dir):
+    """Картинки для пауз в каталоге (без иконок приложения)."""
+    try: names = os.listdir(images_dir)
+    except OSError: return []
+    return [os.path.join(images_dir, name) for name in sorted(names)
+            if name.lower().endswith(IMAGE_EXTENSIONS) and 'app.ico' not in name.lower()]
+
+class AssetCatalog(QObject):
+    """Каталог картинок и файлов практик, который не ходит на диск при каждой паузе.
+
+    Каталог картинок сканируется один раз, дальше его и файлы практик отслеживает
+    QFileSystemWatcher: уведомления собираются за DEBOUNCE_MS и затем одной проверкой
+    mtime пересканируют каталог и перечитывают изменившиеся хранилища практик. Пока
+    хранилище под наблюдением (PracticeStore.watched), обращения к нему не делают stat.
+    Если уведомления недоступны (лимит inotify, некоторые сетевые папки), те же
+    дешевые проверки выполняются по таймеру раз в FALLBACK_POLL_SEC, а при работающих
+    уведомлениях — для страховки раз в POLL_INTERVAL_SEC.
+    """
+    images_changed = Signal()
+    practices_changed = Signal(object)  # PracticeStore, перечитанный с диска
+
+    DEBOUNCE_MS = 300
+    POLL_INTERVAL_SEC = 300
+    FALLBACK_POLL_SEC = 15
+
+    def __init__(self, images_dir, stores=(), parent=None):
+        super().__init__(parent)
+        self.images_dir = images_dir
+        self.stores = list(stores)
+        self._images = []
+        self._images_signature = None
+        self.watching = False
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._schedule_sync)
+        self.watcher.fileChanged.connect(self._schedule_sync)
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(self.DEBOUNCE_MS)
+        self._sync_timer.timeout.connect(self.sync)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self.sync)
+        for store in self.stores: store.watched = True
+        self.sync()
+
+    def images(self): return list(self._images)
+
+    def random_image(self): return random.choice(self._images) if self._images else None
+
+    def _watch(self):
+        """Ставит наблюдение на каталог и файлы; при неудаче переходит на опрос по таймеру."""
+        watched = set(self.watcher.files() + self.watcher.directories())
+        paths = [path for path in [self.images_dir] + [store.file_path for store in self.stores] if path not in watched]
+        # Несуществующий путь наблюдать нельзя: его появление заметит только опрос
+        failed = [path for path in paths if not os.path.exists(path)]
+        existing = [path for path in paths if path not in failed]
+        if existing: failed += self.watcher.addPaths(existing)
+        watching = not failed
+        if watching != self.watching or not self._poll_timer.isActive():
+            if not watching: logging.info(f"Нет уведомлений об изменениях {failed}, каталог проверяется по таймеру.")
+            self.watching = watching
+            self._poll_timer.start((self.POLL_INTERVAL_SEC if watching else self.FALLBACK_POLL_SEC) * 1000)
+
+    def _schedule_sync(self, _path=None): self._sync_timer.start()
+
+    def sync(self):
+        """Сверяет каталог картинок и файлы практик с диском по mtime."""
+        try: signature = os.stat(self.images_dir).st_mtime_ns
+        except OSError: signature = None
+        if signature != self._images_signature:
+            self._images_signature = signature
+            images = list_images(self.images_dir)
+            if images != self._images:
+                self._images = images
+                self.images_changed.emit()
+        for store in self.stores:
+            generation = store.generation
+            store.refresh(force=True)
+            if store.generation != generation: self.practices_changed.emit(store)
+        # Замена файла через переименование снимает с него наблюдение — ставим заново
+        self._watch()
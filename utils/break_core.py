@@ -0,0 +1,326 @@
+# utils/break_core.py
+
+import time
+import logging
+from utils.deadline_queue import DeadlineQueue
+
+class BreakCore:
+    """Логика перерывов без Qt: расписание, предупреждение, паузы, простой и отключение.
+
+    Время берется из подставляемых часов clock (по умолчанию time.monotonic), сроки
+    хранятся в DeadlineQueue. Ядро ничего не показывает само, а сообщает подписчикам
+    намерения (intent): «показать предупреждение», «начать большой перерыв» и т.п.
+    GUI исполняет их окнами и звуками, а события пользователя передает обратно командами.
+    Кто-то снаружи должен вызывать advance(), когда наступает next_deadline(): в
+    приложении это QTimer в TimerManager, без GUI — run_until(). Если задан journal,
+    при каждом изменении расписания в него пишется snapshot(), а restore() поднимает
+    сохраненное состояние после перезапуска.
+    """
+    # Имена сроков
+    BIG_BREAK, WARNING, SHORT_PAUSE, DISABLE, PAUSE_END = 'big_break', 'warning', 'short_pause', 'disable_end', 'pause_end'
+    # Режимы
+    MODE_WORK, MODE_WARNING, MODE_SHORT_PAUSE, MODE_BIG_BREAK = 'work', 'warning', 'short_pause', 'big_break'
+    # Намерения для подписчиков
+    SHOW_WARNING = 'show_warning'            # seconds
+    CLOSE_WARNING = 'close_warning'
+    START_SHORT_PAUSE = 'start_short_pause'  # duration, darken
+    START_BIG_BREAK = 'start_big_break'      # duration, strict
+    FINISH_PAUSE = 'finish_pause'            # пауза завершена ядром, окно нужно закрыть
+    PLAY_SOUND = 'play_sound'                # cue: 'start' | 'end'
+    SCHEDULE_APPLIED = 'schedule_applied'    # таймеры перезапущены по настройкам
+    STATE_CHANGED = 'state_changed'          # изменились is_paused_by_user / is_temporarily_disabled
+    BREAK_EVENT = 'break_event'              # kind: 'big' | 'short', event: started | completed | skipped | postponed | forced, seconds
+
+    POSTPONE_MIN = 5
+    RESTORE_MIN_SEC = 60  # после перезапуска перерыв начинается не раньше чем через минуту
+
+    def __init__(self, settings=None, clock=time.monotonic, finish_pauses=False, wall_clock=time.time):
+        """finish_pauses — завершать паузы самому по истечении длительности (без GUI, где это делает окно)."""
+        self.settings = dict(settings or {})
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.queue = DeadlineQueue(clock)
+        self.finish_pauses = finish_pauses
+        self.listeners = []
+        self.on_schedule_changed = None  # вызывается, когда мог измениться ближайший срок
+        self.journal = None  # объект с record(state), см. StateJournal
+        self.mode = self.MODE_WORK
+        self.pause_strict = False
+        self.is_paused_by_user = False
+        self.is_temporarily_disabled = False
+        self.disabled_hours = None
+        self.is_user_inactive = False
+        self.last_big_break_at = None  # настенное время начала последнего большого перерыва
+        self._pause_started_at = None
+        self._handlers = {self.BIG_BREAK: self._on_big_break_due, self.WARNING: self.show_warning,
+                          self.SHORT_PAUSE: self.start_short_pause, self.DISABLE: self.enable,
+                          self.PAUSE_END: lambda: self.pause_finished(False)}
+
+    # --- Подписчики и сроки ---
+    def subscribe(self, listener):
+        """listener(intent, **payload) вызывается на каждое намерение."""
+        self.listeners.append(listener)
+
+    def _emit(self, intent, **payload):
+        for listener in list(self.listeners): listener(intent, **payload)
+
+    def _changed(self):
+        if self.on_schedule_changed is not None: self.on_schedule_changed()
+        if self.journal is not None: self.journal.record(self.snapshot())
+
+    def next_deadline(self): return self.queue.next_deadline()
+    def remaining(self, name): return self.queue.remaining(name)
+    def is_in_pause(self): return self.mode in (self.MODE_SHORT_PAUSE, self.MODE_BIG_BREAK)
+    def is_suspended(self): return self.is_paused_by_user or self.is_temporarily_disabled
+
+    def advance(self):
+        """Обрабатывает наступившие сроки по одному: обработчик может отменить или переставить остальные."""
+        name = self.queue.pop_next_due()
+        while name is not None:
+            self._handlers[name]()
+            name = self.queue.pop_next_due()
+        self._changed()
+
+    def run_until(self, end, sleep=time.sleep):
+        """Исполняет расписание до момента end (в единицах clock), засыпая между сроками через sleep.
+
+        С часами, у которых sleep просто сдвигает время, рабочий день проходит за миллисекунды.
+        """
+        while True:
+            deadline = self.queue.next_deadline()
+            target = end if deadline is None else min(deadline, end)
+            now = self.clock()
+            if target > now: sleep(target - now)
+            if deadline is None or deadline > end: return
+            self.advance()
+
+    # --- Расписание ---
+    def _work_timers(self): return (self.BIG_BREAK, self.WARNING, self.SHORT_PAUSE)
+
+    def _stop_work_timers(self):
+        for name in self._work_timers(): self.queue.cancel(name)
+
+    def _sync_warning(self):
+        """Ставит предупреждение за warning_time до большого перерыва, если оно включено и успевает."""
+        remaining = self.queue.remaining(self.BIG_BREAK) if self.queue.is_scheduled(self.BIG_BREAK) else None
+        lead = self.settings.get('warning_time', 30)
+        if self.settings.get('warning_enabled', True) and remaining is not None and remaining - lead > 0:
+            self.queue.schedule(self.WARNING, remaining - lead)
+        else:
+            self.queue.cancel(self.WARNING)
+
+    def _start_short_pause_timer(self):
+        if self.settings.get('short_pause_enabled', True):
+            self.queue.schedule(self.SHORT_PAUSE, self.settings.get('short_pause_interval', 20) * 60)
+
+    def apply_settings(self):
+        """Перезапускает отсчет всех перерывов по текущим настройкам."""
+        if self.is_suspended(): return
+        self._stop_work_timers()
+        if self.settings.get('big_break_enabled', True):
+            self.queue.schedule(self.BIG_BREAK, self.settings.get('big_break_interval', 60) * 60)
+            self._sync_warning()
+        self._start_short_pause_timer()
+        self._changed()
+        self._emit(self.SCHEDULE_APPLIED)
+        logging.info("Таймеры и настройки обновлены.")
+
+    def update_settings(self, settings):
+        self.settings = dict(settings)
+        if not self.is_in_pause(): self.apply_settings()
+
+    def _pause_work_timers(self):
+        for name in self._work_timers(): self.queue.pause(name)
+        self._changed()
+
+    def _resume_work_timers(self):
+        for name in self._work_timers(): self.queue.resume(name)
+        self._changed()
+
+    # --- Предупреждение и большой перерыв ---
+    def show_warning(self):
+        if self.mode != self.MODE_WORK or self.is_suspended(): return
+        self.mode = self.MODE_WARNING
+        self._emit(self.SHOW_WARNING, seconds=self.settings.get('warning_time', 30))
+
+    def _on_big_break_due(self):
+        self.queue.cancel(self.WARNING)
+        if self.mode == self.MODE_WORK and self.settings.get('warning_enabled', True):
+            # Интервал короче предупреждения: сначала предупреждаем, перерыв — по его окончании
+            self.show_warning()
+            self.queue.schedule(self.BIG_BREAK, self.settings.get('warning_time', 30))
+            return
+        self.start_big_break()
+
+    def postpone_big_break(self, minutes=POSTPONE_MIN):
+        if self.mode == self.MODE_WARNING:
+            self.mode = self.MODE_WORK
+            self._emit(self.CLOSE_WARNING)
+        if self.is_suspended() or self.is_in_pause(): return
+        self.queue.postpone(self.BIG_BREAK, minutes * 60)
+        self._sync_warning()
+        self._changed()
+        self._emit(self.BREAK_EVENT, kind='big', event='postponed', seconds=minutes * 60)
+        logging.info(f"Большой перерыв отложен на {minutes} минут.")
+
+    def start_big_break(self):
+        if self.is_in_pause(): return
+        if self.mode == self.MODE_WARNING: self._emit(self.CLOSE_WARNING)
+        self._stop_work_timers()
+        self._enter_pause(self.MODE_BIG_BREAK, self.settings.get('big_break_duration', 5) * 60)
+        self.pause_strict = self.settings.get('strict_mode', False)
+        self.last_big_break_at = self.wall_clock()
+        self._emit(self.START_BIG_BREAK, duration=self.settings.get('big_break_duration', 5) * 60, strict=self.pause_strict)
+        self._emit(self.BREAK_EVENT, kind='big', event='started', seconds=self.settings.get('big_break_duration', 5) * 60)
+
+    def break_now(self):
+        """Большой перерыв по требованию: идущая пауза закрывается."""
+        if self.mode == self.MODE_BIG_BREAK: return
+        if self.mode == self.MODE_SHORT_PAUSE:
+            self._emit(self.BREAK_EVENT, kind='short', event='skipped', seconds=self.clock() - self._pause_started_at)
+            self._leave_pause(); self._emit(self.FINISH_PAUSE)
+        self.start_big_break()
+
+    # --- Короткая пауза ---
+    def start_short_pause(self):
+        if self.is_in_pause() or self.is_suspended(): return
+        self._pause_work_timers()
+        duration = self.settings.get('short_pause_duration', 20)
+        self._enter_pause(self.MODE_SHORT_PAUSE, duration)
+        self.pause_strict = False
+        self._emit(self.START_SHORT_PAUSE, duration=duration, darken=self.settings.get('darken_short_pause', False))
+        self._emit(self.BREAK_EVENT, kind='short', event='started', seconds=duration)
+        # Звук — последним: окно и расписание не должны от него зависеть
+        if self.settings.get('sound_start_enabled', True): self._emit(self.PLAY_SOUND, cue='start')
+
+    def _enter_pause(self, mode, duration):
+        self.mode = mode
+        self._pause_started_at = self.clock()
+        if self.finish_pauses: self.queue.schedule(self.PAUSE_END, duration)
+        self._changed()
+
+    def _leave_pause(self):
+        self.queue.cancel(self.PAUSE_END)
+        self.mode = self.MODE_WORK
+
+    def pause_finished(self, manually_interrupted):
+        """Окно паузы закрылось (или истек срок PAUSE_END)."""
+        if not self.is_in_pause(): return
+        was_big_break = self.mode == self.MODE_BIG_BREAK
+        rested = self.clock() - self._pause_started_at
+        self._leave_pause()
+        if not manually_interrupted and self.finish_pauses: self._emit(self.FINISH_PAUSE)
+        kind = 'big' if was_big_break else 'short'
+        if was_big_break and self.pause_strict and manually_interrupted:
+            # Строгий режим не дает прервать перерыв: он начинается снова
+            self._emit(self.BREAK_EVENT, kind=kind, event='forced', seconds=rested)
+            self.start_big_break()
+            return
+        self._emit(self.BREAK_EVENT, kind=kind, event='skipped' if manually_interrupted else 'completed', seconds=rested)
+        if was_big_break:
+            self.apply_settings()
+            if not manually_interrupted and self.settings.get('sound_enabled', True): self._emit(self.PLAY_SOUND, cue='end')
+        elif not self.is_suspended():
+            # После короткой паузы большой перерыв продолжает отсчет, а не начинается заново
+            self._resume_work_timers()
+            self._start_short_pause_timer()
+            self._changed()
+
+    # --- Простой пользователя и сон ---
+    def user_inactive(self):
+        self.is_user_inactive = True
+        if self.is_suspended() or self.is_in_pause(): return
+        logging.info("Пользователь неактивен, таймеры на паузе.")
+        self._pause_work_timers()
+
+    def user_active(self):
+        self.is_user_inactive = False
+        if self.is_suspended() or self.is_in_pause(): return
+        logging.info("Пользователь снова активен, таймеры продолжают отсчет.")
+        self._resume_work_timers()
+
+    def resumed_from_sleep(self, seconds):
+        """Пока компьютер спал, пользователь отдыхал: отсчет начинается заново."""
+        if self.is_suspended() or self.is_in_pause(): return
+        logging.info(f"Компьютер выходил из сна ({seconds / 60:.0f} мин), таймеры перезапущены.")
+        if self.mode == self.MODE_WARNING: self.mode = self.MODE_WORK; self._emit(self.CLOSE_WARNING)
+        self.apply_settings()
+
+    # --- Пауза пользователем и временное отключение ---
+    def set_paused(self, paused):
+        if paused == self.is_paused_by_user: return
+        self.is_paused_by_user = paused
+        if paused:
+            self._stop_work_timers()
+            if self.mode == self.MODE_WARNING: self.mode = self.MODE_WORK; self._emit(self.CLOSE_WARNING)
+            self._changed()
+            logging.info("Таймеры приостановлены пользователем.")
+        self._emit(self.STATE_CHANGED)
+        if not paused and not self.is_temporarily_disabled:
+            self.apply_settings()
+            logging.info("Таймеры возобновлены пользователем.")
+
+    def toggle_pause(self): self.set_paused(not self.is_paused_by_user)
+
+    def disable(self, hours):
+        self.is_temporarily_disabled = True
+        self.disabled_hours = hours
+        self._stop_work_timers()
+        if self.mode == self.MODE_WARNING: self.mode = self.MODE_WORK; self._emit(self.CLOSE_WARNING)
+        self.queue.schedule(self.DISABLE, hours * 3600)
+        self._changed()
+        self._emit(self.STATE_CHANGED)
+        logging.info(f"Приложение отключено на {hours} час(а).")
+
+    def enable(self):
+        self.queue.cancel(self.DISABLE)
+        self.is_temporarily_disabled = False
+        self.disabled_hours = None
+        self._emit(self.STATE_CHANGED)
+        if not self.is_paused_by_user: self.apply_settings()
+        else: self._changed()
+        logging.info("Приложение снова активно.")
+
+    # --- Сохранение между запусками ---
+    def _intervals(self):
+        """Рабочие таймеры, включенные в настройках, и их полные интервалы в секундах."""
+        intervals = {}
+        if self.settings.get('big_break_enabled', True): intervals[self.BIG_BREAK] = self.settings.get('big_break_interval', 60) * 60
+        if self.settings.get('short_pause_enabled', True): intervals[self.SHORT_PAUSE] = self.settings.get('short_pause_interval', 20) * 60
+        return intervals
+
+    def snapshot(self):
+        """Состояние для журнала: остатки рабочих таймеров, пауза, отключение и время последнего перерыва."""
+        timers = {name: [round(self.queue.remaining(name), 1), self.queue.is_paused(name)]
+                  for name in (self.BIG_BREAK, self.SHORT_PAUSE) if name in self.queue}
+        state = {'timers': timers, 'paused': self.is_paused_by_user, 'last_break': self.last_big_break_at}
+        if self.is_temporarily_disabled: state['disabled'] = [self.disabled_hours, round(self.queue.remaining(self.DISABLE), 1)]
+        return state
+
+    def restore(self, state, elapsed, downtime):
+        """Продолжает расписание из snapshot().
+
+        elapsed — сколько секунд прошло с записи снимка, downtime — сколько из них
+        приложение не работало. Отсчет и временное отключение продолжаются с поправкой
+        на elapsed; если простой не короче большого перерыва, пользователь успел
+        отдохнуть, и отсчет начинается заново, как после сна.
+        """
+        self.last_big_break_at = state.get('last_break')
+        self.is_paused_by_user = bool(state.get('paused'))
+        disabled = state.get('disabled')
+        if disabled and disabled[1] > elapsed:
+            self.is_temporarily_disabled, self.disabled_hours = True, disabled[0]
+            self.queue.schedule(self.DISABLE, disabled[1] - elapsed)
+        self._emit(self.STATE_CHANGED)
+        if self.is_suspended(): self._changed(); return
+        if downtime >= self.settings.get('big_break_duration', 5) * 60: self.apply_settings(); return
+        self._stop_work_timers()
+        timers = state.get('timers', {})
+        for name, full in self._intervals().items():
+            # Остановленный простоем пользователя таймер не шел и после записи снимка
+            left, paused = timers.get(name, (full, True))
+            self.queue.schedule(name, min(full, max(self.RESTORE_MIN_SEC, left - (0 if paused else elapsed))))
+        self._sync_warning()
+        self._changed()
+        self._emit(self.SCHEDULE_APPLIED)
+        logging.info(f"Расписание восстановлено после перезапуска (приложение не работало {downtime:.0f} с).")
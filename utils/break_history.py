@@ -0,0 +1,91 @@
+# utils/break_history.py
+
+import os
+import time
+import sqlite3
+import datetime
+import logging
+
+EVENTS = ('started', 'completed', 'skipped', 'postponed', 'forced')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY, ts REAL NOT NULL, kind TEXT NOT NULL, event TEXT NOT NULL, seconds REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS daily (
+    period TEXT NOT NULL, kind TEXT NOT NULL,
+    started INTEGER NOT NULL DEFAULT 0, completed INTEGER NOT NULL DEFAULT 0, skipped INTEGER NOT NULL DEFAULT 0,
+    postponed INTEGER NOT NULL DEFAULT 0, forced INTEGER NOT NULL DEFAULT 0, rest_seconds REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weekly (
+    period TEXT NOT NULL, kind TEXT NOT NULL,
+    started INTEGER NOT NULL DEFAULT 0, completed INTEGER NOT NULL DEFAULT 0, skipped INTEGER NOT NULL DEFAULT 0,
+    postponed INTEGER NOT NULL DEFAULT 0, forced INTEGER NOT NULL DEFAULT 0, rest_seconds REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, kind)
+) WITHOUT ROWID;
+"""
+
+def day_key(ts): return time.strftime('%Y-%m-%d', time.localtime(ts))
+def week_key(ts): return time.strftime('%G-W%V', time.localtime(ts))
+
+class BreakHistory:
+    """История перерывов в SQLite: сырые события и готовые сводки по дням и неделям.
+
+    События только дописываются в конец таблицы events (целочисленный ключ, без
+    вторичных индексов), а в той же транзакции увеличиваются счетчики строк daily и
+    weekly за локальные день и ISO-неделю. Статистика за любой срок читает только
+    сводки — по строке на день или неделю, сколько бы лет событий ни накопилось.
+    Журнал WAL с synchronous=NORMAL: запись события — одна короткая транзакция без fsync.
+    """
+    def __init__(self, path, wall_clock=time.time):
+        self.path = path
+        self.wall_clock = wall_clock
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(_SCHEMA)
+
+    def record(self, kind, event, seconds=0.0, ts=None):
+        """kind — 'big' или 'short', event — одно из EVENTS; seconds — длительность отдыха."""
+        if event not in EVENTS: raise ValueError(f"неизвестное событие {event}")
+        ts = self.wall_clock() if ts is None else ts
+        rest = seconds if event in ('completed', 'skipped') else 0.0
+        try:
+            with self.db:
+                self.db.execute('INSERT INTO events (ts, kind, event, seconds) VALUES (?, ?, ?, ?)', (ts, kind, event, seconds))
+                for table, period in (('daily', day_key(ts)), ('weekly', week_key(ts))):
+                    self.db.execute(f"INSERT INTO {table} (period, kind, {event}, rest_seconds) VALUES (?, ?, 1, ?) "
+                                    f"ON CONFLICT (period, kind) DO UPDATE SET {event} = {event} + 1, "
+                                    f"rest_seconds = rest_seconds + excluded.rest_seconds", (period, kind, rest))
+        except sqlite3.Error as e:
+            logging.warning(f"Не удалось записать событие перерыва в {self.path}: {e}")
+
+    def _rollup(self, table, periods, kind):
+        rows = self.db.execute(f"SELECT period, started, completed, skipped, postponed, forced, rest_seconds FROM {table} "
+                               f"WHERE kind = ? AND period >= ? AND period <= ?", (kind, periods[0], periods[-1]))
+        found = {row[0]: dict(zip(('started', 'completed', 'skipped', 'postponed', 'forced', 'rest_seconds'), row[1:])) for row in rows}
+        empty = dict.fromkeys(('started', 'completed', 'skipped', 'postponed', 'forced'), 0); empty['rest_seconds'] = 0.0
+        return [(period, found.get(period, dict(empty))) for period in periods]
+
+    # Периоды отсчитываются по календарным датам: шаги по 86400 с при переходе на летнее
+    # время пропускали бы день или повторяли его
+    def daily(self, days=14, kind='big'):
+        """[(день, счетчики)] за последние days дней, включая сегодняшний и дни без перерывов."""
+        today = datetime.date.fromtimestamp(self.wall_clock())
+        return self._rollup('daily', [(today - datetime.timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days - 1, -1, -1)], kind)
+
+    def weekly(self, weeks=8, kind='big'):
+        today = datetime.date.fromtimestamp(self.wall_clock())
+        return self._rollup('weekly', [(today - datetime.timedelta(weeks=i)).strftime('%G-W%V') for i in range(weeks - 1, -1, -1)], kind)
+
+    def today(self, kind='big'): return self.daily(1, kind)[0][1]
+
+    @staticmethod
+    def compliance(counts):
+        """Доля перерывов, доведенных до конца, среди завершенных и пропущенных; None, если таких не было."""
+        finished = counts['completed'] + counts['skipped']
+        return counts['completed'] / finished if finished else None
+
+    def close(self): self.db.close()
@@ -0,0 +1,94 @@
+# utils/control_channel.py
+#
+# Клиентская сторона канала управления запущенным экземпляром. Только стандартная
+# библиотека: команда из скрипта или горячей клавиши не должна ждать загрузки Qt.
+
+import os
+import sys
+import socket
+import getpass
+import tempfile
+
+COMMANDS = {
+    'break-now': "начать большой перерыв",
+    'pause': "приостановить таймеры",
+    'resume': "возобновить таймеры (и снять временное отключение)",
+    'disable': "отключить на <часы> часов",
+    'enable': "снять временное отключение",
+    'status': "показать состояние",
+    'reload': "перечитать настройки и практики",
+    'settings': "открыть окно настроек",
+}
+TIMEOUT_SEC = 2.0
+PIPE_PREFIX = '\\\\.\\pipe\\'  # QLocalServer на Windows — именованный канал
+EXIT_OK, EXIT_ERROR, EXIT_NOT_RUNNING = 0, 1, 2
+
+def _base_name():
+    try: user = getpass.getuser()
+    except Exception: user = 'user'
+    return f"mindfulpause-{user}"
+
+def _runtime_dir(): return os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+
+def server_name():
+    """Имя для QLocalServer: на Windows — имя канала, иначе полный путь к сокету в каталоге пользователя."""
+    if sys.platform == 'win32': return _base_name()
+    return os.path.join(_runtime_dir(), _base_name() + '.sock')
+
+def lock_path():
+    """Файл блокировки, которым основной экземпляр владеет все время работы."""
+    return os.path.join(_runtime_dir(), _base_name() + '.lock')
+
+def is_running(timeout=TIMEOUT_SEC):
+    """Есть ли живой экземпляр, принимающий соединения (оставшийся после сбоя файл сокета не в счет)."""
+    try:
+        if sys.platform == 'win32':
+            with open(PIPE_PREFIX + server_name(), 'r+b', buffering=0): return True
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout); sock.connect(server_name())
+            return True
+    except OSError:
+        return False
+
+def send_command(words, timeout=TIMEOUT_SEC):
+    """Отправляет команду запущенному экземпляру. Возвращает (ok, сообщение) или None, если он не запущен."""
+    request = (' '.join(words) + '\n').encode('utf-8')
+    try:
+        if sys.platform == 'win32':
+            with open(PIPE_PREFIX + server_name(), 'r+b', buffering=0) as pipe:
+                pipe.write(request)
+                reply = pipe.readline()
+        else:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(server_name())
+                sock.sendall(request)
+                reply = sock.makefile('rb').readline()
+    except OSError:
+        return None
+    status, _, message = reply.decode('utf-8', 'replace').strip().partition(' ')
+    return status == 'ok', message
+
+def usage():
+    lines = ["Использование: MindfulPause.py [команда]", "Команды для запущенного экземпляра:"]
+    lines += [f"  {name + (' <часы>' if name == 'disable' else ''):<16} {text}" for name, text in COMMANDS.items()]
+    return '\n'.join(lines)
+
+def forward_from_cli(argv):
+    """Если уже запущен экземпляр, передает ему команду из argv и завершает процесс.
+
+    Без аргументов запущенный экземпляр просто открывает окно настроек. Возвращает
+    управление, только если запускаться должен этот процесс.
+    """
+    if argv and argv[0] in ('-h', '--help', 'help'):
+        print(usage()); sys.exit(EXIT_OK)
+    if argv and argv[0] not in COMMANDS:
+        print(f"Неизвестная команда: {argv[0]}\n{usage()}"); sys.exit(EXIT_ERROR)
+    result = send_command(argv or ['settings'])
+    if result is None:
+        if not argv: return
+        print("MindfulPause не запущен."); sys.exit(EXIT_NOT_RUNNING)
+    ok, message = result
+    if not argv: message = "MindfulPause уже запущен."
+    if message: print(message)
+    sys.exit(EXIT_OK if ok else EXIT_ERROR)
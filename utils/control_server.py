@@ -0,0 +1,62 @@
+# utils/control_server.py
+
+import logging
+from PySide6.QtCore import QObject, QLockFile
+from PySide6.QtNetwork import QLocalServer
+from utils.control_channel import server_name, lock_path, is_running
+
+class ControlServer(QObject):
+    """Локальный сокет единственного экземпляра: принимает команды от последующих запусков.
+
+    Протокол — одна строка UTF-8 «команда аргументы» в каждую сторону; ответ
+    начинается с ok или error. handler(command, args) возвращает текст ответа и
+    бросает ValueError для неверной команды. listen() возвращает False, если
+    уже запущен другой экземпляр. Основным становится только тот, кто взял файл
+    блокировки (lock_path): без нее два одновременных запуска оба прошли бы проверку
+    is_running(), и второй удалил бы сокет первого. Блокировка умершего процесса
+    снимается QLockFile, а оставшийся после него сокет удаляется и занимается заново.
+    Живой экземпляр проверяется и до listen: с UserAccessOption Qt создает сокет
+    переименованием и молча заменил бы чужой.
+    """
+    MAX_REQUEST_BYTES = 4096
+    LOCK_TIMEOUT_MS = 2000  # Пока другой запуск проверяет сокет, блокировка занята недолго
+
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        self.lock = QLockFile(lock_path())
+        self.lock.setStaleLockTime(0)  # Держится все время работы; устаревшей считается только блокировка умершего процесса
+
+    def listen(self):
+        name = server_name()
+        if not self.lock.tryLock(self.LOCK_TIMEOUT_MS):
+            if self.lock.error() == QLockFile.LockFailedError: return False
+            logging.warning(f"Не удалось создать файл блокировки {self.lock.fileName()}, проверяется только сокет")
+        if is_running(): return False
+        if self.server.listen(name): return True
+        QLocalServer.removeServer(name)
+        if self.server.listen(name): return True
+        logging.warning(f"Канал управления недоступен: {self.server.errorString()}")
+        return True  # Запуститься все равно можно, просто без команд извне
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self._on_ready_read(c))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def _on_ready_read(self, connection):
+        if not connection.canReadLine():
+            if connection.bytesAvailable() > self.MAX_REQUEST_BYTES: connection.abort()
+            return
+        words = bytes(connection.readLine()).decode('utf-8', 'replace').split()
+        if not words: reply = "error пустая команда"
+        else:
+            try: reply = f"ok {self.handler(words[0], words[1:]) or ''}"
+            except ValueError as e: reply = f"error {e}"
+        connection.write((reply.rstrip() + '\n').encode('utf-8'))
+        connection.flush()
+        connection.disconnectFromServer()
@@ -0,0 +1,80 @@
+# utils/deadline_queue.py
+
+import heapq
+import itertools
+import time
+
+class DeadlineQueue:
+    """Очередь именованных сроков на монотонных часах, без зависимостей от Qt.
+
+    Сроки хранятся как абсолютные моменты clock(), поэтому сколько бы раз
+    ни перевзводился таймер, они не «уплывают». Каждый срок можно поставить на паузу
+    (запоминается остаток), возобновить, отложить или отменить. Куча хранит записи
+    с ленивым удалением: устаревшие отбрасываются при извлечении.
+    """
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._deadlines = {}   # имя -> абсолютный срок
+        self._paused = {}      # имя -> остаток в секундах
+        self._heap = []
+        self._counter = itertools.count()
+
+    def schedule(self, name, delay):
+        """Ставит срок name через delay секунд от текущего момента (перезаписывает прежний)."""
+        self._paused.pop(name, None)
+        deadline = self.clock() + max(0.0, delay)
+        self._deadlines[name] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), name))
+        if len(self._heap) > 64 and len(self._heap) > 4 * len(self._deadlines): self._compact()
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._deadlines.get(entry[2]) == entry[0]]
+        heapq.heapify(self._heap)
+
+    def postpone(self, name, delay): self.schedule(name, delay)
+
+    def cancel(self, name):
+        self._deadlines.pop(name, None); self._paused.pop(name, None)
+
+    def pause(self, name):
+        if name in self._deadlines: self._paused[name] = max(0.0, self._deadlines.pop(name) - self.clock())
+
+    def resume(self, name):
+        if name in self._paused: self.schedule(name, self._paused.pop(name))
+
+    def is_scheduled(self, name): return name in self._deadlines
+    def is_paused(self, name): return name in self._paused
+    def __contains__(self, name): return name in self._deadlines or name in self._paused
+
+    def remaining(self, name):
+        """Остаток до срока в секундах (для приостановленных — сохраненный остаток), либо None."""
+        if name in self._paused: return self._paused[name]
+        if name in self._deadlines: return max(0.0, self._deadlines[name] - self.clock())
+        return None
+
+    def _prune(self):
+        while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]: heapq.heappop(self._heap)
+
+    def next_deadline(self):
+        """Ближайший активный срок (в единицах clock) или None."""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_next_due(self, now=None):
+        """Извлекает самый ранний наступивший срок или возвращает None."""
+        now = self.clock() if now is None else now
+        self._prune()
+        if not self._heap or self._heap[0][0] > now: return None
+        _, _, name = heapq.heappop(self._heap)
+        del self._deadlines[name]
+        return name
+
+    def pop_due(self, now=None):
+        """Извлекает все наступившие сроки в порядке их наступления."""
+        now = self.clock() if now is None else now
+        due = []
+        name = self.pop_next_due(now)
+        while name is not None: due.append(name); name = self.pop_next_due(now)
+        return due
+
+    def clear(self): self._deadlines.clear(); self._paused.clear(); self._heap.clear()
@@ -0,0 +1,144 @@
+# utils/file_writer.py
+
+import os
+import time
+import logging
+import tempfile
+import threading
+from utils.metrics import metrics
+
+# umask нельзя прочитать, не изменив его, а менять его из фонового потока небезопасно — читаем один раз при импорте
+_UMASK = os.umask(0o022); os.umask(_UMASK)
+
+def atomic_write(path, text):
+    """Записывает файл через временный файл и rename: читатели видят либо старую, либо новую версию.
+
+    text — строка (пишется в UTF-8) или bytes (пишутся как есть).
+
+    Права доступа сохраняются от прежнего файла, новый файл получает обычные права по umask
+    (mkstemp сам по себе создает файл с правами 0600).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try: mode = os.stat(path).st_mode & 0o7777
+    except OSError: mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with (os.fdopen(fd, 'wb') if isinstance(text, bytes) else os.fdopen(fd, 'w', encoding='utf-8', newline='\n')) as f:
+            f.write(text); f.flush(); os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+class FileWriter:
+    """Фоновая запись файлов: GUI-поток только ставит содержимое в очередь.
+
+    Содержимое — строка или функция без аргументов, возвращающая строку; функция
+    вызывается уже в фоновом потоке и должна работать со снимком данных, а не с
+    живыми объектами. Повторные записи одного файла за DEBOUNCE_SEC сливаются в одну
+    (но не откладываются дольше MAX_DELAY_SEC), пишется всегда последнее содержимое
+    через atomic_write. pending_text() отдает еще не записанное содержимое, чтобы
+    чтение видело свои же изменения. flush() дописывает все сразу (при выходе).
+    Неудачная запись повторяется через RETRY_SEC, пока не придет новое содержимое.
+    """
+    DEBOUNCE_SEC = 0.3
+    MAX_DELAY_SEC = 2.0
+    RETRY_SEC = 5.0
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._pending = {}   # путь -> [содержимое, первая постановка, срок записи, после записи]
+        self._writing = {}   # путь -> содержимое, которое пишется прямо сейчас
+        self._thread = None
+        self._stopping = False
+
+    def submit(self, path, content, on_written=None, delay=None):
+        """Ставит запись в очередь; on_written() вызывается в фоновом потоке после успешной записи.
+
+        delay заменяет DEBOUNCE_SEC для данных, которые не страшно записать позже (и не
+        позже чем через delay после первой постановки): частые изменения сливаются в одну запись.
+        """
+        with self._cond:
+            now = self.clock()
+            first = self._pending[path][1] if path in self._pending else now
+            debounce = self.DEBOUNCE_SEC if delay is None else delay
+            self._pending[path] = [content, first, min(now + debounce, first + max(debounce, self.MAX_DELAY_SEC)), on_written]
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='file-writer', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending_text(self, path):
+        """Содержимое, которое еще не записано на диск, либо None."""
+        with self._cond:
+            entry = self._pending.get(path)
+            content = entry[0] if entry is not None else self._writing.get(path)
+        return content() if callable(content) else content
+
+    def has_pending(self):
+        with self._cond: return bool(self._pending or self._writing)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping and not self._pending: return
+                    now = self.clock()
+                    due = [path for path, entry in self._pending.items() if entry[2] <= now or self._stopping]
+                    if due: break
+                    self._cond.wait(min(entry[2] for entry in self._pending.values()) - now if self._pending else None)
+                batch = {path: self._pending.pop(path) for path in due}
+                self._writing = {path: entry[0] for path, entry in batch.items()}
+            try:
+                for path, (content, first, _, on_written) in batch.items():
+                    self._write(path, content, first, on_written)
+            finally:
+                with self._cond:
+                    self._writing = {}
+                    self._cond.notify_all()
+
+    def _write(self, path, content, first, on_written):
+        """Одна запись. Ошибки не выходят наружу: фоновый поток должен пережить любую из них."""
+        try:
+            text = content() if callable(content) else content
+            with metrics.timer('file_write', file=os.path.basename(path)): atomic_write(path, text)
+        except OSError as e:
+            logging.warning(f"Не удалось записать {path}: {e}; повтор через {self.RETRY_SEC:.0f} с.")
+            with self._cond:
+                # Более новое содержимое важнее повтора старого
+                if path not in self._pending and not self._stopping:
+                    self._pending[path] = [content, first, self.clock() + self.RETRY_SEC, on_written]
+            return
+        except Exception:
+            # Ошибка в самих данных (сериализация, кодировка) при повторе не исчезнет
+            logging.exception(f"Не удалось подготовить содержимое {path}, запись пропущена")
+            return
+        if on_written is None: return
+        try: on_written()
+        except Exception: logging.exception(f"Ошибка после записи {path}")
+
+    def flush(self, timeout=10.0):
+        """Записывает все, что стоит в очереди, и ждет окончания записи. True, если все записано.
+
+        Не ждет повторов неудачных записей и того, что поставлено в очередь уже после вызова.
+        """
+        with self._cond:
+            started = self.clock()
+            for entry in self._pending.values(): entry[2] = started
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: not self._writing and all(entry[2] > started for entry in self._pending.values()), timeout)
+            return not self._pending and not self._writing
+
+    def close(self, timeout=10.0):
+        """flush() и остановка фонового потока; последующий submit запустит его снова."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None: thread.join(timeout)
+        with self._cond:
+            if self._pending: logging.warning(f"Не записаны файлы: {', '.join(self._pending)}")
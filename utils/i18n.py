@@ -0,0 +1,218 @@
+# utils/i18n.py
+#
+# Локализация интерфейса. Строки в коде пишутся по-русски и оборачиваются в tr():
+# русский текст служит ключом, а непереведенная строка показывается как есть.
+# Переводы лежат в data/ui_texts_<язык>.xml и при первой загрузке компилируются
+# в двоичный каталог data/lang_cache/ui_texts_<язык>.cat.
+# Проверка переводов: python -m utils.i18n — непереведенные и устаревшие строки по всем языкам.
+
+import os
+import sys
+import zlib
+import struct
+import locale
+import logging
+import xml.etree.ElementTree as ET
+from utils.file_writer import atomic_write
+
+SOURCE_LANGUAGE = 'ru'     # язык строк в коде
+FALLBACK_LANGUAGE = 'en'   # для систем, язык которых не поддерживается
+LANGUAGES = {'ru': 'Русский', 'en': 'English', 'de': 'Deutsch'}
+_LANGUAGE_NAMES = {'russian': 'ru', 'english': 'en', 'german': 'de', 'deutsch': 'de'}
+
+def system_language():
+    """Двухбуквенный код языка интерфейса системы или None, если его не определить."""
+    candidates = [os.environ.get(name) for name in ('LANGUAGE', 'LC_ALL', 'LC_MESSAGES', 'LANG')]
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            candidates.insert(0, locale.windows_locale.get(ctypes.windll.kernel32.GetUserDefaultUILanguage()))
+        except (AttributeError, OSError): pass
+    try: candidates.append(locale.getlocale()[0])
+    except ValueError: pass
+    for candidate in candidates:
+        if not candidate: continue
+        code = candidate.split(':')[0].split('.')[0].split('@')[0].replace('-', '_').split('_')[0].lower()
+        code = _LANGUAGE_NAMES.get(code, code)
+        if code not in ('c', 'posix') and code.isalpha(): return code
+    return None
+
+def resolve_language(setting):
+    """Язык по настройке language: код из LANGUAGES или 'auto' — язык системы, если он поддерживается."""
+    if setting in LANGUAGES: return setting
+    detected = system_language()
+    return detected if detected in LANGUAGES else FALLBACK_LANGUAGE
+
+def fallback_chain(language):
+    """Языки, в которых ищутся файлы данных: сам язык, затем английский, затем русский."""
+    return list(dict.fromkeys((language, FALLBACK_LANGUAGE, SOURCE_LANGUAGE)))
+
+def localized_path(directory, stem, language):
+    """Первый существующий stem_<язык>.xml по fallback_chain; если нет ни одного — файл для самого языка."""
+    for candidate in fallback_chain(language):
+        path = os.path.join(directory, f'{stem}_{candidate}.xml')
+        if os.path.exists(path): return path
+    return os.path.join(directory, f'{stem}_{language}.xml')
+
+def read_pack(path):
+    """{исходная строка: перевод} из языкового пакета; сообщения без перевода пропускаются."""
+    messages = {}
+    for message in ET.parse(path).getroot().iter('message'):
+        source, translation = message.findtext('source'), message.findtext('translation')
+        if source and translation: messages[source] = translation
+    return messages
+
+# Формат каталога: заголовок, таблица слотов с открытой адресацией (номер записи + 1, 0 — пусто),
+# записи (смещение и длина исходной строки и перевода) и общий блок строк UTF-8.
+# Слот ключа — crc32 его байтов по модулю числа слотов, коллизии — линейным пробированием;
+# таблица заполнена не больше чем наполовину, поэтому поиск в среднем смотрит один-два слота.
+_MAGIC, _VERSION = b'MPMC', 1
+_HEADER = struct.Struct('<4sHHIIqq')  # магия, версия, резерв, записей, слотов, mtime_ns и размер пакета
+_SLOT = struct.Struct('<I')
+_RECORD = struct.Struct('<IIII')
+
+def compile_catalog(messages, signature=(0, 0)):
+    """Двоичный каталог из {исходная строка: перевод}; signature — (mtime_ns, размер) пакета для проверки свежести."""
+    slots = 1 << max(1, (2 * len(messages) - 1).bit_length())
+    table, records, blob = [0] * slots, [], bytearray()
+    for index, (source, translation) in enumerate(messages.items()):
+        key, value = source.encode('utf-8'), translation.encode('utf-8')
+        records.append((len(blob), len(key), len(blob) + len(key), len(value)))
+        blob += key + value
+        slot = zlib.crc32(key) & (slots - 1)
+        while table[slot]: slot = (slot + 1) & (slots - 1)
+        table[slot] = index + 1
+    return b''.join([_HEADER.pack(_MAGIC, _VERSION, 0, len(messages), slots, *signature),
+                     struct.pack(f'<{slots}I', *table), b''.join(_RECORD.pack(*record) for record in records), bytes(blob)])
+
+class MessageCatalog:
+    """Переводы одного языка из скомпилированного каталога.
+
+    Ничего не читается до первого lookup(): тогда файл каталога целиком загружается
+    одним чтением, а если его нет или пакет новее (mtime и размер в заголовке),
+    пакет компилируется и каталог записывается заново. Строки декодируются только
+    при обращении к ним, найденные запоминаются. Поиск — хеш-таблица в самом файле,
+    время не зависит от числа сообщений. Ошибки пакета не мешают работе: каталог
+    становится пустым, и интерфейс показывает исходные строки.
+    """
+    def __init__(self, language, pack_dir, cache_dir):
+        self.language = language
+        self.pack_path = os.path.join(pack_dir, f'ui_texts_{language}.xml')
+        self.cache_path = os.path.join(cache_dir, f'ui_texts_{language}.cat')
+        self._data = None
+        self._memo = {}
+
+    def _pack_signature(self):
+        try: stat = os.stat(self.pack_path)
+        except OSError: return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_cache(self, signature):
+        try:
+            with open(self.cache_path, 'rb') as f: data = f.read()
+            magic, version, _, count, slots, mtime_ns, size = _HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        if magic != _MAGIC or version != _VERSION or (mtime_ns, size) != signature: return None
+        return data
+
+    def _compile(self, signature):
+        try: data = compile_catalog(read_pack(self.pack_path), signature)
+        except (OSError, ET.ParseError) as e:
+            logging.warning(f"Не удалось прочитать языковой пакет {self.pack_path}: {e}")
+            return compile_catalog({})
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            atomic_write(self.cache_path, data)
+        except OSError as e:
+            logging.info(f"Каталог {self.cache_path} не сохранен, пакет будет компилироваться при каждом запуске: {e}")
+        return data
+
+    def load(self):
+        """Загружает каталог (при необходимости компилируя пакет). Повторные вызовы ничего не делают."""
+        if self._data is not None: return
+        signature = self._pack_signature()
+        if signature is None: data = compile_catalog({})  # пакета нет — показываются исходные строки
+        else: data = self._read_cache(signature) or self._compile(signature)
+        _, _, _, self.count, slots, _, _ = _HEADER.unpack_from(data)
+        self._mask = slots - 1
+        self._records_at = _HEADER.size + slots * _SLOT.size
+        self._blob_at = self._records_at + self.count * _RECORD.size
+        self._data = memoryview(data)
+
+    def lookup(self, text):
+        """Перевод text или None, если его нет."""
+        if text in self._memo: return self._memo[text]
+        if self._data is None: self.load()
+        key, data = text.encode('utf-8'), self._data
+        slot, found = zlib.crc32(key) & self._mask, None
+        while True:
+            index = _SLOT.unpack_from(data, _HEADER.size + slot * _SLOT.size)[0]
+            if not index: break
+            key_at, key_len, value_at, value_len = _RECORD.unpack_from(data, self._records_at + (index - 1) * _RECORD.size)
+            if data[self._blob_at + key_at:self._blob_at + key_at + key_len] == key:
+                found = str(data[self._blob_at + value_at:self._blob_at + value_at + value_len], 'utf-8')
+                break
+            slot = (slot + 1) & self._mask
+        self._memo[text] = found
+        return found
+
+    def tr(self, text, **values):
+        translated = self.lookup(text)
+        if translated is None: translated = text
+        return translated.format(**values) if values else translated
+
+    def __len__(self): self.load(); return self.count
+
+_active = None
+
+def install(catalog):
+    """Делает catalog действующим для tr(); до вызова tr() возвращает исходные строки."""
+    global _active
+    _active = catalog
+
+def current_language(): return _active.language if _active is not None else SOURCE_LANGUAGE
+
+def tr(text, **values):
+    """Перевод строки интерфейса на действующий язык; values подставляются через str.format."""
+    if _active is not None: return _active.tr(text, **values)
+    return text.format(**values) if values else text
+
+# --- Проверка переводов: python -m utils.i18n ---
+def source_strings(root_dir):
+    """{строка: [места]} для всех вызовов tr() с литералом в исходниках проекта."""
+    import ast
+    found = {}
+    for directory, dirs, files in os.walk(root_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ('data', 'venv', '__pycache__')]
+        for name in files:
+            if not name.endswith('.py'): continue
+            path = os.path.join(directory, name)
+            with open(path, 'r', encoding='utf-8') as f: tree = ast.parse(f.read(), path)
+            for node in ast.walk(tree):
+                if (isinstance(node, ast.Call) and getattr(node.func, 'id', getattr(node.func, 'attr', None)) == 'tr'
+                        and node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+                    found.setdefault(node.args[0].value, []).append(f"{os.path.relpath(path, root_dir)}:{node.lineno}")
+    return found
+
+def main():
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = os.path.join(root_dir, 'data')
+    strings = source_strings(root_dir)
+    print(f"Строк для перевода: {len(strings)}")
+    complete = True
+    for language in LANGUAGES:
+        if language == SOURCE_LANGUAGE: continue
+        catalog = MessageCatalog(language, data_dir, os.path.join(data_dir, 'lang_cache'))
+        messages = read_pack(catalog.pack_path) if os.path.exists(catalog.pack_path) else {}
+        missing = [text for text in strings if text not in messages]
+        obsolete = [text for text in messages if text not in strings]
+        print(f"{language}: переведено {len(strings) - len(missing)} из {len(strings)}, устаревших {len(obsolete)}")
+        for text in missing: print(f"  нет перевода ({', '.join(strings[text])}): {text!r}")
+        for text in obsolete: print(f"  устарело: {text!r}")
+        catalog.load()
+        complete = complete and not missing
+    return 0 if complete else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
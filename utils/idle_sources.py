@@ -0,0 +1,185 @@
+# utils/idle_sources.py
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import logging
+from PySide6.QtCore import QObject, Signal, Slot, SLOT
+from utils.system_utils import get_idle_time_windows
+
+class IdleSource(QObject):
+    """Источник сведений о простое пользователя.
+
+    idle_seconds() возвращает, сколько секунд не было ввода. Источники с
+    supports_events = True сами сообщают о переходах: idle_started — пользователь
+    перестал проявлять активность, activity_resumed — вернулся. Для них трекер
+    подписывается на сигналы вместо постоянного опроса.
+    """
+    idle_started = Signal()
+    activity_resumed = Signal()
+    name = 'base'
+    supports_events = False
+
+    def is_available(self): return True
+    def idle_seconds(self): raise NotImplementedError
+    def start_events(self): pass
+    def stop_events(self): pass
+
+class NullIdleSource(IdleSource):
+    """Запасной вариант, когда простой определить нечем: пользователь всегда считается активным."""
+    name = 'none'
+    def idle_seconds(self): return 0.0
+
+class WindowsIdleSource(IdleSource):
+    """GetLastInputInfo: время с последнего ввода, только опросом."""
+    name = 'windows'
+    def is_available(self): return sys.platform == 'win32'
+    def idle_seconds(self): return get_idle_time_windows()
+
+class _XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [('window', ctypes.c_ulong), ('state', ctypes.c_int), ('kind', ctypes.c_int),
+                ('til_or_since', ctypes.c_ulong), ('idle', ctypes.c_ulong), ('eventMask', ctypes.c_ulong)]
+
+class X11IdleSource(IdleSource):
+    """Расширение MIT-SCREEN-SAVER (libXss): время простоя X-сервера, опросом."""
+    name = 'x11'
+
+    def __init__(self):
+        super().__init__()
+        self._display = None
+        xlib_name, xss_name = ctypes.util.find_library('X11'), ctypes.util.find_library('Xss')
+        if not (xlib_name and xss_name and os.environ.get('DISPLAY')): return
+        try:
+            xlib, self._xss = ctypes.CDLL(xlib_name), ctypes.CDLL(xss_name)
+            xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]; xlib.XOpenDisplay.restype = ctypes.c_void_p
+            xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]; xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+            self._xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(_XScreenSaverInfo)
+            self._xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XScreenSaverInfo)]
+            display = xlib.XOpenDisplay(None)
+            if display:
+                self._root = xlib.XDefaultRootWindow(display)
+                self._info = self._xss.XScreenSaverAllocInfo()
+                self._display = display
+        except (OSError, AttributeError) as e:
+            logging.warning(f"X11: не удалось подключить XScreenSaver: {e}")
+
+    def is_available(self): return bool(self._display)
+
+    def idle_seconds(self):
+        if not self._display or not self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info): return 0.0
+        return self._info.contents.idle / 1000.0
+
+class LogindIdleSource(IdleSource):
+    """systemd-logind: свойства сессии IdleHint/IdleSinceHintMonotonic через D-Bus.
+
+    Поддерживает события: изменения свойств приходят сигналом PropertiesChanged,
+    поэтому пока пользователь работает, опрашивать ничего не нужно. IdleHint
+    выставляет окружение рабочего стола по собственному порогу простоя, так что
+    таймаут трекера должен быть не меньше этого порога.
+    """
+    name = 'logind'
+    supports_events = True
+    SERVICE = 'org.freedesktop.login1'
+    SESSION_IFACE = 'org.freedesktop.login1.Session'
+    PROPS_IFACE = 'org.freedesktop.DBus.Properties'
+
+    def __init__(self):
+        super().__init__()
+        self._bus = self._path = None
+        self._subscribed = False
+        self._was_idle = False
+        try:
+            from PySide6.QtDBus import QDBusConnection, QDBusInterface
+        except ImportError:
+            return
+        bus = QDBusConnection.systemBus()
+        if not bus.isConnected(): return
+        manager = QDBusInterface(self.SERVICE, '/org/freedesktop/login1', 'org.freedesktop.login1.Manager', bus)
+        session_id = os.environ.get('XDG_SESSION_ID')
+        reply = manager.call('GetSession', session_id) if session_id else manager.call('GetSessionByPID', os.getpid())
+        args = reply.arguments()
+        if not args: return
+        path = args[0].path() if hasattr(args[0], 'path') else str(args[0])
+        self._bus, self._path = bus, path
+        self._props = QDBusInterface(self.SERVICE, path, self.PROPS_IFACE, bus)
+
+    def is_available(self): return self._path is not None and self._get('IdleHint') is not None
+
+    def _get(self, prop):
+        args = self._props.call('Get', self.SESSION_IFACE, prop).arguments()
+        if not args: return None
+        value = args[0]
+        return value.variant() if hasattr(value, 'variant') else value
+
+    def idle_seconds(self):
+        if self._path is None or not self._get('IdleHint'): return 0.0
+        since_us = self._get('IdleSinceHintMonotonic') or 0
+        # IdleSinceHintMonotonic отсчитывается по CLOCK_MONOTONIC, как и time.monotonic() в Linux
+        return max(0.0, time.monotonic() - since_us / 1_000_000)
+
+    def start_events(self):
+        if self._path is None or self._subscribed: return
+        self._subscribed = self._bus.connect(self.SERVICE, self._path, self.PROPS_IFACE, 'PropertiesChanged',
+                                             self, SLOT('_on_properties_changed(QDBusMessage)'))
+        self._was_idle = bool(self._get('IdleHint'))
+
+    def stop_events(self):
+        if not self._subscribed: return
+        self._bus.disconnect(self.SERVICE, self._path, self.PROPS_IFACE, 'PropertiesChanged',
+                             self, SLOT('_on_properties_changed(QDBusMessage)'))
+        self._subscribed = False
+
+    @Slot('QDBusMessage')
+    def _on_properties_changed(self, message):
+        is_idle = bool(self._get('IdleHint'))
+        if is_idle == self._was_idle: return
+        self._was_idle = is_idle
+        if is_idle: self.idle_started.emit()
+        else: self.activity_resumed.emit()
+
+class FakeIdleSource(IdleSource):
+    """Сценарный источник для тестов.
+
+    script — список значений простоя (каждый вызов idle_seconds() берет следующее,
+    последнее повторяется) или функция без аргументов. Значение можно задать и
+    напрямую через set_idle(); при supports_events=True переходы имитируются
+    методами emit_idle()/emit_active().
+    """
+    name = 'fake'
+
+    def __init__(self, script=None, supports_events=False):
+        super().__init__()
+        self.supports_events = supports_events
+        self._script = list(script) if isinstance(script, (list, tuple)) else script
+        self._idle = 0.0
+        self.polls = 0
+
+    def set_idle(self, seconds): self._idle = float(seconds)
+
+    def idle_seconds(self):
+        self.polls += 1
+        if callable(self._script): return float(self._script())
+        if self._script: self._idle = float(self._script.pop(0) if len(self._script) > 1 else self._script[0])
+        return self._idle
+
+    def emit_idle(self, seconds=None):
+        if seconds is not None: self.set_idle(seconds)
+        self.idle_started.emit()
+
+    def emit_active(self): self.set_idle(0); self.activity_resumed.emit()
+
+SOURCES = {'windows': WindowsIdleSource, 'x11': X11IdleSource, 'logind': LogindIdleSource}
+
+def create_idle_source(preferred=None):
+    """Выбирает лучший доступный источник. preferred (или MINDFULPAUSE_IDLE_SOURCE) задает его явно."""
+    preferred = preferred or os.environ.get('MINDFULPAUSE_IDLE_SOURCE')
+    if sys.platform == 'win32': order = ['windows']
+    else: order = ['x11', 'logind']  # X11 дает точное время простоя; logind — для Wayland и сессий без X
+    if preferred in SOURCES: order = [preferred] + [name for name in order if name != preferred]
+    for name in order:
+        source = SOURCES[name]()
+        if source.is_available(): return source
+    logging.warning("Не удалось определить источник данных о простое: отслеживание активности недоступно")
+    return NullIdleSource()
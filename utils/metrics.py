@@ -0,0 +1,127 @@
+# utils/metrics.py
+
+import os
+import json
+import functools
+import time
+import bisect
+import logging
+import threading
+from logging.handlers import RotatingFileHandler
+
+# Границы корзин гистограмм Prometheus, в секундах
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _NullTimer:
+    """Замер, который ничего не делает: его отдает выключенный Metrics."""
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+    def __init__(self, metrics, name, labels): self.metrics, self.name, self.labels = metrics, name, labels
+    def __enter__(self): self.start = time.perf_counter(); return self
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+class Metrics:
+    """Замеры времени горячих путей с выгрузкой на локальный диск.
+
+    Каждое наблюдение пишется строкой JSON в ротируемый журнал (metrics.jsonl,
+    по умолчанию 1 МБ x 3 архива), а сводные гистограммы — не чаще раза в
+    PROM_INTERVAL_SEC в текстовый файл формата Prometheus (для textfile collector
+    node_exporter), если задан его путь. Пока замеры выключены, timer() возвращает
+    общий пустой контекстный менеджер, а observe() сразу выходит.
+    """
+    PROM_INTERVAL_SEC = 15
+    PREFIX = 'mindfulpause_'
+
+    def __init__(self):
+        self.enabled = False
+        self.prometheus_path = None
+        self._logger = None
+        self._lock = threading.Lock()
+        self._histograms = {}  # (имя, метки) -> [счетчики корзин..., сумма, количество]
+        self._prom_written_at = 0.0
+
+    def configure(self, directory, enabled=True, prometheus_path=None, max_bytes=1024 * 1024, backups=3):
+        self.enabled = enabled
+        self.prometheus_path = prometheus_path
+        if not enabled: return
+        os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(os.path.join(directory, 'metrics.jsonl'), maxBytes=max_bytes,
+                                      backupCount=backups, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._logger = logging.getLogger('mindfulpause.metrics')
+        self._logger.handlers[:] = [handler]
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+
+    def configure_from_env(self, base_dir):
+        """MINDFULPAUSE_METRICS=1 включает замеры, MINDFULPAUSE_METRICS_PROM — путь к файлу для Prometheus."""
+        enabled = os.environ.get('MINDFULPAUSE_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+        self.configure(os.path.join(base_dir, 'data', 'metrics'), enabled, os.environ.get('MINDFULPAUSE_METRICS_PROM') or None)
+
+    def timer(self, name, **labels):
+        """Контекстный менеджер, замеряющий время блока: with metrics.timer('xml_load_settings'): ..."""
+        return _Timer(self, name, labels) if self.enabled else _NULL_TIMER
+
+    def timed(self, name, **labels):
+        """Декоратор: замеряет каждый вызов функции, пока замеры включены."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled: return func(*args, **kwargs)
+                with _Timer(self, name, labels): return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled: return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None: histogram = self._histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+            index = bisect.bisect_left(BUCKETS, seconds)
+            if index < len(BUCKETS): histogram[index] += 1
+            histogram[-2] += seconds; histogram[-1] += 1
+        record = {'ts': round(time.time(), 3), 'metric': name, 'ms': round(seconds * 1000, 3)}
+        if labels: record.update(labels)
+        self._logger.info(json.dumps(record, ensure_ascii=False))
+        if self.prometheus_path and time.monotonic() - self._prom_written_at >= self.PROM_INTERVAL_SEC:
+            self.write_prometheus()
+
+    def prometheus_text(self):
+        with self._lock: histograms = {key: list(values) for key, values in self._histograms.items()}
+        lines, described = [], set()
+        for (name, labels), values in sorted(histograms.items()):
+            metric = f"{self.PREFIX}{name}_seconds"
+            if metric not in described:
+                lines.append(f"# TYPE {metric} histogram"); described.add(metric)
+            base = ''.join(f'{key}="{value}",' for key, value in labels)
+            cumulative = 0
+            for bound, count in zip(BUCKETS, values):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{base}le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{base}le="+Inf"}} {values[-1]}')
+            suffix = '{' + base.rstrip(',') + '}' if base else ''
+            lines.append(f"{metric}_sum{suffix} {values[-2]:.6f}")
+            lines.append(f"{metric}_count{suffix} {values[-1]}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self):
+        if not self.prometheus_path: return
+        self._prom_written_at = time.monotonic()
+        from utils.file_writer import atomic_write
+        try: atomic_write(self.prometheus_path, self.prometheus_text())
+        except OSError as e: logging.warning(f"Не удалось записать метрики в {self.prometheus_path}: {e}")
+
+    def flush(self):
+        """Дописывает файл Prometheus (при выходе из приложения)."""
+        if self.enabled: self.write_prometheus()
+
+metrics = Metrics()
@@ -0,0 +1,60 @@
+# utils/practice_io.py
+
+import csv
+import io
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+# Форматы массового импорта/экспорта практик, по расширению файла:
+#   .txt  — практики разделены пустой строкой; если пустых строк нет — одна практика на строку
+#   .csv  — колонка "text" (или первая колонка, если заголовка нет)
+#   .json — список строк или объектов {"text": ...}
+#   .xml  — формат файлов практик приложения (<practice>...</practice>)
+FORMATS = ('.txt', '.csv', '.json', '.xml')
+
+def practice_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS: raise ValueError(f"Неподдерживаемый формат файла: {ext or path}")
+    return ext
+
+def _clean(texts):
+    return [t.strip() for t in texts if isinstance(t, str) and t.strip()]
+
+def parse_practices(data, fmt):
+    """Разбирает содержимое файла (str) в список текстов практик."""
+    if fmt == '.txt':
+        data = data.replace('\r\n', '\n')
+        blocks = re.split(r'\n\s*\n', data) if re.search(r'\n\s*\n', data.strip()) else data.split('\n')
+        return _clean(blocks)
+    if fmt == '.csv':
+        rows = [row for row in csv.reader(io.StringIO(data)) if row]
+        if not rows: return []
+        header = [cell.strip().lower() for cell in rows[0]]
+        column = header.index('text') if 'text' in header else 0
+        if 'text' in header: rows = rows[1:]
+        return _clean(row[column] for row in rows if len(row) > column)
+    if fmt == '.json':
+        items = json.loads(data)
+        if isinstance(items, dict): items = items.get('practices', [])
+        return _clean(item.get('text') if isinstance(item, dict) else item for item in items)
+    root = ET.fromstring(data)
+    return _clean(elem.text for elem in root.iter('practice'))
+
+def read_practices(path):
+    with open(path, 'r', encoding='utf-8-sig') as f: data = f.read()
+    return parse_practices(data, practice_format(path))
+
+def format_practices(texts, fmt):
+    """Сериализует тексты практик в строку указанного формата."""
+    if fmt == '.txt': return '\n\n'.join(texts) + '\n'
+    if fmt == '.csv':
+        out = io.StringIO(); writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(['text']); writer.writerows([t] for t in texts)
+        return out.getvalue()
+    if fmt == '.json': return json.dumps(list(texts), ensure_ascii=False, indent=2) + '\n'
+    from utils.xml_manager import canonical_xml
+    root = ET.Element('practices')
+    for text in texts: ET.SubElement(root, 'practice').text = text
+    return canonical_xml(root)
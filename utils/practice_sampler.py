@@ -0,0 +1,143 @@
+# utils/practice_sampler.py
+
+import bisect
+import random
+
+_MASK = (1 << 64) - 1
+
+def _rank(seed, pid):
+    """Псевдослучайный ранг id в круге seed (финализатор splitmix64): одинаков при любом запуске."""
+    z = ((pid ^ seed) + 0x9E3779B97F4A7C15) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+class ShuffleBag:
+    """Круг выдачи id без повторов, заданный одним числом.
+
+    Порядок круга — id по возрастанию _rank(seed, id), поэтому состояние круга — это
+    seed и ранг последней выданной практики (cursor): выданы все id с рангом не выше
+    него. Оно не зависит от размера библиотеки и переживает добавление и удаление
+    практик, в том числе между запусками. Очередь оставшихся строится при первой
+    выдаче; выдача — O(1), добавление и удаление — вставка в отсортированный список.
+    Новая практика с рангом ниже cursor считается уже выданной и придет в следующем
+    круге. Новый круг не начинается с только что выданной практики.
+    """
+    def __init__(self, ids=(), rng=None):
+        self._rng = rng or random.Random()
+        self._ids = dict.fromkeys(ids)
+        self.seed = self._rng.getrandbits(64)
+        self.cursor = -1      # ранг последней выданной в этом круге; -1 — круг только начат
+        self._queue = None    # [(-ранг, id)] оставшихся: в конце — следующий
+        self.last = None
+
+    def __len__(self): return len(self._ids)
+    def __contains__(self, pid): return pid in self._ids
+    def ids(self): return list(self._ids)
+
+    def _build_queue(self):
+        self._queue = sorted((-r, pid) for pid in self._ids for r in (_rank(self.seed, pid),) if r > self.cursor)
+
+    def _new_round(self):
+        for _ in range(8):
+            self.seed, self.cursor = self._rng.getrandbits(64), -1
+            self._build_queue()
+            if len(self._queue) < 2 or self._queue[-1][1] != self.last: return
+        self._queue[-1], self._queue[-2] = self._queue[-2], self._queue[-1]
+
+    def draw(self):
+        if not self._ids: return None
+        if self._queue is None: self._build_queue()
+        if not self._queue: self._new_round()
+        rank, pid = self._queue.pop()
+        self.cursor = -rank
+        self.last = pid
+        return pid
+
+    def add(self, pid):
+        if pid in self._ids: return
+        self._ids[pid] = None
+        rank = _rank(self.seed, pid)
+        if self._queue is not None and rank > self.cursor: bisect.insort(self._queue, (-rank, pid))
+
+    def remove(self, pid):
+        if pid not in self._ids: return
+        del self._ids[pid]
+        if self._queue is None: return
+        entry = (-_rank(self.seed, pid), pid)
+        i = bisect.bisect_left(self._queue, entry)
+        if i < len(self._queue) and self._queue[i] == entry: del self._queue[i]
+
+    def restore(self, seed, cursor, last=None):
+        """Продолжает сохраненный круг; практики, добавленные с тех пор, распределяются по их рангам."""
+        self.seed, self.cursor, self._queue = seed, cursor, None
+        if last in self._ids: self.last = last
+
+class AliasTable:
+    """Таблица псевдонимов Уокера–Воуза: взвешенный выбор за O(1) после построения за O(n)."""
+    def __init__(self, items, weights, rng=None):
+        self._rng = rng or random.Random()
+        self.items = list(items)
+        n = len(self.items)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self._prob, self._alias = [1.0] * n, list(range(n))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s], self._alias[s] = scaled[s], l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def draw(self):
+        i = int(self._rng.random() * len(self.items))
+        return self.items[i] if self._rng.random() < self._prob[i] else self.items[self._alias[i]]
+
+class PracticeSampler:
+    """Выбор следующей практики.
+
+    Без весов — ShuffleBag: каждая практика выпадает ровно раз за круг. Если у каких-то
+    практик задан вес (атрибут weight в XML), выбор идет по таблице псевдонимов
+    (с возвращением, но без повтора предыдущей), перестраиваемой лениво после изменений.
+    Состояние круга — три числа (seed, cursor и последняя выданная), сколько бы практик ни было.
+    """
+    MAX_REPEAT_RETRIES = 3
+
+    def __init__(self, ids=(), weights=None, rng=None):
+        self._rng = rng or random.Random()
+        self.bag = ShuffleBag(ids, self._rng)
+        self.weights = {pid: w for pid, w in (weights or {}).items() if w != 1.0}
+        self._alias = None
+
+    def __len__(self): return len(self.bag)
+
+    def add(self, pid, weight=1.0):
+        self.bag.add(pid)
+        if weight != 1.0: self.weights[pid] = weight
+        self._alias = None
+
+    def remove(self, pid):
+        self.bag.remove(pid); self.weights.pop(pid, None)
+        self._alias = None
+
+    def draw(self):
+        if not self.weights: return self.bag.draw()
+        if self._alias is None:
+            ids = self.bag.ids()
+            if not ids: return None
+            self._alias = AliasTable(ids, [self.weights.get(pid, 1.0) for pid in ids], self._rng)
+        pid = self._alias.draw()
+        for _ in range(self.MAX_REPEAT_RETRIES):
+            if pid != self.bag.last or len(self.bag) < 2: break
+            pid = self._alias.draw()
+        self.bag.last = pid
+        return pid
+
+    def state(self):
+        return {'seed': self.bag.seed, 'cursor': self.bag.cursor, 'last': self.bag.last}
+
+    def restore(self, state):
+        if not state: return
+        seed, cursor = state.get('seed'), state.get('cursor')
+        if isinstance(seed, int) and isinstance(cursor, int): self.bag.restore(seed, cursor, state.get('last'))
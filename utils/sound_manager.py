@@ -1,26 +1,147 @@
 # utils/sound_manager.py
 
+import io
 import os
+import time
+import wave
+import logging
 from PySide6.QtCore import QUrl
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+from utils.file_writer import atomic_write
 
 class SoundManager:
-    def __init__(self, base_dir):
+    """Звуки начала и конца пауз.
+
+    Основной путь — QSoundEffect с несжатым PCM: звук один раз декодируется через
+    QAudioDecoder и кэшируется на диске рядом с исходным файлом (start.mp3 ->
+    start.cache.wav), после чего играет без медиаконвейера. Пока кэш не готов, звук
+    воспроизводит QMediaPlayer. QtMultimedia импортируется лениво.
+    """
+    CUES = {'start': 'start.mp3', 'end': 'end.mp3'}
+    CACHE_SUFFIX = '.cache.wav'
+    VOLUME = 0.8
+
+    def __init__(self, base_dir, custom_files=None):
         self.base_dir = base_dir
-        self.end_player, self.end_audio_output = self._create_player('end.mp3')
-        self.start_player, self.start_audio_output = self._create_player('start.mp3')
+        self.custom_files = {}
+        self._effects = {}         # cue -> QSoundEffect
+        self._players = {}         # cue -> (QMediaPlayer, QAudioOutput)
+        self._decoding = {}        # cue -> состояние декодирования
+        self._play_requested = {}  # cue -> perf_counter() вызова play_*, для замера задержки запуска
+        self.set_custom_files(custom_files or {})
+
+    def set_custom_files(self, custom_files):
+        """Пользовательские звуки: {'start': путь, 'end': путь}. Относительные пути — от data/sound."""
+        files = {cue: path for cue, path in custom_files.items() if path}
+        if files == self.custom_files: return
+        self.custom_files = files
+        self._effects.clear(); self._players.clear(); self._decoding.clear()
+
+    def source_path(self, cue):
+        sound_dir = os.path.join(self.base_dir, 'data', 'sound')
+        custom = self.custom_files.get(cue)
+        if custom:
+            path = custom if os.path.isabs(custom) else os.path.join(sound_dir, custom)
+            if os.path.exists(path): return path
+            logging.warning(f"Пользовательский звук не найден: {path}")
+        return os.path.join(sound_dir, self.CUES[cue])
+
+    def cache_path(self, source):
+        return source if source.lower().endswith('.wav') else os.path.splitext(source)[0] + self.CACHE_SUFFIX
+
+    def preload(self, cues=('start', 'end')):
+        """Заранее готовит звуки, чтобы первое воспроизведение уже шло по быстрому пути."""
+        for cue in cues: self._ensure_effect(cue)
+
+    # --- Быстрый путь: PCM-кэш и QSoundEffect ---
+    def _ensure_effect(self, cue):
+        if cue in self._effects or cue in self._decoding: return
+        source = self.source_path(cue)
+        if not os.path.exists(source): return
+        cached = self.cache_path(source)
+        if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(source):
+            self._effects[cue] = self._create_effect(cue, cached)
+        else:
+            self._decode(cue, source, cached)
 
-    def _create_player(self, filename):
+    def _create_effect(self, cue, wav_path):
+        from PySide6.QtMultimedia import QSoundEffect
+        effect = QSoundEffect()
+        effect.setSource(QUrl.fromLocalFile(wav_path)); effect.setVolume(self.VOLUME)
+        effect.playingChanged.connect(lambda: effect.isPlaying() and self._on_started(cue, 'QSoundEffect'))
+        return effect
+
+    def _decode(self, cue, source, cached):
+        from PySide6.QtMultimedia import QAudioDecoder, QAudioFormat
+        target = QAudioFormat()
+        target.setSampleFormat(QAudioFormat.Int16); target.setChannelCount(2); target.setSampleRate(44100)
+        decoder = QAudioDecoder(); decoder.setAudioFormat(target)
+        state = {'decoder': decoder, 'pcm': bytearray(), 'format': None}
+        def on_buffer():
+            buffer = decoder.read()
+            if state['format'] is None: state['format'] = buffer.format()
+            state['pcm'].extend(bytes(buffer.constData())[:buffer.byteCount()])
+        decoder.bufferReady.connect(on_buffer)
+        decoder.finished.connect(lambda: self._on_decoded(cue, cached))
+        decoder.error.connect(lambda *args: self._on_decode_failed(cue, decoder.errorString()))
+        self._decoding[cue] = state
+        decoder.setSource(QUrl.fromLocalFile(source)); decoder.start()
+
+    def _on_decoded(self, cue, cached):
+        from PySide6.QtMultimedia import QAudioFormat
+        state = self._decoding.pop(cue, None)
+        if state is None: return
+        fmt, pcm = state['format'], state['pcm']
+        if not pcm or fmt is None or fmt.sampleFormat() != QAudioFormat.Int16:
+            logging.warning(f"Не удалось подготовить звук '{cue}' для быстрого воспроизведения")
+            return
+        data = io.BytesIO()
+        with wave.open(data, 'wb') as wav:
+            wav.setnchannels(fmt.channelCount()); wav.setsampwidth(fmt.bytesPerSample()); wav.setframerate(fmt.sampleRate())
+            wav.writeframes(bytes(pcm))
+        try: atomic_write(cached, data.getvalue())
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить звук в кэш {cached}: {e}")
+            return
+        self._effects[cue] = self._create_effect(cue, cached)
+
+    def _on_decode_failed(self, cue, message):
+        self._decoding.pop(cue, None)
+        logging.warning(f"Ошибка декодирования звука '{cue}': {message}")
+
+    # --- Запасной путь: QMediaPlayer ---
+    def _create_player(self, cue):
+        from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
         player = QMediaPlayer(); audio_output = QAudioOutput()
         player.setAudioOutput(audio_output)
-        path = os.path.join(self.base_dir, 'data', 'sound', filename)
+        path = self.source_path(cue)
         if os.path.exists(path):
-            player.setSource(QUrl.fromLocalFile(path)); audio_output.setVolume(0.8)
-        else: print(f"ВНИМАНИЕ: Звуковой файл не найден: {path}")
+            player.setSource(QUrl.fromLocalFile(path)); audio_output.setVolume(self.VOLUME)
+        else: logging.warning(f"Звуковой файл не найден: {path}")
+        player.playbackStateChanged.connect(
+            lambda playback_state: playback_state == QMediaPlayer.PlaybackState.PlayingState and self._on_started(cue, 'QMediaPlayer'))
         return player, audio_output
 
-    def play_end_sound(self):
-        if self.end_player.source().isValid(): self.end_player.setPosition(0); self.end_player.play()
+    def _player(self, cue):
+        if cue not in self._players: self._players[cue] = self._create_player(cue)
+        return self._players[cue][0]
+
+    # --- Воспроизведение ---
+    def _play(self, cue):
+        self._play_requested[cue] = time.perf_counter()
+        effect = self._effects.get(cue)
+        if effect is not None and effect.status() == effect.Status.Ready:
+            effect.play(); return
+        self._ensure_effect(cue)
+        player = self._player(cue)
+        if player.source().isValid(): player.setPosition(0); player.play()
+
+    def _on_started(self, cue, backend):
+        # Это задержка запуска: сигнал приходит, когда бэкенд принял звук, а не когда он
+        # реально зазвучал — буфер аудиовывода добавляет к ней еще десятки миллисекунд
+        requested = self._play_requested.pop(cue, None)
+        if requested is not None:
+            logging.debug(f"Звук '{cue}' ({backend}): от вызова play() до сигнала о начале воспроизведения "
+                          f"{(time.perf_counter() - requested) * 1000:.1f} мс")
 
-    def play_start_sound(self):
-        if self.start_player.source().isValid(): self.start_player.setPosition(0); self.start_player.play()
\ No newline at end of file
+    def play_end_sound(self): self._play('end')
+    def play_start_sound(self): self._play('start')
@@ -0,0 +1,27 @@
+# utils/startup_report.py
+
+import time
+
+class StartupReport:
+    """Замеры фаз запуска приложения.
+
+    mark() закрывает текущую фазу и запоминает ее длительность; print_report()
+    выводит сводку одной строкой, когда иконка уже в трее.
+    """
+    def __init__(self, started_at=None):
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self._last = self.started_at
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self): return self._last - self.started_at
+
+    def format(self):
+        parts = ", ".join(f"{phase} {seconds * 1000:.0f} мс" for phase, seconds in self.phases)
+        return f"Запуск за {self.total() * 1000:.0f} мс: {parts}"
+
+    def print_report(self): print(self.format())
@@ -0,0 +1,74 @@
+# utils/state_journal.py
+
+import os
+import json
+import time
+import logging
+from utils.file_writer import atomic_write
+
+class StateJournal:
+    """Журнал состояния расписания: строка JSON на каждое изменение, дописываемая в конец файла.
+
+    Запись — один os.write в открытый с O_APPEND файл, без перезаписи и fsync, поэтому
+    ее можно делать на каждом переходе. Действует последняя целая строка: оборванная
+    при сбое строка пропускается. Раз в COMPACT_EVERY записей и при закрытии файл
+    сжимается до последней записи через atomic_write. Между записями приложение
+    раз в HEARTBEAT_SEC вызывает touch(): по mtime файла видно, когда оно перестало работать.
+    """
+    HEARTBEAT_SEC = 60
+    COMPACT_EVERY = 256
+
+    def __init__(self, path, wall_clock=time.time):
+        self.path = path
+        self.wall_clock = wall_clock
+        self._fd = None
+        self._records = 0     # строк в файле
+        self._last = None     # последняя записанная строка
+        self._last_state = None
+
+    def load(self):
+        """(состояние, секунд с его записи, секунд с последнего признака жизни) по последней целой строке, либо None."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: lines = f.read().splitlines()
+            alive_at = os.stat(self.path).st_mtime
+        except OSError:
+            return None
+        now = self.wall_clock()
+        self._records = len(lines)
+        for line in reversed(lines):
+            try: record = json.loads(line)
+            except ValueError: continue
+            if isinstance(record, dict) and 't' in record and 'state' in record:
+                self._last, self._last_state = line, record['state']
+                return record['state'], max(0.0, now - record['t']), max(0.0, now - max(alive_at, record['t']))
+        return None
+
+    def record(self, state):
+        if state == self._last_state: return
+        line = json.dumps({'t': round(self.wall_clock(), 3), 'state': state}, ensure_ascii=False, separators=(',', ':'))
+        try:
+            if self._fd is None: self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, (line + '\n').encode('utf-8'))
+        except OSError as e:
+            logging.warning(f"Не удалось записать состояние в {self.path}: {e}")
+            return
+        self._last, self._last_state = line, state
+        self._records += 1
+        if self._records >= self.COMPACT_EVERY: self.compact()
+
+    def touch(self):
+        """Признак жизни без записи: обновляет mtime журнала."""
+        try: os.utime(self.path)
+        except OSError: pass
+
+    def compact(self):
+        """Оставляет в файле только последнюю запись."""
+        if self._fd is not None: os.close(self._fd); self._fd = None
+        if self._last is None: return
+        try: atomic_write(self.path, self._last + '\n')
+        except OSError as e: logging.warning(f"Не удалось сжать журнал состояния {self.path}: {e}"); return
+        self._records = 1
+
+    def close(self):
+        if self._records > 1: self.compact()
+        elif self._fd is not None: os.close(self._fd); self._fd = None
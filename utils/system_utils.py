@@ -8,10 +8,12 @@ from ctypes import wintypes
 class LASTINPUTINFO(ctypes.Structure):
     _fields_ = [('cbSize', wintypes.UINT), ('dwTime', wintypes.DWORD)]
 
-user32 = ctypes.windll.user32
-kernel32 = ctypes.windll.kernel32
+# На других платформах модуль должен импортироваться, но функции Windows становятся заглушками
+user32 = ctypes.windll.user32 if sys.platform == 'win32' else None
+kernel32 = ctypes.windll.kernel32 if sys.platform == 'win32' else None
 
 def get_idle_time_windows() -> float:
+    if user32 is None: return 0.0
     last_input_info = LASTINPUTINFO(); last_input_info.cbSize = ctypes.sizeof(last_input_info)
     if user32.GetLastInputInfo(ctypes.byref(last_input_info)):
         current_time = kernel32.GetTickCount()
@@ -0,0 +1,66 @@
+# utils/trigram_index.py
+
+from array import array
+
+def normalize(text):
+    """Приводит текст к виду для поиска: без учета регистра (в том числе кириллицы), ё = е."""
+    return text.casefold().replace('ё', 'е')
+
+class TrigramIndex:
+    """Инкрементальный триграммный индекс для поиска подстроки.
+
+    Документам присваиваются возрастающие номера, поэтому списки вхождений —
+    отсортированные array('I') без лишних объектов на каждую запись. Удаление
+    помечает документ удаленным; списки перестраиваются, когда таких становится
+    больше четверти. Запрос из трех и более символов проверяет только документы
+    из самого короткого списка вхождений его триграмм, короткие запросы — все.
+    """
+    def __init__(self, items=()):
+        self._clear()
+        for key, text in items: self.add(key, text)
+
+    def _clear(self):
+        self._postings = {}  # триграмма -> array('I') номеров документов
+        self._docs = []      # номер документа -> ключ (None, если удален)
+        self._texts = []     # номер документа -> нормализованный текст
+        self._doc_of = {}    # ключ -> номер документа
+        self._removed = 0
+
+    def __len__(self): return len(self._doc_of)
+
+    def add(self, key, text):
+        if key in self._doc_of: self.remove(key)
+        doc = len(self._docs)
+        norm = normalize(text)
+        self._docs.append(key); self._texts.append(norm); self._doc_of[key] = doc
+        for gram in {norm[i:i + 3] for i in range(len(norm) - 2)}:
+            postings = self._postings.get(gram)
+            if postings is None: postings = self._postings[gram] = array('I')
+            postings.append(doc)
+
+    def remove(self, key):
+        doc = self._doc_of.pop(key, None)
+        if doc is None: return
+        self._docs[doc] = None; self._texts[doc] = None
+        self._removed += 1
+        if self._removed > 64 and self._removed * 4 > len(self._docs): self._rebuild()
+
+    def _rebuild(self):
+        items = [(key, text) for key, text in zip(self._docs, self._texts) if key is not None]
+        self._clear()
+        # Тексты уже нормализованы, а normalize идемпотентна
+        for key, text in items: self.add(key, text)
+
+    def search(self, query):
+        """Ключи документов, содержащих query как подстроку, в порядке добавления."""
+        q = normalize(query)
+        texts, docs = self._texts, self._docs
+        if len(q) < 3:
+            return [docs[doc] for doc, text in enumerate(texts) if text is not None and q in text]
+        grams = {q[i:i + 3] for i in range(len(q) - 2)}
+        candidates = None
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None: return []
+            if candidates is None or len(postings) < len(candidates): candidates = postings
+        return [docs[doc] for doc in candidates if texts[doc] is not None and q in texts[doc]]
@@ -1,24 +1,228 @@
 # utils/xml_manager.py
 
 import os
+import hashlib
+import logging
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
-import random
+import json
+from utils.practice_io import practice_format, read_practices, format_practices
+from utils.practice_sampler import PracticeSampler
+from utils.trigram_index import TrigramIndex
+from utils.metrics import metrics
+from utils.file_writer import FileWriter, atomic_write
+from utils.i18n import SOURCE_LANGUAGE, MessageCatalog, resolve_language, localized_path
+
+def canonical_xml(root):
+    """Сериализует дерево в канонический вид.
+
+    Пробельные текстовые узлы между элементами отбрасываются и расставляются заново,
+    поэтому сколько бы раз файл ни сохранялся, результат для одних и тех же данных
+    один и тот же и не растет.
+    """
+    for elem in root.iter():
+        if len(elem) and elem.text is not None and not elem.text.strip(): elem.text = None
+        if elem.tail is not None and not elem.tail.strip(): elem.tail = None
+    ET.indent(root, space="  ")
+    return '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(root, encoding='unicode') + '\n'
+
+def parse_and_compact(path):
+    """Разбирает XML-файл и, если он не в каноническом виде (раздут пробелами), переписывает его."""
+    with open(path, 'rb') as f: raw = f.read()
+    root = ET.fromstring(raw)
+    canonical = canonical_xml(root)
+    if canonical.encode('utf-8') != raw:
+        atomic_write(path, canonical)
+        if len(raw) > len(canonical.encode('utf-8')) * 2:
+            logging.info(f"Файл {os.path.basename(path)} сжат: {len(raw)} -> {len(canonical.encode('utf-8'))} байт")
+    return root
+
+def practices_xml(snapshot):
+    """XML файла практик по снимку PracticeStore.snapshot(); безопасно вызывать из фонового потока."""
+    root_tag, root_attrib, items, weights = snapshot
+    root = ET.Element(root_tag, root_attrib)
+    for pid, text in items:
+        elem = ET.SubElement(root, 'practice')
+        elem.text = text
+        if pid in weights: elem.set('weight', f"{weights[pid]:g}")
+    return canonical_xml(root)
+
+def practice_id(text):
+    """Стабильный идентификатор практики: 64-битный хэш её текста."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class PracticeStore:
+    """Кэш практик одного XML-файла в памяти.
+
+    Файл разбирается один раз и индексируется; повторный разбор происходит только
+    если у файла изменились mtime или размер. Добавление и удаление обновляют индекс
+    напрямую. Следующую практику выдает PracticeSampler за O(1) и без повторов
+    в пределах круга; необязательный атрибут weight у <practice> задает ее вес.
+    Если файл отслеживает AssetCatalog (watched), обращения не делают stat: файл
+    проверяется только по его уведомлениям.
+    """
+    def __init__(self, file_path, root_tag='practices'):
+        self.file_path = file_path
+        self.root_tag, self.root_attrib = root_tag, {}
+        self._signature = None
+        self.generation = 0   # растет при каждом перечитывании файла
+        self._texts = {}      # id -> текст, в порядке файла
+        self._weights = {}    # id -> вес, только для весов, отличных от 1
+        self.sampler = PracticeSampler()
+        self.sampler_state = None  # сохраненный круг выдачи, восстанавливается при загрузке
+        self._search_index = None  # TrigramIndex, строится при первом поиске
+        self.watched = False
+
+    def _stat_signature(self):
+        try: st = os.stat(self.file_path)
+        except OSError: return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def refresh(self, force=False):
+        """Перечитывает файл, только если он изменился на диске."""
+        if self.watched and self.generation and not force: return
+        signature = self._stat_signature()
+        if signature != self._signature: self._load(signature)
+
+    def invalidate(self): self._signature = None; self.refresh(force=True)
+
+    @metrics.timed('xml_load_practices')
+    def _load(self, signature):
+        # При перечитывании файла уже выданные в этом круге практики не повторяются
+        state = self.sampler.state() if len(self.sampler) else self.sampler_state
+        self._texts, self._weights = {}, {}
+        self.sampler = PracticeSampler()
+        self._search_index = None
+        self._signature = signature
+        self.generation += 1
+        if signature is None: return
+        try:
+            root = parse_and_compact(self.file_path)
+        except ET.ParseError as e:
+            print(f"Error parsing XML file {self.file_path}: {e}")
+            return
+        except OSError:
+            self._signature = None
+            return
+        self._signature = self._stat_signature()
+        self.root_tag, self.root_attrib = root.tag, dict(root.attrib)
+        for elem in root.findall('practice'):
+            if not elem.text: continue
+            pid = practice_id(elem.text)
+            if pid in self._texts: continue
+            self._texts[pid] = elem.text
+            weight = self._parse_weight(elem.get('weight'))
+            if weight != 1.0: self._weights[pid] = weight
+        self.sampler = PracticeSampler(self._texts, self._weights)
+        self.sampler.restore(state)
+
+    @staticmethod
+    def _parse_weight(value):
+        try: weight = float(value) if value is not None else 1.0
+        except ValueError: return 1.0
+        return weight if weight > 0 else 1.0
+
+    def _insert(self, text, weight=1.0):
+        pid = practice_id(text)
+        if pid in self._texts: return False
+        self._texts[pid] = text
+        if weight != 1.0: self._weights[pid] = weight
+        self.sampler.add(pid, weight)
+        if self._search_index is not None: self._search_index.add(pid, text)
+        return True
+
+    def _discard(self, pid):
+        del self._texts[pid]
+        self._weights.pop(pid, None)
+        self.sampler.remove(pid)
+        if self._search_index is not None: self._search_index.remove(pid)
+
+    def __len__(self): self.refresh(); return len(self._texts)
+    def __contains__(self, text): self.refresh(); return practice_id(text) in self._texts
+
+    def texts(self): self.refresh(); return list(self._texts.values())
+    def ids(self): self.refresh(); return list(self._texts)
+    def text(self, pid): return self._texts.get(pid)
+
+    def search(self, query):
+        """id практик, содержащих query (без учета регистра), в порядке файла; None для пустого запроса."""
+        self.refresh()
+        if not query.strip(): return None
+        if self._search_index is None: self._search_index = TrigramIndex(self._texts.items())
+        return self._search_index.search(query.strip())
+
+    def random_text(self, default=None):
+        self.refresh()
+        pid = self.sampler.draw()
+        return default if pid is None else self._texts[pid]
+
+    def add(self, text):
+        """Добавляет практику в индекс. Возвращает False, если такая уже есть."""
+        self.refresh()
+        return self._insert(text)
+
+    def remove(self, texts):
+        """Удаляет практики по набору текстов. Возвращает число удаленных."""
+        self.refresh()
+        pids = {practice_id(t) for t in texts} & self._texts.keys()
+        for pid in pids: self._discard(pid)
+        return len(pids)
+
+    def add_many(self, texts, progress=None, chunk=500):
+        """Добавляет пакет практик, пропуская дубликаты. Возвращает (список id добавленных, число просмотренных).
+
+        progress(done, total) вызывается раз в chunk элементов; если он вернет False,
+        импорт останавливается (добавленное до этого момента сохраняется), и
+        просмотренных оказывается меньше, чем texts.
+        """
+        self.refresh()
+        added, total, done = [], len(texts), 0
+        for done, text in enumerate(texts, 1):
+            if self._insert(text): added.append(practice_id(text))
+            if progress is not None and (done % chunk == 0 or done == total):
+                if progress(done, total) is False: break
+        return added, done
+
+    def remove_ids(self, pids):
+        """Удаляет практики по набору id. Возвращает число удаленных."""
+        self.refresh()
+        pids = set(pids) & self._texts.keys()
+        for pid in pids: self._discard(pid)
+        return len(pids)
+
+    def snapshot(self):
+        """Копия содержимого для записи в фоновом потоке, не зависящая от дальнейших изменений."""
+        return self.root_tag, dict(self.root_attrib), list(self._texts.items()), dict(self._weights)
+
+    def mark_saved(self):
+        """Запоминает состояние файла после записи, чтобы не перечитывать свои же изменения."""
+        self._signature = self._stat_signature()
 
 class XMLManager:
+    """Файлы данных в data_dir. Запись настроек и практик уходит в фоновый FileWriter:
+    вызовы возвращаются сразу, чтение видит еще не записанное, flush() — при выходе.
+
+    Язык из настройки language выбирает каталог строк интерфейса и файлы практик
+    practice_<язык>.xml с запасными вариантами (см. i18n.localized_path); он
+    определяется при создании, поэтому смена языка действует после перезапуска.
+    """
     def __init__(self, data_dir='data'):
         self.data_dir = data_dir
-        self.settings_path = os.path.join(self.data_dir, 'settings_ru.xml')
-        self.practice_path = os.path.join(self.data_dir, 'practice_ru.xml')
-        self.micropractice_path = os.path.join(self.data_dir, 'micropractice_ru.xml')
+        self.writer = FileWriter()
+        self.settings_path = os.path.join(self.data_dir, 'settings_ru.xml')  # имя прежнее: настройки от языка не зависят
+        self.ensure_settings_file_exists()
+        # Без настройки language (файлы прежних версий) интерфейс остается русским, как и был
+        self.language = resolve_language(self.load_settings().get('language', SOURCE_LANGUAGE))
+        self.ui_texts = MessageCatalog(self.language, self.data_dir, os.path.join(self.data_dir, 'lang_cache'))
+        self.practice_path = localized_path(self.data_dir, 'practice', self.language)
+        self.micropractice_path = localized_path(self.data_dir, 'micropractice', self.language)
         self.ensure_data_files_exist()
+        self.practice_store = PracticeStore(self.practice_path)
+        self.micropractice_store = PracticeStore(self.micropractice_path, root_tag='micropractices')
+        self._stores = {self.practice_path: self.practice_store, self.micropractice_path: self.micropractice_store}
+        self.sampler_state_path = os.path.join(self.data_dir, 'sampler_state.json')
+        self._load_sampler_state()
 
-    def _pretty_print(self, root):
-        xml_str = ET.tostring(root, 'utf-8')
-        reparsed = minidom.parseString(xml_str)
-        return reparsed.toprettyxml(indent="  ")
-
-    def ensure_data_files_exist(self):
+    def ensure_settings_file_exists(self):
         os.makedirs(self.data_dir, exist_ok=True)
         if not os.path.exists(self.settings_path):
             root = ET.Element('settings')
@@ -28,29 +232,37 @@ class XMLManager:
                 'short_pause_enabled': 'True', 'short_pause_interval': '20', 'short_pause_duration': '20',
                 'warning_enabled': 'True', 'warning_time': '30', 'strict_mode': 'False',
                 'sound_enabled': 'True', 'sound_start_enabled': 'True', 'darken_short_pause': 'False',
-                'autostart': 'False', 'track_activity': 'True'
+                'autostart': 'False', 'track_activity': 'True',
+                'sound_start_file': '', 'sound_end_file': '', 'pause_screen': 'primary', 'language': 'auto'
             }
             for k, v in defaults.items(): ET.SubElement(config, k).text = v
-            with open(self.settings_path, 'w', encoding='utf-8') as f: f.write(self._pretty_print(root))
-        
+            atomic_write(self.settings_path, canonical_xml(root))
+
+    def ensure_data_files_exist(self):
+        self.ensure_settings_file_exists()
+        tr = self.ui_texts.tr
         if not os.path.exists(self.practice_path):
             root = ET.Element('practices')
-            defaults = ['Пройдитесь по комнате, осознавая каждый шаг.', 'Гимнастика для глаз. Посмотрите вверх-вниз, влево-вправо.']
+            defaults = [tr('Пройдитесь по комнате, осознавая каждый шаг.'), tr('Гимнастика для глаз. Посмотрите вверх-вниз, влево-вправо.')]
             # Используем тег <practice> при создании
             for p in defaults: ET.SubElement(root, 'practice').text = p
-            with open(self.practice_path, 'w', encoding='utf-8') as f: f.write(self._pretty_print(root))
+            atomic_write(self.practice_path, canonical_xml(root))
 
         if not os.path.exists(self.micropractice_path):
             root = ET.Element('practices')
-            defaults = ['Один осознанный вдох-выдох.', 'Почувствуйте стопы.']
+            defaults = [tr('Один осознанный вдох-выдох.'), tr('Почувствуйте стопы.')]
             # Используем тег <practice> при создании
             for p in defaults: ET.SubElement(root, 'practice').text = p
-            with open(self.micropractice_path, 'w', encoding='utf-8') as f: f.write(self._pretty_print(root))
+            atomic_write(self.micropractice_path, canonical_xml(root))
+
+    def _settings_root(self):
+        pending = self.writer.pending_text(self.settings_path)
+        return ET.fromstring(pending) if pending is not None else parse_and_compact(self.settings_path)
 
+    @metrics.timed('xml_load_settings')
     def load_settings(self):
         try:
-            tree = ET.parse(self.settings_path)
-            root = tree.getroot()
+            root = self._settings_root()
             settings = {}
             config_element = root.find('config')
             if config_element is not None:
@@ -59,62 +271,109 @@ class XMLManager:
                     if val is not None and val.lower() in ['true', 'false']:
                         settings[elem.tag] = (val.lower() == 'true')
                     elif val is not None:
-                        settings[elem.tag] = int(val)
+                        try: settings[elem.tag] = int(val)
+                        except ValueError: settings[elem.tag] = val
             return settings
         except (FileNotFoundError, ET.ParseError):
             print(f"Warning: Could not load settings from {self.settings_path}. Using defaults.")
-            self.ensure_data_files_exist()
+            self.ensure_settings_file_exists()
             return self.load_settings()
 
     def save_settings(self, settings):
-        tree = ET.parse(self.settings_path); root = tree.getroot()
+        root = self._settings_root()
         config = root.find('config')
         for key, value in settings.items():
             elem = config.find(key)
-            if elem is not None: elem.text = str(value)
-        with open(self.settings_path, 'w', encoding='utf-8') as f: f.write(self._pretty_print(root))
+            if elem is None: elem = ET.SubElement(config, key)  # настройка новее файла
+            elem.text = str(value)
+        self.writer.submit(self.settings_path, canonical_xml(root))
     
     def _get_practices_from_file(self, file_path):
-        if not os.path.exists(file_path): return []
-        try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            # <<< ИЗМЕНЕНИЕ: Ищем тег 'practice', а не 'string' >>>
-            return [elem.text for elem in root.findall('practice') if elem.text]
-        except ET.ParseError as e:
-            print(f"Error parsing XML file {file_path}: {e}")
-            return []
+        store = self._stores.get(file_path)
+        return store.texts() if store is not None else PracticeStore(file_path).texts()
 
     def get_all_practices(self): return self._get_practices_from_file(self.practice_path)
     def get_all_micropractices(self): return self._get_practices_from_file(self.micropractice_path)
     
-    def get_random_practice(self): 
-        practices = self.get_all_practices()
-        return random.choice(practices or ["Время отдохнуть!"])
-        
-    def get_random_micropractice(self): 
-        micropractices = self.get_all_micropractices()
-        return random.choice(micropractices or ["Минутка для себя."])
+    def get_random_practice(self): return self._draw(self.practice_store, self.ui_texts.tr("Время отдохнуть!"))
+    def get_random_micropractice(self): return self._draw(self.micropractice_store, self.ui_texts.tr("Минутка для себя."))
+
+    def _draw(self, store, default):
+        text = store.random_text(default)
+        self._save_sampler_state()
+        return text
+
+    # --- Круг выдачи практик переживает перезапуск ---
+    def _load_sampler_state(self):
+        try:
+            with open(self.sampler_state_path, 'r', encoding='utf-8') as f: state = json.load(f)
+        except (OSError, ValueError):
+            return
+        for path, store in self._stores.items(): store.sampler_state = state.get(os.path.basename(path))
+
+    SAMPLER_SAVE_DELAY_SEC = 60  # выдачи за минуту — одна запись; при выходе flush() пишет сразу
+
+    def _save_sampler_state(self):
+        state = {os.path.basename(path): store.sampler.state() for path, store in self._stores.items()}
+        self.writer.submit(self.sampler_state_path, lambda: json.dumps(state, separators=(',', ':')), delay=self.SAMPLER_SAVE_DELAY_SEC)
+
+    def _write_store(self, store):
+        snapshot = store.snapshot()
+        self.writer.submit(store.file_path, lambda: practices_xml(snapshot), on_written=store.mark_saved)
 
     def _add_practice_to_file(self, text, file_path):
-        tree = ET.parse(file_path); root = tree.getroot()
-        # <<< ИЗМЕНЕНИЕ: Создаем тег 'practice', а не 'string' >>>
-        ET.SubElement(root, 'practice').text = text
-        with open(file_path, 'w', encoding='utf-8') as f: f.write(self._pretty_print(root))
+        store = self._stores[file_path]
+        added = store.add(text)
+        if added: self._write_store(store)
+        return added
 
-    def add_practice(self, text): self._add_practice_to_file(text, self.practice_path)
-    def add_micropractice(self, text): self._add_practice_to_file(text, self.micropractice_path)
+    def add_practice(self, text): return self._add_practice_to_file(text, self.practice_path)
+    def add_micropractice(self, text): return self._add_practice_to_file(text, self.micropractice_path)
 
     def _delete_practices_from_file(self, practices_to_delete, file_path):
-        tree = ET.parse(file_path); root = tree.getroot()
-        # <<< ИЗМЕНЕНИЕ: Ищем тег 'practice', а не 'string' >>>
-        for p_text in practices_to_delete:
-            for elem in root.findall('practice'):
-                if elem.text == p_text: root.remove(elem)
-        with open(file_path, 'w', encoding='utf-8') as f: f.write(self._pretty_print(root))
+        store = self._stores[file_path]
+        if store.remove(practices_to_delete): self._write_store(store)
 
     def delete_practices(self, practices): self._delete_practices_from_file(practices, self.practice_path)
     def delete_micropractices(self, practices): self._delete_practices_from_file(practices, self.micropractice_path)
     
-    def reload_practices(self): pass
-    def get_ui_texts(self): return {}
\ No newline at end of file
+    # --- Массовые операции: один разбор и одна запись на пакет ---
+    def _store(self, micro): return self.micropractice_store if micro else self.practice_store
+
+    def add_practices(self, texts, micro=False, progress=None):
+        """(id добавленных, число просмотренных) — см. PracticeStore.add_many."""
+        store = self._store(micro)
+        added, done = store.add_many(texts, progress)
+        if added: self._write_store(store)
+        return added, done
+
+    def import_practices(self, path, micro=False, progress=None):
+        """Импортирует практики из .txt/.csv/.json/.xml.
+
+        Возвращает (id добавленных, число пропущенных дубликатов, число не просмотренных из-за остановки).
+        """
+        texts = read_practices(path)
+        added, done = self.add_practices(texts, micro, progress)
+        return added, done - len(added), len(texts) - done
+
+    def export_practices(self, path, micro=False):
+        texts = self._store(micro).texts()
+        atomic_write(path, format_practices(texts, practice_format(path)))
+        return len(texts)
+
+    def delete_practices_by_ids(self, pids, micro=False):
+        store = self._store(micro)
+        removed = store.remove_ids(pids)
+        if removed: self._write_store(store)
+        return removed
+
+    def flush(self):
+        """Дописывает все отложенные записи на диск (при выходе из приложения)."""
+        return self.writer.flush()
+
+    def reload_practices(self):
+        self.writer.flush()  # иначе перечитанный файл потерял бы еще не записанные изменения
+        for store in self._stores.values(): store.invalidate()
+    def get_ui_texts(self):
+        """Каталог строк интерфейса на выбранном языке (загружается при первом обращении к строке)."""
+        return self.ui_texts
\ No newline at end of file